@@ -4,15 +4,16 @@ import pandas as pd
 import dill
 import sys
 sys.path.append('../')
+import mg_si
 import mg_si.plot as mplt
 import matplotlib.pyplot as plt
 datafolder = '../computed_solutions_nature/'
 datafile = 'data.m'
+recordfile = 'record.npz'
 alldatafile = 'all_parameters.m'
 import datetime
 
-column_names = ['time', 'r_i', 'T_cmb0', 'X_Mg_0', 'X_Si_0', 'X_O_0', 'MgNumFp', 'MgNumPv', 'X_MgFeO_b', 'X_SiO2_b', 'nu_present', 'deltaT0', 'layer_thickness', 'overturn']
-df10 = pd.read_csv(datafolder+'ri10p_data.csv', names=column_names)
+df10 = pd.DataFrame(mg_si.summary.read_summary(datafolder+'run_data*.csv', where=mg_si.summary.r_i_window(0.1)))
 N = len(df10)
 for i,row in df10.iterrows():
     try:
@@ -24,7 +25,10 @@ for i,row in df10.iterrows():
             continue
         if os.path.exists(datafolder+foldername+alldatafile):
             continue
-        pl,times,solution = dill.load(open(datafolder+foldername+datafile,'rb'))
+        if os.path.exists(datafolder+foldername+recordfile):
+            pl,times,solution = mg_si.planet.Custom.from_record(datafolder+foldername+recordfile)
+        else:
+            pl,times,solution = dill.load(open(datafolder+foldername+datafile,'rb'))
         t_N, all_parameters = pl.core_layer.compute_all_parameters(times, solution)
         mplt.Q_all(pl, t_N, all_parameters, filepath=datafolder+foldername)
         mplt.E_all(pl, t_N, all_parameters, filepath=datafolder+foldername)
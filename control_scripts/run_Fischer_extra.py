@@ -84,8 +84,7 @@ for X_Mg_0 in X_Mgs:
             T_um0 = T_cmb0-deltaT0
             try:
                 filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-                if not os.path.exists(basefolder):
-                    os.mkdir(basefolder)
+                os.makedirs(basefolder, exist_ok=True)
                 if os.path.exists(filepath+'r_i.m'):
                     print('r_i already computed')
                     r_i = dill.load(open(filepath+'r_i.m','rb'))
@@ -100,8 +99,7 @@ for X_Mg_0 in X_Mgs:
                         continue
                     except:
                         print('could not load previously computed solution, re-computing now')
-                if not os.path.exists(filepath):
-                    os.mkdir(filepath)
+                os.makedirs(filepath, exist_ok=True)
             except:
                 print('!!!!! Problem setting up folders',sys.exc_info()[1])
                 del pl
@@ -5,7 +5,6 @@ import sys, os
 import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 
 from mg_si import plot as mplt
@@ -35,6 +34,7 @@ X_Sis = np.linspace(1e-5,.1,7)
 X_Os = np.linspace(1e-5,.25,20)
 nus = np.array([10**19, 10**20, 10**21])/pl.params.mantle.rho #[m^2/s]
 basefolder = '../computed_solutions_epsl/'
+writer = mg_si.results.ResultWriter(basefolder)
 for nu_present in nus :
     for T_cmb0 in T_cmbs:
         for X_Mg_0 in X_Mgs:
@@ -42,19 +42,20 @@ for nu_present in nus :
                 for X_O_0 in X_Os:
                     print(T_cmb0, X_Si_0, X_Mg_0, X_O_0)
                     pl = mg_si.planet.Custom()
+                    stats = pl.stats
                     pl.reactions._set_layer_thickness(layer_thickness)
                     pl.reactions._set_overturn_time(overturn)
                     deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
                     T_um0 = T_cmb0-deltaT0
                     try:
-                        filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}_fFp{:.2f}_fPv{:.2f}_XMgFe{:.2f}_XSb{:.2f}_nu{:.0e}_lthck{:.0e}_ovt{:.0e}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0,MgNumFp,MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn)
-                        if not os.path.exists(basefolder):
-                            os.mkdir(basefolder)
-                        if os.path.exists(filepath+'data.m'):
+                        run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}_fFp{:.2f}_fPv{:.2f}_XMgFe{:.2f}_XSb{:.2f}_nu{:.0e}_lthck{:.0e}_ovt{:.0e}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0,MgNumFp,MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn)
+                        if writer.done(run):
                             print('already computed')
                             continue
-                        if not os.path.exists(filepath):
-                            os.mkdir(filepath)
+                        filepath = writer.stage(run)
+                        if filepath is None:
+                            print('being computed by another process')
+                            continue
 
                         Moles_0 = pl.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0)
                         x0 = [T_cmb0, T_um0]
@@ -79,11 +80,8 @@ for nu_present in nus :
                         r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
                         csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
                         # print(csvdata)
-                        with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-                            writer = csv.writer(f)
-                            writer.writerow(csvdata)
-                        f.close()
                         copyfile('./dynamo_power.py',filepath+'dynamo_power.py')
+                        writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
                         del pl
                         del csvdata
                         print('==== successfully finished computing')
@@ -91,12 +89,9 @@ for nu_present in nus :
                         try:
                             del pl
                             time = str(datetime.datetime.now())
-                            r_i = 'nan'
+                            r_i = np.nan
                             csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-                            with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-                                writer = csv.writer(f)
-                                writer.writerow(csvdata)
-                            f.close()
+                            writer.fail(run, csvdata, **stats)
                             print('############## problem with '+str(csvdata)+'\n')
                         except:
                             print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
@@ -2,10 +2,9 @@ import numpy as np
 from shutil import copyfile
 import matplotlib.pyplot as plt
 import sys, os
-import dill
 sys.path.append('../')
 import mg_si
-import csv
+import mg_si.workqueue
 import datetime
 
 from mg_si import plot as mplt
@@ -15,6 +14,8 @@ layer_thickness = 100 # m
 overturn = 600 # Myr
 
 times = np.linspace(0,4568e6*365.25*24*3600,20000)
+## storage of the solutions, full float64 if None (see mg_si.record.StoragePolicy)
+storage = None
 
 ## background mantle state
 MgNumFp = 0.8
@@ -26,76 +27,89 @@ pl = mg_si.planet.Custom()
 nu_present = 10**21/pl.params.mantle.rho #[m^2/s]
 
 T_cmbs_all = np.linspace(4800,6500,round((6500-4800)/100)+1)
-Ntc = 3
-iT = int(sys.argv[1])
-
-T_cmbs = T_cmbs_all[Ntc*iT:(iT+1)*Ntc]
 X_Mgs = np.linspace(1e-5,.05,round(.05/.005)+1)
 X_Sis = np.linspace(1e-5,.05,round(.05/.005)+1)
 X_Os = np.linspace(1e-5,.15,round(.15/.005)+1)
 
 basefolder = '../computed_solutions_nature/'
-for T_cmb0 in T_cmbs:
-	for X_Mg_0 in X_Mgs:
-		for X_Si_0 in X_Sis:
-			for X_O_0 in X_Os:
-				time = str(datetime.datetime.now())
-				print('{} - {} K - {} Si {} Mg {} O'.format(time, T_cmb0, X_Si_0, X_Mg_0, X_O_0))
-				pl = mg_si.planet.Custom()
-				pl.reactions._set_layer_thickness(layer_thickness)
-				pl.reactions._set_overturn_time(overturn)
-				deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
-				T_um0 = T_cmb0-deltaT0
-				try:
-					filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-					if not os.path.exists(basefolder):
-						os.mkdir(basefolder)
-					if os.path.exists(filepath+'data.m'):
-						print('already computed')
-						continue
-					if not os.path.exists(filepath):
-						os.mkdir(filepath)
-
-					Moles_0 = pl.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0)
-					x0 = [T_cmb0, T_um0]
-					x0 = x0+Moles_0
-					pl.params.reactions.Moles_0 = Moles_0
+writer = mg_si.results.ResultWriter(basefolder)
+## work queue of the sweep (see mg_si.workqueue)
+queuefolder = '../queue_nature/'
 
-					Mm_b = pl.reactions.mantle.compute_Mm_b(X_MgFeO=X_MgFeO_b, X_SiO2=X_SiO2_b, MgNumFp=MgNumFp, MgNumPv=MgNumPv)
-					pl.params.reactions.Mm_b = Mm_b
+def run_planet(T_cmb0, X_Mg_0, X_Si_0, X_O_0):
+	time = str(datetime.datetime.now())
+	print('{} - {} K - {} Si {} Mg {} O'.format(time, T_cmb0, X_Si_0, X_Mg_0, X_O_0))
+	pl = mg_si.planet.Custom()
+	stats = pl.stats
+	pl.reactions._set_layer_thickness(layer_thickness)
+	pl.reactions._set_overturn_time(overturn)
+	deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
+	T_um0 = T_cmb0-deltaT0
+	try:
+		run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+		if writer.done(run):
+			print('already computed')
+			return
+		filepath = writer.stage(run, take_over=sys.argv[1] == 'work')
+		if filepath is None:
+			print('being computed by another process')
+			return
 
-					T_present = 1350 # [K]
-					nu_old =  nu_present/1e3
-					T_old = T_um0
-					A,nu0 = pl.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_old, T_old, set_values=True)
+		Moles_0 = pl.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0)
+		x0 = [T_cmb0, T_um0]
+		x0 = x0+Moles_0
+		pl.params.reactions.Moles_0 = Moles_0
 
-					solution = pl.integrate(times, x0)
-					mplt.temperature(pl, times, solution, filepath=filepath)
-					mplt.coremoles(pl, times, solution, filepath=filepath)
-					mplt.composition(pl, times, solution, filepath=filepath)
-					plt.close('all')
-					dill.dump((pl,times,solution), open(filepath+'data.m','wb'))
-					r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
-					csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-					with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-						writer = csv.writer(f)
-						writer.writerow(csvdata)
-					f.close()
-					del pl
-					del csvdata
-					print('==== successfully finished computing')
-				except:
-					try:
-						del pl
-						r_i = 'nan'
-						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
-						print('############## problem with '+str(csvdata)+'\n')
-					except:
-						print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
+		Mm_b = pl.reactions.mantle.compute_Mm_b(X_MgFeO=X_MgFeO_b, X_SiO2=X_SiO2_b, MgNumFp=MgNumFp, MgNumPv=MgNumPv)
+		pl.params.reactions.Mm_b = Mm_b
 
+		T_present = 1350 # [K]
+		nu_old =  nu_present/1e3
+		T_old = T_um0
+		A,nu0 = pl.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_old, T_old, set_values=True)
 
+		solution = pl.integrate(times, x0, checkpoint=filepath+'checkpoint.npz')
+		mplt.temperature(pl, times, solution, filepath=filepath)
+		mplt.coremoles(pl, times, solution, filepath=filepath)
+		mplt.composition(pl, times, solution, filepath=filepath)
+		plt.close('all')
+		pl.write_record(filepath+'record.npz', times, solution, x0=x0, solver={'scaled': False, 'rtol': 1e-4, 'atol': 1e-4}, policy=storage)
+		os.remove(filepath+'checkpoint.npz')
+		r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
+		csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
+		writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
+		del pl
+		del csvdata
+		print('==== successfully finished computing')
+		return stats
+	except:
+		try:
+			del pl
+			r_i = np.nan
+			csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
+			writer.fail(run, csvdata, **stats)
+			print('############## problem with '+str(csvdata)+'\n')
+		except:
+			print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
+		if sys.argv[1] == 'work':
+			# the queue retries the task, then moves it to failed/ with the traceback
+			raise
 
+if sys.argv[1] == 'enqueue':
+	# once, then 'work' on any number of processes and nodes
+	tasks = [{'T_cmb0': float(T_cmb0), 'X_Mg_0': float(X_Mg_0), 'X_Si_0': float(X_Si_0), 'X_O_0': float(X_O_0)}
+			 for T_cmb0 in T_cmbs_all for X_Mg_0 in X_Mgs for X_Si_0 in X_Sis for X_O_0 in X_Os]
+	queue = mg_si.workqueue.WorkQueue.create(queuefolder, tasks)
+	print(queue.status())
+elif sys.argv[1] == 'work':
+	# longest predicted runs first, refitting the cost of the runs every 10 runs of each worker
+	mg_si.workqueue.WorkQueue(queuefolder).work(run_planet, wait=True, reorder_every=10)
+else:
+	# slice iT of the temperatures
+	Ntc = 3
+	iT = int(sys.argv[1])
+	for T_cmb0 in T_cmbs_all[Ntc*iT:(iT+1)*Ntc]:
+		for X_Mg_0 in X_Mgs:
+			for X_Si_0 in X_Sis:
+				for X_O_0 in X_Os:
+					run_planet(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
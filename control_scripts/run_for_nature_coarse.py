@@ -5,7 +5,6 @@ import sys, os
 import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 
 from mg_si import plot as mplt
@@ -17,6 +16,8 @@ layer_thickness = 100 # m
 overturn = 600 # Myr
 
 times = np.linspace(0,4568e6*365.25*24*3600,20000)
+## storage of the solutions, full float64 if None (see mg_si.record.StoragePolicy)
+storage = None
 
 ## background mantle state
 MgNumFp = 0.8
@@ -51,6 +52,7 @@ X_Sis = np.linspace(minSi, maxSi, round((maxSi-minSi)/dSi)+1)
 X_Os = np.linspace(minO, maxO, round((maxO-minO)/dO)+1)
 
 basefolder = '/media/nknezek/compute_storage/computed_solutions_nature/'
+writer = mg_si.results.ResultWriter(basefolder)
 alldatafile = 'all_parameters.m'
 
 Ntotal = len(T_cmbs)*len(X_Mgs)*len(X_Sis)*len(X_Os)
@@ -63,19 +65,20 @@ for T_cmb0 in T_cmbs:
 				print('{} - {:.0f}K - {:.3f}Mg {:.3f}Si {:.3f}O - {}/{}'.format(time, T_cmb0, X_Mg_0, X_Si_0, X_O_0,i,Ntotal))
 				i += 1
 				pl = mg_si.planet.Custom()
+				stats = pl.stats
 				pl.reactions._set_layer_thickness(layer_thickness)
 				pl.reactions._set_overturn_time(overturn)
 				deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
 				T_um0 = T_cmb0-deltaT0
 				try:
-					filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-					if not os.path.exists(basefolder):
-						os.mkdir(basefolder)
-					if os.path.exists(filepath+'data.m'):
+					run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+					if writer.done(run):
 						print('already computed')
 						continue
-					if not os.path.exists(filepath):
-						os.mkdir(filepath)
+					filepath = writer.stage(run)
+					if filepath is None:
+						print('being computed by another process')
+						continue
 							
 					Moles_0 = pl.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0)
 					x0 = [T_cmb0, T_um0]
@@ -91,20 +94,19 @@ for T_cmb0 in T_cmbs:
 					A,nu0 = pl.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_old, T_old, set_values=True)
 
 					# plot and store solution info
-					solution = pl.integrate(times, x0)
+					solution = pl.integrate(times, x0, checkpoint=filepath+'checkpoint.npz')
 					mplt.temperature(pl, times, solution, filepath=filepath)
 					mplt.coremoles(pl, times, solution, filepath=filepath)
 					mplt.composition(pl, times, solution, filepath=filepath)
 					plt.close('all')
-					dill.dump((pl,times,solution), open(filepath+'data.m','wb'))
+					pl.write_record(filepath+'record.npz', times, solution, x0=x0, solver={'scaled': False, 'rtol': 1e-4, 'atol': 1e-4}, policy=storage)
+					os.remove(filepath+'checkpoint.npz')
 					r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
 					
 					# Store Run Info into csv file
 					csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-					with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-						writer = csv.writer(f)
-						writer.writerow(csvdata)
-					f.close()
+					writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
+					filepath = writer.folder(run)
 
 					# if the inner-core size is within 10% of real inner-core, compute entropy and heat terms
 					if np.abs(r_i/r_i_real-1)<.1:
@@ -120,12 +122,9 @@ for T_cmb0 in T_cmbs:
 				except:
 					try:
 						del pl
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 						print('############## problem with '+str(csvdata)+'\n')
 					except:
 						print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
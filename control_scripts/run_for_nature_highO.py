@@ -2,10 +2,8 @@ import numpy as np
 from shutil import copyfile
 import matplotlib.pyplot as plt
 import sys, os
-import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 
 from mg_si import plot as mplt
@@ -15,6 +13,8 @@ layer_thickness = 100 # m
 overturn = 600 # Myr
 
 times = np.linspace(0,4568e6*365.25*24*3600,20000)
+## storage of the solutions, full float64 if None (see mg_si.record.StoragePolicy)
+storage = None
 
 ## background mantle state
 MgNumFp = 0.8
@@ -38,6 +38,7 @@ X_Sis = np.linspace(1e-5,.05,round(.05/.005)+1)
 X_Os = np.linspace(.155,.25,20)
 
 basefolder = '../computed_solutions_nature/'
+writer = mg_si.results.ResultWriter(basefolder)
 Ntotal = len(T_cmbs)*len(X_Mgs)*len(X_Sis)*len(X_Os)
 i = 1
 for T_cmb0 in T_cmbs:
@@ -48,19 +49,20 @@ for T_cmb0 in T_cmbs:
 				print('{} - {} K - {} Si {} Mg {} O - {}/{}'.format(time, T_cmb0, X_Si_0, X_Mg_0, X_O_0,i,Ntotal))
 				i += 1
 				pl = mg_si.planet.Custom()
+				stats = pl.stats
 				pl.reactions._set_layer_thickness(layer_thickness)
 				pl.reactions._set_overturn_time(overturn)
 				deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
 				T_um0 = T_cmb0-deltaT0
 				try:
-					filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-					if not os.path.exists(basefolder):
-						os.mkdir(basefolder)
-					if os.path.exists(filepath+'data.m'):
+					run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+					if writer.done(run):
 						print('already computed')
 						continue
-					if not os.path.exists(filepath):
-						os.mkdir(filepath)
+					filepath = writer.stage(run)
+					if filepath is None:
+						print('being computed by another process')
+						continue
 
 					Moles_0 = pl.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0)
 					x0 = [T_cmb0, T_um0]
@@ -75,30 +77,25 @@ for T_cmb0 in T_cmbs:
 					T_old = T_um0
 					A,nu0 = pl.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_old, T_old, set_values=True)
 
-					solution = pl.integrate(times, x0)
+					solution = pl.integrate(times, x0, checkpoint=filepath+'checkpoint.npz')
 					mplt.temperature(pl, times, solution, filepath=filepath)
 					mplt.coremoles(pl, times, solution, filepath=filepath)
 					mplt.composition(pl, times, solution, filepath=filepath)
 					plt.close('all')
-					dill.dump((pl,times,solution), open(filepath+'data.m','wb'))
+					pl.write_record(filepath+'record.npz', times, solution, x0=x0, solver={'scaled': False, 'rtol': 1e-4, 'atol': 1e-4}, policy=storage)
+					os.remove(filepath+'checkpoint.npz')
 					r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
 					csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-					with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-						writer = csv.writer(f)
-						writer.writerow(csvdata)
-					f.close()
+					writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
 					del pl
 					del csvdata
 					print('==== successfully finished computing')
 				except:
 					try:
 						del pl
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 						print('############## problem with '+str(csvdata)+'\n')
 					except:
 						print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
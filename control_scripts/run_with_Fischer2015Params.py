@@ -5,7 +5,6 @@ import sys, os
 import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 
 from mg_si import plot as mplt
@@ -49,6 +48,7 @@ X_Sis = np.linspace(minSi, maxSi, round((maxSi-minSi)/dSi)+1)
 X_Os = np.linspace(minO, maxO, round((maxO-minO)/dO)+1)
 
 basefolder = '/media/nknezek/compute_storage/computed_solutions_Fischer2015/'
+writer = mg_si.results.ResultWriter(basefolder)
 Ntotal = len(T_cmbs)*len(X_Mgs)*len(X_Sis)*len(X_Os)
 i = 1
 for T_cmb0 in T_cmbs:
@@ -59,19 +59,20 @@ for T_cmb0 in T_cmbs:
 				print('{} - {:.0f}K - {:.3f}Mg {:.3f}Si {:.3f}O - {}/{}'.format(time, T_cmb0, X_Mg_0, X_Si_0, X_O_0,i,Ntotal))
 				i += 1
 				pl = mg_si.planet.Custom()
+				stats = pl.stats
 				pl.reactions._set_layer_thickness(layer_thickness)
 				pl.reactions._set_overturn_time(overturn)
 				deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
 				T_um0 = T_cmb0-deltaT0
 				try:
-					filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-					if not os.path.exists(basefolder):
-						os.mkdir(basefolder)
-					if os.path.exists(filepath+'data.m'):
+					run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+					if writer.done(run):
 						print('already computed')
 						continue
-					if not os.path.exists(filepath):
-						os.mkdir(filepath)
+					filepath = writer.stage(run)
+					if filepath is None:
+						print('being computed by another process')
+						continue
 					pl.params.reactions.ParamCitationFeO = 'Fischer2015'
 					pl.params.reactions.ParamCitationSiO2 = 'Fischer2015'
 					pl.params.reactions.ParamCitationMgO = 'Badro2015'
@@ -97,22 +98,16 @@ for T_cmb0 in T_cmbs:
 					dill.dump((pl,times,solution), open(filepath+'data.m','wb'))
 					r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
 					csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-					with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-						writer = csv.writer(f)
-						writer.writerow(csvdata)
-					f.close()
+					writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
 					del pl
 					del csvdata
 					print('==== successfully finished computing')
 				except:
 					try:
 						del pl
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 						print('############## problem with '+str(csvdata)+'\n')
 					except:
 						print("!!!!!!!!!!!!!!!!!!!!!!!\ncouldn't do anything\n!!!!!!!!!!!!!!!!!\n")
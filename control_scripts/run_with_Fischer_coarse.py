@@ -5,7 +5,6 @@ import sys, os
 import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 from mg_si import plot as mplt
 
@@ -69,6 +68,7 @@ X_Sis = np.linspace(minSi, maxSi, round((maxSi-minSi)/dSi)+1)
 X_Os = np.linspace(minO, maxO, round((maxO-minO)/dO)+1)
 
 basefolder = '/media/nknezek/compute_storage/computed_solutions_Fischer2015/'
+writer = mg_si.results.ResultWriter(basefolder)
 alldatafile = 'all_parameters.m'
 
 Ntotal = len(T_cmbs)*len(X_Mgs)*len(X_Sis)*len(X_Os)
@@ -81,30 +81,29 @@ for T_cmb0 in T_cmbs:
 				print('{} - {:.0f}K - {:.3f}Mg {:.3f}Si {:.3f}O - {}/{}'.format(time, T_cmb0, X_Mg_0, X_Si_0, X_O_0,i,Ntotal))
 				i += 1
 				pl = mg_si.planet.Custom()
+				stats = pl.stats
 				pl.reactions._set_layer_thickness(layer_thickness)
 				pl.reactions._set_overturn_time(overturn)
 				deltaT0 = pl.mantle_layer.get_dT0(T_cmb0)
 				T_um0 = T_cmb0-deltaT0
 				try:
-					filepath = basefolder+ "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}/".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
-					if not os.path.exists(basefolder):
-						os.mkdir(basefolder)
-					if os.path.exists(filepath+'data.m'):
+					run = "Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}".format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+					if writer.done(run):
 						print('already computed')
 						del pl
 						continue
-					if not os.path.exists(filepath):
-						os.mkdir(filepath)
+					filepath = writer.stage(run)
+					if filepath is None:
+						print('being computed by another process')
+						del pl
+						continue
 				except:
 					print('!!!!! Problem setting up folders',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -125,12 +124,9 @@ for T_cmb0 in T_cmbs:
 					print('Problem with initial mole 0',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -144,12 +140,9 @@ for T_cmb0 in T_cmbs:
 					print('!!!!! Problem setting viscosity',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -171,12 +164,9 @@ for T_cmb0 in T_cmbs:
 					print('!!!!! Problem saving solution',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -190,12 +180,9 @@ for T_cmb0 in T_cmbs:
 					print('!!!!! Problem plotting',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -206,20 +193,15 @@ for T_cmb0 in T_cmbs:
 					
 					# Store Run Info into csv file
 					csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-					with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-						writer = csv.writer(f)
-						writer.writerow(csvdata)
-					f.close()
+					writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
+					filepath = writer.folder(run)
 				except:
 					print('!!!!! Problem saving data to csv',sys.exc_info()[1])
 					del pl
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])
 						continue
@@ -241,12 +223,9 @@ for T_cmb0 in T_cmbs:
 				except:
 					print('!!!!! Problem computing entropies',sys.exc_info()[1])
 					try:
-						r_i = 'nan'
+						r_i = np.nan
 						csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, MgNumFp, MgNumPv, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
-						with open(basefolder+'run_data{}.csv'.format(iT), 'a') as f:
-							writer = csv.writer(f)
-							writer.writerow(csvdata)
-						f.close()
+						writer.fail(run, csvdata, **stats)
 					except:
 						print('!!!!!! could not do anything !!!!!!!!!!!',sys.exc_info()[1])					
 
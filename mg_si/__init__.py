@@ -1,3 +1,3 @@
-__all__ = ['base','core','mantle','planet','radiogenics','reactions','plot']
+__all__ = ['base','core','mantle','planet','radiogenics','reactions','plot','calibration','uncertainty','archive','record','summary','results','views']
 
-from . import base, core, mantle, planet, radiogenics, reactions, plot
+from . import base, core, mantle, planet, radiogenics, reactions, plot, calibration, uncertainty, archive, record, summary, results, views
@@ -0,0 +1,134 @@
+'''
+Archive of many runs on a common time grid, so that quantities can be sliced across runs without loading each run.
+An archive is a folder holding
+
+    trajectories.npy  runs x times x state variables, opened memory-mapped with np.load(mmap_mode=...)
+    params.npy        structured array of the parameters of each run, one row per run
+    archive.json      version, time grid, state variable and parameter names and the core molar masses
+
+e.g. wt% Si at 1 Gyr of every run that was written:
+
+    archive = TrajectoryArchive(path)
+    wt = archive.core_wtp(1e9*const_yr_to_sec)[:, archive.core_species.index('Si')]
+    wt[archive.params['written']]
+'''
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+
+const_yr_to_sec = 365.25*24*3600
+
+ARCHIVE_VERSION = 1
+
+# parameter table columns: the setup parameters of planet.Custom and the present inner core radius
+ARCHIVE_PARAMS = ('T_cmb0', 'X_Mg_0', 'X_Si_0', 'X_O_0', 'nu_present', 'layer_thickness', 'overturn', 'X_MgFeO_b',
+                  'X_SiO2_b', 'MgNumFp', 'MgNumPv', 'T_present', 'r_i')
+
+class TrajectoryArchive():
+    def __init__(self, path, mode='r'):
+        '''
+        open an archive
+
+        :param path: archive folder
+        :param mode: np.memmap mode of the arrays, 'r' to read or 'r+' to write runs
+        '''
+        self.path = path
+        with open(os.path.join(path, 'archive.json')) as f:
+            meta = json.load(f)
+        if meta['version'] != ARCHIVE_VERSION:
+            raise ValueError('archive version {} is not {}'.format(meta['version'], ARCHIVE_VERSION))
+        self.times = np.array(meta['times'])
+        self.state_names = meta['state_names']
+        self.param_names = meta['param_names']
+        self.text_names = meta.get('text_names', [])
+        self.core_species = meta['core_species']
+        self.core_molmass = np.array(meta['core_molmass'])
+        self.data = np.load(os.path.join(path, 'trajectories.npy'), mmap_mode=mode)
+        self.params = np.load(os.path.join(path, 'params.npy'), mmap_mode=mode)
+
+    @classmethod
+    def create(cls, path, planet, times, N_runs, param_names=ARCHIVE_PARAMS, text_names=(), dtype=np.float64):
+        '''create an empty archive for N_runs runs of a planet class, with every value NaN until written
+
+        :param path: archive folder, created if needed
+        :param planet: planet of the runs, for the state variable names and core molar masses
+        :param times: common time grid [s]
+        :param N_runs: number of runs
+        :param param_names: parameter table columns, with a boolean 'written' column added
+        :param text_names: parameter table columns of text, e.g. K_D citations
+        :param dtype: dtype of the trajectories, e.g. np.float32 to halve the size
+        :return: archive opened for writing
+        '''
+        if not os.path.exists(path):
+            os.makedirs(path)
+        core = planet.reactions.core
+        state_names = ['T_cmb', 'T_um'] + list(core.species) + list(planet.reactions.mantle.species)
+        meta = {'version': ARCHIVE_VERSION, 'times': [float(t) for t in times], 'state_names': state_names,
+                'param_names': list(param_names), 'text_names': list(text_names), 'core_species': list(core.species),
+                'core_molmass': [float(m) for m in core.molmass]}
+        data = open_memmap(os.path.join(path, 'trajectories.npy'), mode='w+', dtype=dtype,
+                           shape=(N_runs, len(times), len(state_names)))
+        data[:] = np.nan
+        data.flush()
+        del data
+        params = np.zeros(N_runs, dtype=[(name, np.float64) for name in param_names]
+                          + [(name, 'U256') for name in text_names] + [('written', bool)])
+        for name in param_names:
+            params[name] = np.nan
+        np.save(os.path.join(path, 'params.npy'), params)
+        with open(os.path.join(path, 'archive.json'), 'w') as f:
+            json.dump(meta, f)
+        return cls(path, mode='r+')
+
+    def write(self, i, solution, params, times=None):
+        '''write a run, interpolated linearly onto the time grid
+
+        :param i: run index
+        :param solution: solution array at times, or a planet.Solution
+        :param params: dict of parameter values, any of param_names missing are left NaN and of text_names empty
+        :param times: times of the solution array [s]
+        '''
+        if times is None:
+            self.data[i] = solution(self.times)
+        else:
+            solution = np.asarray(solution)
+            self.data[i] = np.array([np.interp(self.times, times, x) for x in solution.T]).T
+        row = self.params[i]
+        for name in self.param_names:
+            row[name] = params.get(name, np.nan)
+        for name in self.text_names:
+            row[name] = params.get(name, '')
+        row['written'] = True
+        self.params[i] = row
+
+    def flush(self):
+        '''flush written runs to disk'''
+        self.data.flush()
+        self.params.flush()
+
+    def index(self, name):
+        '''index of a state variable'''
+        return self.state_names.index(name)
+
+    def at(self, t, runs=slice(None)):
+        '''states of runs at a time, interpolated linearly between the two nearest grid times
+
+        :param t: time [s]
+        :param runs: run indices or mask
+        :return: states [runs x state]
+        '''
+        j = int(np.clip(np.searchsorted(self.times, t) - 1, 0, len(self.times) - 2))
+        w = (t - self.times[j]) / (self.times[j+1] - self.times[j])
+        return (1. - w)*self.data[runs, j] + w*self.data[runs, j+1]
+
+    def core_wtp(self, t, runs=slice(None)):
+        '''wt% of each core species of runs at a time
+
+        :param t: time [s]
+        :param runs: run indices or mask
+        :return: wt% [runs x core species]
+        '''
+        i0 = self.index(self.core_species[0])
+        wt = self.at(t, runs)[..., i0:i0+len(self.core_species)]*self.core_molmass
+        return 100*wt / np.sum(wt, axis=-1, keepdims=True)
@@ -0,0 +1,198 @@
+'''
+Calibration of run parameters to present-day core constraints: the inner core radius and a seismically allowed
+core composition. Minimizes a weighted misfit with L-BFGS-B, using gradients from the forward sensitivities of
+planet.Custom.integrate, from several starting points run in parallel.
+'''
+import multiprocessing
+import numpy as np
+import scipy.optimize as opt
+import matplotlib.path as mplPath
+import mg_si
+
+const_yr_to_sec = 365.25*24*3600
+
+# present-day wt% O, wt% Si allowed by seismology (Badro et al. 2015), as used to select the plotted runs
+BADRO_SEISMIC_O_SI = np.array([[0.8, 0.], [1.2, 3.3], [3.2, 3.4], [5.2, 2.], [7., 0.], [0.8, 0.]])
+
+# ranges of the parameter sweeps, used as bounds unless given
+DEFAULT_BOUNDS = {'T_cmb0': (4800., 6500.),
+                  'X_Mg_0': (1e-5, .05),
+                  'X_Si_0': (1e-5, .05),
+                  'X_O_0': (1e-5, .15)}
+
+def polygon_distance(point, polygon):
+    '''distance of a point outside a closed polygon to its boundary and the nearest boundary point
+
+    :param point: [x, y]
+    :param polygon: vertices [N x 2], first and last equal
+    :return: distance (0 inside), nearest point (the point itself inside)
+    '''
+    point = np.asarray(point, dtype=float)
+    if mplPath.Path(polygon).contains_point(point):
+        return 0., point
+    a = polygon[:-1]
+    ab = polygon[1:] - a
+    s = np.clip(np.sum((point - a)*ab, axis=1)/np.sum(ab**2, axis=1), 0., 1.)
+    nearest = a + s[:, None]*ab
+    d = np.sqrt(np.sum((point - nearest)**2, axis=1))
+    i = np.argmin(d)
+    return d[i], nearest[i]
+
+class Calibration():
+    def __init__(self, parameters=('T_cmb0', 'X_Mg_0', 'X_Si_0', 'X_O_0'), bounds=None, r_i=1220e3, sigma_r_i=10e3,
+                 region=BADRO_SEISMIC_O_SI, sigma_wt=0.1, planet_class=None, planet_kwargs=None, reaction_params=None,
+                 setup_kwargs=None, t_present=4568e6*const_yr_to_sec, tol=None):
+        '''
+        calibration of setup parameters of a planet to the present inner core radius and core composition, with
+        misfit 1/2 ((r_i - r_i target)/sigma_r_i)^2 + 1/2 (distance of (wt% O, wt% Si) outside region/sigma_wt)^2
+
+        :param parameters: setup parameters to calibrate, from planet.Custom.sensitivity_parameters
+        :param bounds: dict of (lower, upper) bounds by parameter, DEFAULT_BOUNDS for any not given
+        :param r_i: present inner core radius [m]
+        :param sigma_r_i: weight of the inner core radius [m]
+        :param region: polygon of allowed present core (wt% O, wt% Si)
+        :param sigma_wt: weight of the distance to the allowed region [wt%]
+        :param planet_class: planet class, planet.Custom by default
+        :param planet_kwargs: arguments of planet_class
+        :param reaction_params: values set on params.reactions of each planet before setup, e.g. ParamCitationFeO
+        :param setup_kwargs: values of the setup arguments not calibrated
+        :param t_present: age of the planet [s]
+        :param tol: tolerances of the integration (see planet.Custom.scaled_tolerances)
+        '''
+        self.parameters = list(parameters)
+        bounds = dict(DEFAULT_BOUNDS, **(bounds or {}))
+        for name in self.parameters:
+            if name not in bounds:
+                raise ValueError('no bounds given for {}'.format(name))
+        self.bounds = np.array([bounds[name] for name in self.parameters], dtype=float)
+        self.r_i = r_i
+        self.sigma_r_i = sigma_r_i
+        self.region = np.asarray(region, dtype=float)
+        self.sigma_wt = sigma_wt
+        self.planet_class = planet_class or mg_si.planet.Custom
+        self.planet_kwargs = planet_kwargs or {}
+        self.reaction_params = reaction_params or {}
+        self.setup_kwargs = setup_kwargs or {}
+        self.times = np.array([0., t_present])
+        self.tol = tol
+        self.history = []
+
+    def to_params(self, u):
+        '''setup parameters from the optimization variables, scaled to [0, 1] between the bounds'''
+        return dict(zip(self.parameters, self.bounds[:, 0] + np.asarray(u)*(self.bounds[:, 1] - self.bounds[:, 0])))
+
+    def to_u(self, params):
+        '''optimization variables from a dict of setup parameters'''
+        p = np.array([params[name] for name in self.parameters], dtype=float)
+        return (p - self.bounds[:, 0]) / (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def make_planet(self, params):
+        '''planet set up with the calibrated and fixed parameters
+
+        :param params: dict of calibrated parameters
+        :return: planet, x0
+        '''
+        planet = self.planet_class(**self.planet_kwargs)
+        for key, value in self.reaction_params.items():
+            setattr(planet.params.reactions, key, value)
+        x0 = planet.setup(**dict(self.setup_kwargs, **params))
+        return planet, x0
+
+    def present_state(self, params):
+        '''integrate a run to the present with the sensitivities to the calibrated parameters
+
+        :param params: dict of calibrated parameters
+        :return: planet, present state, sensitivities of the present state [state x parameter]
+        '''
+        planet, x0 = self.make_planet(params)
+        solution, sensitivities = planet.integrate(self.times, x0, sensitivity=self.parameters, tol=self.tol)
+        return planet, solution[-1], sensitivities[-1]
+
+    def constraints(self, planet, x, S=None):
+        '''present inner core radius and core wt% O and Si, and their gradients to the parameters
+
+        :param planet: planet the state belongs to
+        :param x: present state
+        :param S: sensitivities of the present state, if gradients are wanted
+        :return: r_i [m], wt% [O, Si], dr_i_dp, dwt_dp [2 x parameter]
+        '''
+        core = planet.reactions.core
+        Nc = len(core.species)
+        M_c = np.asarray(x[2:2+Nc])
+        mm = np.array(core.molmass)
+        i = [core.species.index('O'), core.species.index('Si')]
+        wt = 100*core.M2wtp(M_c)[i]
+        r_i = planet.core_layer.r_i(x[0], one_off=True)
+        if S is None:
+            return r_i, wt, None, None
+        W = np.sum(M_c*mm)
+        dwt_dM = 100*(np.eye(Nc)[i]*mm[i, None]/W - (M_c*mm)[i, None]*mm[None, :]/W**2)
+        dr_i_dp = planet.core_layer.C_r(x[0], recompute=True, store_computed=False)*S[0]
+        return r_i, wt, dr_i_dp, dwt_dM @ S[2:2+Nc]
+
+    def misfit(self, u):
+        '''misfit and its gradient to the optimization variables
+
+        :param u: optimization variables (see to_params)
+        :return: misfit, gradient
+        '''
+        params = self.to_params(u)
+        planet, x, S = self.present_state(params)
+        r_i, wt, dr_i_dp, dwt_dp = self.constraints(planet, x, S)
+        d, nearest = polygon_distance(wt, self.region)
+        f = 0.5*((r_i - self.r_i)/self.sigma_r_i)**2 + 0.5*(d/self.sigma_wt)**2
+        df_dp = (r_i - self.r_i)/self.sigma_r_i**2*dr_i_dp + (wt - nearest)/self.sigma_wt**2 @ dwt_dp
+        self.history.append({'params': params, 'misfit': f, 'r_i': r_i, 'wt_O': wt[0], 'wt_Si': wt[1]})
+        return f, df_dp*(self.bounds[:, 1] - self.bounds[:, 0])
+
+    def minimize(self, params0, maxiter=50, gtol=1e-6):
+        '''calibrate from one starting point with L-BFGS-B
+
+        :param params0: dict of starting values of the calibrated parameters
+        :param maxiter: maximum iterations
+        :param gtol: gradient tolerance of the scaled variables
+        :return: scipy OptimizeResult, with params, r_i, wt_O, wt_Si and history added
+        '''
+        self.history = []
+        result = opt.minimize(self.misfit, np.clip(self.to_u(params0), 0., 1.), jac=True, method='L-BFGS-B',
+                              bounds=[(0., 1.)]*len(self.parameters), options={'maxiter': maxiter, 'gtol': gtol})
+        result.params = self.to_params(result.x)
+        best = min(self.history, key=lambda h: h['misfit'])
+        result.r_i = best['r_i']
+        result.wt_O = best['wt_O']
+        result.wt_Si = best['wt_Si']
+        result.history = self.history
+        return result
+
+    def starts(self, N, seed=None):
+        '''N starting points drawn by Latin hypercube sampling within the bounds
+
+        :param N: number of starting points
+        :param seed: random seed
+        :return: list of dicts of starting values
+        '''
+        rng = np.random.default_rng(seed)
+        u = (np.array([rng.permutation(N) for _ in self.parameters]).T + rng.random((N, len(self.parameters))))/N
+        return [self.to_params(ui) for ui in u]
+
+    def multistart(self, starts=8, processes=None, seed=None, **kwargs):
+        '''calibrate from several starting points in parallel, one process per start
+
+        :param starts: list of dicts of starting values, or the number to draw with starts()
+        :param processes: number of processes, one per cpu by default
+        :param seed: random seed for drawn starting points
+        :param kwargs: passed to minimize
+        :return: results sorted by misfit, with the exception instead for any start that failed
+        '''
+        if np.isscalar(starts):
+            starts = self.starts(int(starts), seed=seed)
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_minimize_start, [(self, params0, kwargs) for params0 in starts])
+        return sorted(results, key=lambda r: r.fun if isinstance(r, opt.OptimizeResult) else np.inf)
+
+def _minimize_start(args):
+    calibration, params0, kwargs = args
+    try:
+        return calibration.minimize(params0, **kwargs)
+    except Exception as e:
+        return e
@@ -470,10 +470,15 @@ class Nimmo(CoreLayer):
         if self.current_values.C_r is not None and not recompute:
             return self.current_values.C_r
         else:
-            dT = 1e-6
+            # implicit derivative of T_adiabat(T_cmb, r_i) = T_m(P(r_i)), rather than a finite difference of the
+            # brentq root, whose tolerance makes it noisy
             r_i = self.r_i(T_cmb, recompute=True, store_computed=False)
-            r_ip = self.r_i(T_cmb + dT, recompute=True, store_computed=False)
-            C_r = (r_ip - r_i) / dT
+            if r_i == 0. or r_i == p.r_c:
+                C_r = 0.
+            else:
+                P_i = self.P(r_i)
+                dTm_dr = p.T_m0 * (p.T_m1 + 2 * p.T_m2 * P_i) * -self.rho(r_i) * self.g(r_i)
+                C_r = -self.T_adiabat_from_T_cmb(T_cmb, r_i) / T_cmb / (self.dTa_dr(T_cmb, r_i) - dTm_dr)
             if store_computed:
                 self.current_values.C_r = C_r
             return C_r
@@ -637,6 +642,16 @@ class Nimmo(CoreLayer):
                 self.current_values.T_R = T_R
             return T_R
 
+    def T_cmb_from_r_i(self, r_i):
+        '''
+        CMB temperature at which the adiabat meets the liquidus at the inner core radius r_i, the inverse of r_i
+
+        :param r_i: inner core radius [m]
+        :return: T_cmb [K]
+        '''
+        p = self.params.core
+        return self.T_m(self.P(r_i)) * exp((r_i ** 2 - p.r_c ** 2) / p.D ** 2)
+
     def r_i(self, T_cmb, recompute=False, store_computed=True, one_off=False):
         p = self.params.core
         if self.current_values.r_i is not None and not recompute and not one_off:
@@ -1271,8 +1286,8 @@ class Custom(Nimmo):
                 dMoles_dT = self.current_values.dMoles_dT
             else:
                 dMoles_dT = self.planet.reactions.dMoles_dT(Moles, T_cmb, dKs_dT=dKs_dT, dTdt=dTdt_est, time=time) #HACK for erosion
-                # if store_computed:
-                    # self.current_values.dMoles_dT = dMoles_dT
+                if store_computed:
+                    self.current_values.dMoles_dT = dMoles_dT
 
             C_m = self.planet.reactions.C_m(dMoles_dT, Moles)
             if store_computed:
@@ -1306,8 +1321,8 @@ class Custom(Nimmo):
                 dMoles_dT = self.current_values.dMoles_dT
             else:
                 dMoles_dT = self.planet.reactions.dMoles_dT(Moles, T_cmb, dKs_dT=dKs_dT, dTdt=dTdt_est, time=time) #HACK for erosion
-                # if store_computed:
-                    # self.current_values.dMoles_dT = dMoles_dT
+                if store_computed:
+                    self.current_values.dMoles_dT = dMoles_dT
 
             # compute C_m dependent on solubility of X_Mg compared to current X_Mg
             # 0 if X_Mg_sol > X_Mg, convert to wt% MgO if X_Mg_sol < X_Mg
@@ -1343,8 +1358,8 @@ class Custom(Nimmo):
                 dMoles_dT = self.current_values.dMoles_dT
             else:
                 dMoles_dT = self.planet.reactions.dMoles_dT(Moles, T_cmb, dKs_dT=dKs_dT, dTdt=dTdt_est, time=time) #HACK for erosion
-                # if store_computed:
-                    # self.current_values.dMoles_dT = dMoles_dT
+                if store_computed:
+                    self.current_values.dMoles_dT = dMoles_dT
 
             # compute C_m dependent on solubility of X_Mg compared to current X_Mg
             # 0 if X_Mg_sol > X_Mg, convert to wt% MgO if X_Mg_sol < X_Mg
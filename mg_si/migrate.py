@@ -0,0 +1,174 @@
+'''
+Migration of legacy run folders into a TrajectoryArchive. The control scripts wrote each run as a data.m of the
+dill pickled (planet, times, solution), now as a record.npz run record (see mg_si.record), with a row per run in
+run_data*.csv. The runs are read on a process pool, their parameters taken from the pickled params objects rather
+than the folder names, and the number of runs checked against the successful rows of the CSVs of each tree.
+
+    python -m mg_si.migrate archive_folder computed_solutions_nature [computed_solutions_... ...]
+
+Unpickling data.m needs dill and an mg_si that still provides the pickled classes.
+'''
+import argparse
+import multiprocessing
+import os
+import numpy as np
+import mg_si
+from mg_si.base import Parameters
+from mg_si.archive import TrajectoryArchive, ARCHIVE_PARAMS
+
+const_yr_to_sec = 365.25*24*3600
+
+# text columns of the archive: the K_D citations of the run and the data.m it came from
+MIGRATE_TEXT = ('ParamCitationFeO', 'ParamCitationSiO2', 'ParamCitationMgO', 'source')
+
+# core and mantle layer species the setup of a run without run_params is taken from, by name
+LEGACY_CORE = ('Mg', 'Si', 'O')
+LEGACY_MANTLE = ('MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3')
+
+def find_runs(trees):
+    '''run files under the trees, sorted: the record.npz of each run folder, or its data.m if it has no record
+
+    :param trees: list of folders
+    :return: list of paths
+    '''
+    paths = []
+    for tree in trees:
+        for folder, _, files in os.walk(tree):
+            for name in ('record.npz', 'data.m'):
+                if name in files:
+                    paths.append(os.path.join(folder, name))
+                    break
+    return sorted(paths)
+
+def legacy_params(planet, solution, T_present=1350.):
+    '''setup parameters of a pickled run, from run_params if it was set up with planet.Custom.setup and otherwise
+    from the values setup stores on planet.params, taken by species name from the core and mantle layer species of
+    the planet. A run without all of LEGACY_CORE and LEGACY_MANTLE raises a ValueError, reported by migrate as a
+    failure.
+
+    :param planet: unpickled planet
+    :param solution: its solution
+    :param T_present: present upper mantle temperature of the viscosity law, if not in run_params
+    :return: dict of ARCHIVE_PARAMS and MIGRATE_TEXT values
+    '''
+    pr = planet.params.reactions
+    run_params = getattr(planet, 'run_params', None)
+    if run_params is not None:
+        params = {name: run_params[name] for name in ARCHIVE_PARAMS if name in run_params}
+    else:
+        core_species = list(planet.reactions.core.species)
+        mantle_species = list(planet.reactions.mantle.species)
+        missing = [sp for sp in LEGACY_CORE if sp not in core_species]
+        missing += [sp for sp in LEGACY_MANTLE if sp not in mantle_species]
+        if missing:
+            raise ValueError('run has no {} species to take its setup from'.format(', '.join(missing)))
+        Moles_0 = np.asarray(pr.Moles_0, dtype=float)
+        X_0 = dict(zip(core_species, planet.reactions.core.M2X(Moles_0[:len(core_species)])))
+        Mm_b = dict(zip(mantle_species, np.asarray(pr.Mm_b, dtype=float)))
+        M_b = sum(Mm_b.values())
+        pm = planet.params.mantle
+        params = {'T_cmb0': solution[0, 0], 'X_Mg_0': X_0['Mg'], 'X_Si_0': X_0['Si'], 'X_O_0': X_0['O'],
+                  'nu_present': pm.nu_0*np.exp(pm.A/T_present), 'layer_thickness': pr.thickness,
+                  'overturn': pr.time_overturn_p/(1e6*const_yr_to_sec),
+                  'X_MgFeO_b': (Mm_b['MgO'] + Mm_b['FeO'])/M_b, 'X_SiO2_b': Mm_b['SiO2']/M_b,
+                  'MgNumFp': Mm_b['MgO']/(Mm_b['MgO'] + Mm_b['FeO']),
+                  'MgNumPv': Mm_b['MgSiO3']/(Mm_b['MgSiO3'] + Mm_b['FeSiO3']), 'T_present': T_present}
+    T_cmb = solution[-1, 0]
+    params['r_i'] = planet.core_layer.r_i(T_cmb, one_off=True) if np.isfinite(T_cmb) else np.nan
+    for name in MIGRATE_TEXT[:-1]:
+        params[name] = str(getattr(pr, name, ''))
+    return params
+
+def _load_run(args):
+    path, times = args
+    try:
+        if path.endswith('.npz'):
+            planet, run_times, solution = mg_si.planet.Custom.from_record(path)
+        else:
+            import dill
+            with open(path, 'rb') as f:
+                planet, run_times, solution = dill.load(f)
+        solution = np.asarray(solution, dtype=float)
+        params = legacy_params(planet, solution)
+        params['source'] = path
+        trajectory = np.array([np.interp(times, run_times, x) for x in solution.T]).T
+        return path, params, trajectory, None
+    except Exception as e:
+        return path, None, None, repr(e)
+
+def csv_row_counts(tree):
+    '''rows of the run_data*.csv of a tree written by the control scripts, a row of NaN r_i for each run that failed
+    and a full row for each that finished
+
+    :param tree: folder
+    :return: number of rows, number of failed rows
+    '''
+    paths = [os.path.join(folder, name) for folder, _, files in os.walk(tree) for name in sorted(files)
+             if name.startswith('run_data') and name.endswith('.csv')]
+    rows = 0
+    failed = 0
+    for chunk in mg_si.summary.iter_summary(paths):
+        rows += len(chunk)
+        failed += int(np.sum(np.isnan(chunk['r_i'])))
+    return rows, failed
+
+def migrate(archive_path, trees, times=None, processes=None, chunksize=4):
+    '''read the runs of legacy trees into a new archive
+
+    :param archive_path: archive folder to create
+    :param trees: list of folders holding run folders and run_data*.csv
+    :param times: common time grid, 1001 times over 4568 Myr by default
+    :param processes: number of processes, one per cpu by default
+    :param chunksize: runs sent to a process at a time
+    :return: archive, Parameters with n_found, n_written, failures [(path, error)], including runs whose state does
+        not fit the planet.Custom layout of the archive, and, by tree, the number of runs found, csv rows, failed csv
+        rows and whether the runs found match the finished csv rows (None without csv)
+    '''
+    if times is None:
+        times = np.linspace(0., 4568e6*const_yr_to_sec, 1001)
+    paths = find_runs(trees)
+    archive = TrajectoryArchive.create(archive_path, mg_si.planet.Custom(), times, len(paths),
+                                       text_names=MIGRATE_TEXT)
+    report = Parameters('migration of ' + ', '.join(trees))
+    report.n_found = len(paths)
+    report.failures = []
+    with multiprocessing.Pool(processes) as pool:
+        for i, (path, params, trajectory, error) in enumerate(
+                pool.imap(_load_run, [(path, times) for path in paths], chunksize=chunksize)):
+            if error is None and trajectory.shape[1] != len(archive.state_names):
+                # e.g. a Custom_LightElements run with species other than those of the archive layout
+                error = 'state of {} variables does not match the {} of the archive'.format(
+                    trajectory.shape[1], len(archive.state_names))
+            if error is not None:
+                report.failures.append((path, error))
+                continue
+            archive.write(i, trajectory, params, times=times)
+    archive.flush()
+    report.n_written = int(np.sum(archive.params['written']))
+    report.trees = {}
+    for tree in trees:
+        n_runs = len(find_runs([tree]))
+        rows, failed = csv_row_counts(tree)
+        report.trees[tree] = {'runs': n_runs, 'csv_rows': rows, 'csv_failed': failed,
+                              'match': n_runs == rows - failed if rows else None}
+    return archive, report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='migrate legacy data.m run folders into a trajectory archive')
+    parser.add_argument('archive', help='archive folder to create')
+    parser.add_argument('trees', nargs='+', help='folders of legacy runs')
+    parser.add_argument('--processes', type=int, default=None, help='number of processes, one per cpu by default')
+    parser.add_argument('--N_times', type=int, default=1001, help='number of times of the common grid over 4568 Myr')
+    args = parser.parse_args(argv)
+    times = np.linspace(0., 4568e6*const_yr_to_sec, args.N_times)
+    archive, report = migrate(args.archive, args.trees, times=times, processes=args.processes)
+    print('{} of {} runs written to {}'.format(report.n_written, report.n_found, args.archive))
+    for path, error in report.failures:
+        print('failed {}: {}'.format(path, error))
+    for tree, counts in report.trees.items():
+        check = {True: '', False: ' - MISMATCH', None: ' - no csv to check against'}[counts['match']]
+        print('{}: {runs} runs, {csv_rows} csv rows of which {csv_failed} failed{}'.format(tree, check, **counts))
+    return 0 if not report.failures and all(c['match'] is not False for c in report.trees.values()) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
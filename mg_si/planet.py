@@ -1,3 +1,9 @@
+import copy
+import hashlib
+import json
+import os
+import time
+import warnings
 import numpy as np
 import scipy.integrate as integrate
 import mg_si
@@ -102,6 +108,99 @@ class Custom(Planet):
         self.mantle_layer = self.layers[1]
         self.reactions = mg_si.reactions.MgSi(params=params)
         self.radiogenics = mg_si.radiogenics.Radiogenics()
+        # solver statistics of the last integration (see mg_si.record.SOLVER_STATS), updated in place
+        self.stats = {}
+
+    def setup(self, T_cmb0, X_Mg_0, X_Si_0, X_O_0, nu_present=None, layer_thickness=100., overturn=600.,
+              X_MgFeO_b=0.311, X_SiO2_b=0.015, MgNumFp=0.8, MgNumPv=0.93, T_present=1350., X_extra=None):
+        '''set the planet up for a run as the control scripts do, and keep the values in self.run_params
+
+        :param T_cmb0: initial CMB temperature [K]
+        :param X_Mg_0: initial mole fraction Mg in the core
+        :param X_Si_0: initial mole fraction Si in the core
+        :param X_O_0: initial mole fraction O in the core
+        :param nu_present: present mantle viscosity [m^2/s], 10^21 Pa s by default
+        :param layer_thickness: thickness of the mantle layer in contact with the core [m]
+        :param overturn: overturn time of the mantle layer [Myr]
+        :param X_MgFeO_b: background mantle mole fraction (Mg,Fe)O
+        :param X_SiO2_b: background mantle mole fraction SiO2
+        :param MgNumFp: background mantle Mg number of ferropericlase
+        :param MgNumPv: background mantle Mg number of bridgmanite
+        :param T_present: present upper mantle temperature [K]
+        :param X_extra: initial mole fractions of any additional core light elements (Custom_LightElements only)
+        :return: x0
+        '''
+        if nu_present is None:
+            nu_present = 10**21/self.params.mantle.rho
+        self.run_params = {'T_cmb0': T_cmb0, 'X_Mg_0': X_Mg_0, 'X_Si_0': X_Si_0, 'X_O_0': X_O_0,
+                           'nu_present': nu_present, 'layer_thickness': layer_thickness, 'overturn': overturn,
+                           'X_MgFeO_b': X_MgFeO_b, 'X_SiO2_b': X_SiO2_b, 'MgNumFp': MgNumFp, 'MgNumPv': MgNumPv,
+                           'T_present': T_present, 'X_extra': X_extra}
+        extra = {} if X_extra is None else {'X_extra': X_extra}
+        self.reactions._set_layer_thickness(layer_thickness)
+        self.reactions._set_overturn_time(overturn)
+        T_um0 = T_cmb0 - self.mantle_layer.get_dT0(T_cmb0)
+        Moles_0 = self.reactions.compute_Moles_0(X_Mg_0, X_Si_0, X_O_0, T_cmb0, **extra)
+        self.params.reactions.Moles_0 = Moles_0
+        self.params.reactions.Mm_b = self.reactions.mantle.compute_Mm_b(X_MgFeO=X_MgFeO_b, X_SiO2=X_SiO2_b,
+                                                                        MgNumFp=MgNumFp, MgNumPv=MgNumPv, **extra)
+        self.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_present/1e3, T_um0, set_values=True)
+        return [T_cmb0, T_um0] + list(Moles_0)
+
+    def record(self, times, solution, x0=None, solver=None, info=None, wall_time=None):
+        '''run record of a solution of this planet (see mg_si.record)
+
+        :param times: output times
+        :param solution: solution array, or a planet.Solution
+        :param x0: initial state, the first state of solution by default
+        :param solver: dict of the integration settings, e.g. {'scaled': True, 'tol': None}
+        :param info: solver info, from integrate with full_output, for the solver statistics, those of the last
+            integration of this planet (self.stats) by default
+        :param wall_time: wall time of the integration [s], overriding that of self.stats
+        :return: record dict
+        '''
+        params, arrays = mg_si.record.flatten_params(self.params)
+        if x0 is None:
+            x0 = solution.x[0] if isinstance(solution, Solution) else solution[0]
+        stats = mg_si.record.solver_stats(info) if info is not None else dict(getattr(self, 'stats', {}))
+        if wall_time is not None:
+            stats['wall_time'] = wall_time
+        return {'version': mg_si.record.RECORD_VERSION, 'planet_class': type(self).__name__,
+                'run_params': getattr(self, 'run_params', None), 'params': params, 'arrays': arrays,
+                'x0': [float(x) for x in x0], 'solver': solver or {},
+                'stats': stats}
+
+    def write_record(self, filename, times, solution, compress=False, policy=None, **kwargs):
+        '''write the run record of a solution of this planet
+
+        :param filename: record file, .npz
+        :param times: output times
+        :param solution: solution array, or a planet.Solution
+        :param compress: compress the file (see mg_si.record.write_record)
+        :param policy: mg_si.record.StoragePolicy to store the solution with, full float64 if None
+        :param kwargs: passed to record
+        '''
+        mg_si.record.write_record(filename, self.record(times, solution, **kwargs), times, solution,
+                                  compress=compress, policy=policy)
+
+    @classmethod
+    def from_record(cls, filename, **kwargs):
+        '''rebuild the planet of a run record for re-analysis, with the parameters it was run with
+
+        :param filename: record file
+        :param kwargs: arguments of the planet class, e.g. the species of Custom_LightElements
+        :return: planet, times, solution
+        '''
+        record, times, solution = mg_si.record.read_record(filename)
+        planet_class = getattr(mg_si.planet, record['planet_class'], cls)
+        if not issubclass(planet_class, cls):
+            planet_class = cls
+        planet = planet_class(**kwargs)
+        mg_si.record.unflatten_params(record['params'], planet.params, record['arrays'])
+        planet.reactions.bind_KD_model()
+        if record['run_params'] is not None:
+            planet.run_params = record['run_params']
+        return planet, times, solution
 
     def ODE(self, x, t):
         '''define the ODE for thermal evolution
@@ -111,8 +210,22 @@ class Custom(Planet):
         :return:
         '''
         T_cmb = x[0]
-        T_um = x[1]
         Moles = x[2:]
+        dTc_dt, dTm_dt = self.thermal_ODE(x[:2], t, Moles)
+        dMoles_dt = self.chemistry_ODE(Moles, t, T_cmb, dTc_dt)
+
+        return np.array([dTc_dt, dTm_dt] + list(dMoles_dt))
+
+    def thermal_ODE(self, T, t, Moles):
+        '''the thermal part of the ODE, for the core and mantle temperatures at fixed composition
+
+        :param T: [T_cmb, T_um]
+        :param t: time
+        :param Moles: moles of each species
+        :return: [dTc_dt, dTm_dt]
+        '''
+        T_cmb = T[0]
+        T_um = T[1]
         try:
             self.params.Mantle_verbose
             vm = True
@@ -121,18 +234,810 @@ class Custom(Planet):
         dTm_dt = self.mantle_layer.energy_balance(T_cmb, T_um, t, verbose=vm)
         cmb_flux = self.mantle_layer.lower_boundary_flux(T_cmb, T_um)
         dTc_dt = self.core_layer.energy_balance(t, T_cmb, cmb_flux, Moles)
-        dMoles_dt  = self.reactions.dMoles_dt(Moles=Moles, T_cmb=T_cmb, dTc_dt=dTc_dt, time=t)
-        dM_Mg_dt, dM_Si_dt, dM_Fe_dt, dM_O_dt, dM_c_dt, dM_MgO_dt, dM_SiO2_dt, dM_FeO_dt, dM_MgSiO3_dt, dM_FeSiO3_dt, dM_m_dt = self.reactions.unwrap_Moles(dMoles_dt)
+        return np.array([dTc_dt, dTm_dt])
 
-        return np.array([dTc_dt, dTm_dt, dM_Mg_dt, dM_Si_dt, dM_Fe_dt, dM_O_dt, dM_MgO_dt, dM_SiO2_dt, dM_FeO_dt, dM_MgSiO3_dt, dM_FeSiO3_dt])
+    def chemistry_ODE(self, Moles, t, T_cmb, dTc_dt):
+        '''the chemical part of the ODE, for the moles of each species at a given CMB temperature and cooling rate
 
-    def integrate(self, times, x0, full_output=False):
+        :param Moles: moles of each species
+        :param t: time
+        :param T_cmb: CMB temperature [K]
+        :param dTc_dt: CMB cooling rate [K/s]
+        :return: dMoles_dt
+        '''
+        dMoles_dt = self.reactions.dMoles_dt(Moles=Moles, T_cmb=T_cmb, dTc_dt=dTc_dt, time=t)
+        return np.array(self.reactions.unwrap_Moles(dMoles_dt, return_sum=False))
+
+    def element_drift(self, solution):
+        '''drift monitor on the element totals of the core and layer. Elements in no layer species must be conserved,
+        so their drift is integration or model error; the others change by exchange with the background mantle.
+
+        :param solution: state at the output times, full layout
+        :return: dict with 'elements', 'conserved' (bool per element), 'totals' and 'drift' (change of the totals
+            relative to the initial totals)
+        '''
+        network = self.reactions.network
+        totals = network.element_totals(solution[:, 2:])
+        return {'elements': network.elements, 'conserved': ~network.exchanged, 'totals': totals,
+                'drift': (totals - totals[0]) / totals[0]}
+
+    # tolerances of the scaled integration: rtol, and the absolute tolerance of the temperatures, core moles and
+    # layer moles as a fraction of their characteristic values (see state_scales)
+    scaled_tolerances = {'rtol': 1e-4, 'T': 1e-6, 'core': 1e-6, 'layer': 1e-6}
+
+    def state_scales(self, x0):
+        '''characteristic value of each state component: T_cmb0 for both temperatures, the initial total moles of the
+        core for the core species and the initial total moles of the layer for the layer species
+
+        :param x0: initial state
+        :return: array of scales, same length as x0
+        '''
+        x0 = np.asarray(x0, dtype=float)
+        Nc = len(self.reactions.core.species)
+        scales = np.empty_like(x0)
+        scales[:2] = x0[0]
+        scales[2:2+Nc] = np.sum(x0[2:2+Nc])
+        scales[2+Nc:] = np.sum(x0[2+Nc:])
+        return scales
+
+    def state_tolerances(self, x0, tol=None):
+        '''rtol and per-component atol of the scaled state
+
+        :param x0: initial state
+        :param tol: dict overriding any of scaled_tolerances
+        :return: rtol, atol
+        '''
+        tol = dict(self.scaled_tolerances, **(tol or {}))
+        Nc = len(self.reactions.core.species)
+        atol = np.empty(len(x0))
+        atol[:2] = tol['T']
+        atol[2:2+Nc] = tol['core']
+        atol[2+Nc:] = tol['layer']
+        return tol['rtol'], atol
+
+    def scaled_ODE(self, y, t, scales):
+        '''the ODE for the state scaled by state_scales
+
+        :param y: scaled state
+        :param t: time
+        :param scales: state_scales of the initial state
+        :return: scaled time derivative
+        '''
+        return self.ODE(y*scales, t)/scales
+
+    def equilibrium_state(self, x0):
+        '''quasi-equilibrium state of x0: T_cmb, T_um, the element totals of the core and layer and the moles of the
+        species formed within the layer (reactions.kinetic_species)
+
+        :param x0: state, full layout
+        :return: z0
+        '''
+        x0 = np.asarray(x0, dtype=float)
+        return np.concatenate([x0[:2], self.reactions.network.element_totals(x0[2:]),
+                               x0[2:][self.reactions.kinetic_species()]])
+
+    def equilibrium_ODE(self, z, t):
+        '''the ODE for the quasi-equilibrium state (see equilibrium_state). The core exchange reactions are held at
+        equilibrium, so the other moles are solved from the element totals at every call instead of integrated,
+        and the rates of the state come from the full ODE at that composition. Raises ValueError if no such
+        composition exists, e.g. if the layer erodes to negative moles. The compositions solved and their rates
+        are kept in self._equilibrium_history, trimmed to those nearest the output times self._equilibrium_times
+        and the last one, and the solve starts from the last one carried forward to t.
+
+        :param z: [T_cmb, T_um, element totals, moles of the kinetic species]
+        :param t: time
+        :return: dz/dt
+        '''
+        rx = self.reactions
+        Nel = len(rx.network.elements)
+        kinetic = rx.kinetic_species()
+        Moles = self._equilibrium_guess(t, *self._equilibrium_history[-1])
+        Moles[kinetic] = z[2+Nel:]
+        Moles = rx.equilibrium_Moles(z[0], z[2:2+Nel], Moles)
+        dx_dt = self.ODE(np.concatenate([z[:2], Moles]), t)
+        self._equilibrium_history.append((t, Moles, dx_dt[2:]))
+        if len(self._equilibrium_history) > 2*len(self._equilibrium_times) + 100:
+            self._trim_equilibrium_history()
+        return np.concatenate([dx_dt[:2], rx.network.element_totals(dx_dt[2:]), dx_dt[2:][kinetic]])
+
+    def _nearest_equilibrium(self, times):
+        '''index in self._equilibrium_history of the composition solved nearest to each of times'''
+        t_rhs = np.array([entry[0] for entry in self._equilibrium_history])
+        order = np.argsort(t_rhs, kind='stable')
+        i = np.clip(np.searchsorted(t_rhs[order], times), 1, len(t_rhs) - 1)
+        i -= times - t_rhs[order][i-1] < t_rhs[order][i] - times
+        return order[i]
+
+    def _trim_equilibrium_history(self):
+        '''drop the compositions that are neither the nearest to an output time nor the last one. A dropped one
+        can never become the nearest again, as the one nearer than it is kept.'''
+        keep = set(self._nearest_equilibrium(self._equilibrium_times)) | {len(self._equilibrium_history) - 1}
+        self._equilibrium_history = [self._equilibrium_history[i] for i in sorted(keep)]
+
+    @staticmethod
+    def _equilibrium_guess(t, t_0, Moles_0, dMoles_dt):
+        '''Moles_0 at t_0 carried forward to t at the rates dMoles_dt, or Moles_0 where that would leave no moles'''
+        Moles = Moles_0 + dMoles_dt*(t - t_0)
+        return np.where(Moles > 0., Moles, Moles_0)
+
+    def equilibrium_diagnostic(self, times, x0, tol=None):
+        '''integrate the full kinetic ODE and the quasi-equilibrium mode from x0, both scaled with the same tolerances,
+        and compare them
+
+        :param times:
+        :param x0:
+        :param tol: dict overriding any of scaled_tolerances
+        :return: dict with both solutions, their wall times [s] and RHS evaluation counts, the largest difference of
+            each state component relative to state_scales, the final inner-core radius of each, and as 'fallback'
+            the reason the equilibrium mode integrated the kinetic ODE instead, None if it did not
+        '''
+        out = {}
+        for method in ('kinetic', 'equilibrium'):
+            solution, info = self.integrate(times, x0, full_output=True, scaled=True, tol=tol, method=method)
+            out[method] = solution
+            out[method + '_wall_time'] = self.stats['wall_time']
+            out[method + '_nfe'] = self.stats['nfe']
+            out[method + '_r_i'] = self.core_layer.r_i(solution[-1, 0], one_off=True)
+        out['fallback'] = info.get('fallback')
+        out['max_rel_diff'] = np.max(np.abs(out['equilibrium'] - out['kinetic']), axis=0) / self.state_scales(x0)
+        return out
+
+    def integrate(self, times, x0, full_output=False, scaled=False, tol=None, method='kinetic', sensitivity=None,
+                  checkpoint=None, checkpoint_every=1000, dense=False):
         '''integrate the ODE
 
         :param times:
         :param x0:
         :param full_output:
-        :return:
+        :param scaled: integrate the state scaled by state_scales, with tolerances per quantity from tol
+        :param tol: dict overriding any of scaled_tolerances. Raises ValueError if given to an unscaled kinetic
+            integration, which has fixed tolerances.
+        :param method: 'kinetic' for the full ODE, 'equilibrium' to hold the core exchange reactions at
+            equilibrium (see equilibrium_ODE), always scaled and falling back to the kinetic ODE if the equilibrium
+            composition cannot be solved for (see _integrate_equilibrium), or 'split' for Strang splitting of the
+            thermal and chemical parts with tolerances from tol (see split_step). Splitting is slower than the
+            coupled LSODA integration, by about 10x on the reference cases, and is only kept for comparison.
+        :param sensitivity: names of setup parameters (see sensitivity_parameters) to integrate the forward
+            sensitivities of the state to, scaled as with scaled=True. The planet must have been set up with setup()
+            and x0 is the state it returned. Returns solution, sensitivities [len(times) x len(x0) x len(sensitivity)]
+            and, with full_output, the info dict.
+        :param checkpoint: file to checkpoint the run to, resumed from if it exists (see _integrate_checkpointed)
+        :param checkpoint_every: number of output times between checkpoints
+        :param dense: keep only the accepted solver steps and an interpolant between them, as a Solution, rather
+            than stopping on each of times (see _integrate_dense)
+        :return: solution[, sensitivities][, info]. The solver statistics and wall time of the integration are kept
+            in self.stats whether it succeeds or not.
         '''
-        solution = integrate.odeint(self.ODE, x0, times, full_output=full_output,h0=1e7,rtol=1e-4,atol=1e-4,mxstep=5000000)
+        return self._with_stats(lambda: self._integrate(times, x0, scaled=scaled, tol=tol, method=method,
+                                                        sensitivity=sensitivity, checkpoint=checkpoint,
+                                                        checkpoint_every=checkpoint_every, dense=dense),
+                                full_output, dense=dense)
+
+    def _with_stats(self, integration, full_output, dense=False):
+        '''run an integration returning its solver info, keeping its solver statistics and wall time in self.stats
+
+        :param integration: function of no arguments returning solution[, sensitivities], info
+        :param full_output: return the info
+        :param dense: the solution is a Solution, holding the solver counts
+        :return: the result of integration, without the info unless full_output
+        '''
+        if 'stats' not in self.__dict__:
+            # unpickled from before the statistics were kept
+            self.stats = {}
+        self.stats.clear()
+        start = time.time()
+        try:
+            out = integration()
+        finally:
+            self.stats['wall_time'] = time.time() - start
+        self.stats.update(mg_si.record.solver_stats(out[0].info if dense else out[-1]))
+        if full_output:
+            return out
+        return out[0] if len(out) == 2 else out[:-1]
+
+    def _integrate(self, times, x0, scaled=False, tol=None, method='kinetic', sensitivity=None, checkpoint=None,
+                   checkpoint_every=1000, dense=False):
+        '''integrate the ODE by the method integrate was asked for, returning the solver info (see integrate)'''
+        full_output = True
+        if dense:
+            if sensitivity or method != 'kinetic' or checkpoint is not None:
+                raise ValueError('dense output is only available for the kinetic, full state integration')
+            return self._integrate_dense(times, x0, full_output=full_output, tol=tol)
+        if tol is not None and not scaled and not sensitivity and method == 'kinetic':
+            raise ValueError('tol is only used by the scaled integration, pass scaled=True')
+        if checkpoint is not None:
+            if sensitivity or method != 'kinetic':
+                raise ValueError('checkpoints are only available for the kinetic, full state integration')
+            return self._integrate_checkpointed(times, x0, checkpoint, checkpoint_every=checkpoint_every,
+                                                full_output=full_output, scaled=scaled, tol=tol)
+        if sensitivity:
+            if method != 'kinetic':
+                raise ValueError('sensitivities are only available for the kinetic, full state integration')
+            return self._integrate_sensitivity(times, x0, sensitivity, full_output=full_output, tol=tol)
+        if method == 'equilibrium':
+            return self._integrate_equilibrium(times, x0, full_output=full_output, tol=tol)
+        elif method == 'split':
+            return self._integrate_split(times, x0, full_output=full_output, tol=tol)
+        elif method != 'kinetic':
+            raise ValueError('unknown integration method {}'.format(method))
+        if not scaled:
+            solution = integrate.odeint(self.ODE, x0, times, full_output=full_output,h0=1e7,rtol=1e-4,atol=1e-4,mxstep=5000000)
+            return solution
+        scales = self.state_scales(x0)
+        rtol, atol = self.state_tolerances(x0, tol)
+        solution = integrate.odeint(self.scaled_ODE, np.asarray(x0, dtype=float)/scales, times, args=(scales,),
+                                    full_output=full_output, h0=1e7, rtol=rtol, atol=atol, mxstep=5000000)
+        if full_output:
+            return solution[0]*scales, solution[1]
+        return solution*scales
+
+    def _integrate_dense(self, times, x0, full_output=False, tol=None):
+        '''integrate the scaled ODE with LSODA over the span of times, letting the solver choose its steps and keeping
+        the dense output between them, rather than stopping on every one of times
+
+        :param times: times the legacy array is given at (see Solution.array), only the first and last set the span
+        :param x0:
+        :param full_output: also return the solver result
+        :param tol: dict overriding any of scaled_tolerances
+        :return: Solution[, solver result]
+        '''
+        times = np.asarray(times, dtype=float)
+        scales = self.state_scales(x0)
+        rtol, atol = self.state_tolerances(x0, tol)
+        result = integrate.solve_ivp(lambda t, y: self.scaled_ODE(y, t, scales), (times[0], times[-1]),
+                                     np.asarray(x0, dtype=float)/scales, method='LSODA', dense_output=True,
+                                     first_step=1e7, rtol=rtol, atol=atol)
+        if not result.success:
+            raise RuntimeError('integration failed at t={}: {}'.format(result.t[-1], result.message))
+        solution = Solution(times, result.t, result.y.T*scales, result.sol, scales,
+                            {'nfe': int(result.nfev), 'nje': int(result.njev), 'nlu': int(result.nlu),
+                             'nst': len(result.t) - 1})
+        if full_output:
+            return solution, result
         return solution
+
+    # odeint info entries kept in checkpoints, of which the step and evaluation counts accumulate over the segments
+    checkpoint_info = ('hu', 'tcur', 'tolsf', 'tsw', 'nst', 'nfe', 'nje', 'nqu', 'mused')
+    checkpoint_counts = ('nst', 'nfe', 'nje')
+
+    def _checkpoint_settings(self, times, x0, scaled, tol, checkpoint_every):
+        '''everything a checkpoint has to match to be resumed, as a json string'''
+        return json.dumps({'times': hashlib.sha1(np.ascontiguousarray(times, dtype=float)).hexdigest(),
+                           'x0': [float(x) for x in x0], 'scaled': bool(scaled), 'tol': tol,
+                           'checkpoint_every': int(checkpoint_every),
+                           'run_params': getattr(self, 'run_params', None)}, sort_keys=True, default=_to_json)
+
+    def write_checkpoint(self, filename, settings, solution, n_done, info):
+        '''write a checkpoint, replacing any previous one only once it is complete
+
+        :param filename: checkpoint file, compressed numpy .npz
+        :param settings: json string from _checkpoint_settings
+        :param solution: solution array, filled up to n_done
+        :param n_done: number of output times computed
+        :param info: dict of the checkpoint_info histories of the computed output times
+        '''
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, settings=settings, solution=solution[:n_done], n_done=n_done,
+                                **{'info_' + key: value for key, value in info.items()})
+        os.replace(tmp, filename)
+
+    @staticmethod
+    def read_checkpoint(filename):
+        '''read a checkpoint
+
+        :param filename: checkpoint file
+        :return: settings json string, solution computed so far, dict of solver histories
+        '''
+        with np.load(filename) as data:
+            info = {key[5:]: data[key] for key in data.files if key.startswith('info_')}
+            return str(data['settings']), data['solution'], info
+
+    def _integrate_checkpointed(self, times, x0, checkpoint, checkpoint_every=1000, full_output=False, scaled=False,
+                                tol=None):
+        '''integrate the kinetic ODE in segments of checkpoint_every output times, writing the state, solver history
+        and run parameters to checkpoint after each. If checkpoint holds a run of the same times, initial state and
+        settings, it continues from its last state, each segment starting with the step size the previous one ended
+        on, so a resumed run gives the same solution as one that was not interrupted. Any other checkpoint raises a
+        ValueError rather than being overwritten.
+
+        :param times:
+        :param x0:
+        :param checkpoint: checkpoint file
+        :param checkpoint_every: number of output times per segment
+        :param full_output: also return the odeint info dict, with the histories joined over the segments
+        :param scaled: integrate the scaled state, with the scales and tolerances of x0 for all segments
+        :param tol: dict overriding any of scaled_tolerances, only used if scaled
+        :return: solution[, info]
+        '''
+        times = np.asarray(times, dtype=float)
+        x0 = np.asarray(x0, dtype=float)
+        settings = self._checkpoint_settings(times, x0, scaled, tol, checkpoint_every)
+        if scaled:
+            scales = self.state_scales(x0)
+            rtol, atol = self.state_tolerances(x0, tol)
+        else:
+            scales = np.ones_like(x0)
+            rtol, atol = 1e-4, 1e-4
+        solution = np.empty((len(times), len(x0)))
+        solution[0] = x0
+        info = {key: np.empty(0) for key in self.checkpoint_info}
+        n_done = 1
+        if os.path.exists(checkpoint):
+            saved_settings, saved, info = self.read_checkpoint(checkpoint)
+            if saved_settings != settings:
+                raise ValueError('checkpoint {} is of a different run'.format(checkpoint))
+            n_done = len(saved)
+            solution[:n_done] = saved
+        while n_done < len(times):
+            i0 = n_done - 1
+            i1 = min(i0 + checkpoint_every, len(times) - 1)
+            h0 = info['hu'][-1] if len(info['hu']) else 1e7
+            y, seg_info = integrate.odeint(self.scaled_ODE, solution[i0]/scales, times[i0:i1+1], args=(scales,),
+                                           full_output=True, h0=h0, rtol=rtol, atol=atol, mxstep=5000000)
+            n = mg_si.record.info_length(seg_info)
+            for key in self.checkpoint_info:
+                value = np.asarray(seg_info[key][:n], dtype=float)
+                if key in self.checkpoint_counts and len(info[key]):
+                    value = value + info[key][-1]
+                info[key] = np.concatenate([info[key], value])
+            if seg_info['message'] != 'Integration successful.':
+                self.stats.update(mg_si.record.solver_stats(info))
+                raise RuntimeError('integration failed between t={} and t={}: {}'.format(
+                    times[i0], times[i1], seg_info['message']))
+            solution[i0+1:i1+1] = y[1:]*scales
+            n_done = i1 + 1
+            self.write_checkpoint(checkpoint, settings, solution, n_done, info)
+        if full_output:
+            info = dict(info)
+            for key in self.checkpoint_counts + ('nqu', 'mused'):
+                info[key] = info[key].astype(int)
+            info['message'] = 'Integration successful.'
+            return solution, info
+        return solution
+
+    # parameters of setup that sensitivities can be computed for
+    sensitivity_parameters = ('T_cmb0', 'X_Mg_0', 'X_Si_0', 'X_O_0', 'nu_present', 'layer_thickness', 'overturn')
+    # relative perturbation of the parameters and of the state used for the finite difference derivatives
+    sensitivity_dp = 1e-6
+    sensitivity_dx = 1e-7
+
+    def sensitivity_planets(self, parameters):
+        '''copies of the planet set up with each parameter perturbed by sensitivity_dp
+
+        :param parameters: names of setup parameters, from sensitivity_parameters
+        :return: planets, perturbations, initial state sensitivities dx0_dp [len(x0) x len(parameters)]
+        '''
+        try:
+            run_params = self.run_params
+        except AttributeError:
+            raise ValueError('sensitivities need the planet to be set up with setup()')
+        x0 = np.array(self.setup(**run_params), dtype=float)
+        planets = []
+        dps = []
+        dx0_dp = np.empty((len(x0), len(parameters)))
+        for j, name in enumerate(parameters):
+            if name not in self.sensitivity_parameters:
+                raise ValueError('no sensitivity available for {}'.format(name))
+            dp = self.sensitivity_dp*max(abs(run_params[name]), 1e-3)
+            planet = copy.deepcopy(self)
+            x0_p = planet.setup(**dict(run_params, **{name: run_params[name] + dp}))
+            dx0_dp[:, j] = (np.array(x0_p) - x0) / dp
+            planets.append(planet)
+            dps.append(dp)
+        return planets, np.array(dps), dx0_dp
+
+    def sensitivity_ODE(self, y, t, scales, planets, dps, p_scales):
+        '''the scaled ODE together with the forward sensitivity equations dS/dt = df/dx S + df/dp. The state
+        sensitivities are scaled to the response of the scaled state to a relative change of each parameter.
+        df/dx S is a directional finite difference and df/dp the difference to the ODE of the perturbed planets.
+
+        :param y: [x/scales, S_1*p_1/scales, S_2*p_2/scales ...]
+        :param t: time
+        :param scales: state scales
+        :param planets: planets set up with perturbed parameters (see sensitivity_planets)
+        :param dps: parameter perturbations
+        :param p_scales: parameter scales
+        :return: dy_dt
+        '''
+        n = len(scales)
+        x = y[:n]*scales
+        f = self.ODE(x, t)
+        dy_dt = [f/scales]
+        for j, planet in enumerate(planets):
+            s = y[n*(j+1):n*(j+2)]
+            s_max = np.max(np.abs(s))
+            dS_dt = (planet.ODE(x, t) - f) / dps[j] * p_scales[j]
+            if s_max > 0.:
+                h = self.sensitivity_dx / s_max
+                dS_dt += (self.ODE(x + h*s*scales, t) - f) / h
+            dy_dt.append(dS_dt/scales)
+        return np.concatenate(dy_dt)
+
+    def _sensitivity_jacobian(self, y, t, scales, planets, dps, p_scales):
+        '''block diagonal approximation of the Jacobian of sensitivity_ODE, each block the Jacobian of the scaled
+        ODE. It is only used for the corrector iteration of LSODA, so the approximation does not change the
+        accuracy of the sensitivities.'''
+        n = len(scales)
+        y_x = y[:n]
+        f = self.scaled_ODE(y_x, t, scales)
+        J = np.empty((n, n))
+        for i in range(n):
+            h = self.sensitivity_dx*max(abs(y_x[i]), 1.)
+            dy = y_x.copy()
+            dy[i] += h
+            J[:, i] = (self.scaled_ODE(dy, t, scales) - f) / h
+        return np.kron(np.eye(len(planets) + 1), J)
+
+    def _integrate_sensitivity(self, times, x0, parameters, full_output=False, tol=None):
+        '''integrate the state and its sensitivities to parameters, scaled as in integrate(scaled=True)'''
+        planets, dps, dx0_dp = self.sensitivity_planets(parameters)
+        p_scales = np.array([max(abs(self.run_params[name]), 1e-3) for name in parameters])
+        scales = self.state_scales(x0)
+        rtol, atol = self.state_tolerances(x0, tol)
+        n = len(scales)
+        y0 = np.concatenate([np.asarray(x0, dtype=float)/scales] + [dx0_dp[:, j]*p_scales[j]/scales
+                                                                     for j in range(len(parameters))])
+        y, info = integrate.odeint(self.sensitivity_ODE, y0, times, args=(scales, planets, dps, p_scales),
+                                   Dfun=self._sensitivity_jacobian, full_output=True, h0=1e7, rtol=rtol,
+                                   atol=np.tile(atol, len(parameters) + 1), mxstep=5000000)
+        solution = y[:, :n]*scales
+        sensitivities = np.empty((len(times), n, len(parameters)))
+        for j in range(len(parameters)):
+            sensitivities[:, :, j] = y[:, n*(j+1):n*(j+2)]*scales/p_scales[j]
+        if full_output:
+            return solution, sensitivities, info
+        return solution, sensitivities
+
+    def _integrate_equilibrium(self, times, x0, full_output=False, tol=None):
+        '''integrate equilibrium_ODE, scaled by T_cmb0, the initial element totals and the initial layer moles, and
+        reconstruct the full state at all output times in one solve, each from the composition of the nearest RHS
+        call. If the composition cannot be solved for at some time, e.g. the layer erodes away, the full kinetic
+        ODE is integrated instead with the same tolerances, with a RuntimeWarning, and info['fallback'] holds the
+        reason.'''
+        rx = self.reactions
+        x0 = np.asarray(x0, dtype=float)
+        Nel = len(rx.network.elements)
+        kinetic = rx.kinetic_species()
+        tol = dict(self.scaled_tolerances, **(tol or {}))
+        try:
+            # start from the composition in equilibrium with the initial core
+            Moles = rx.equilibrium_Moles(x0[0], rx.network.element_totals(x0[2:]), x0[2:])
+            self._equilibrium_history = [(times[0], Moles, np.zeros(len(Moles)))]
+            self._equilibrium_times = np.asarray(times, dtype=float)
+            z0 = self.equilibrium_state(np.concatenate([x0[:2], Moles]))
+            M_m0 = np.sum(x0[2+rx.network.Nc:])
+            scales = np.concatenate([[x0[0], x0[0]], z0[2:2+Nel], np.full(np.sum(kinetic), M_m0)])
+            atol = np.concatenate([[tol['T'], tol['T']], np.full(Nel, tol['core']),
+                                   np.full(np.sum(kinetic), tol['layer'])])
+            z, info = integrate.odeint(self._scaled_equilibrium_ODE, z0/scales, times, args=(scales,),
+                                       full_output=True, h0=1e7, rtol=tol['rtol'], atol=atol, mxstep=5000000)
+            z = z*scales
+            t_rhs, Moles_rhs, dMoles_dt = (np.array(a) for a in zip(*self._equilibrium_history))
+            i = self._nearest_equilibrium(times)
+            Moles = self._equilibrium_guess(times[:, None], t_rhs[i, None], Moles_rhs[i], dMoles_dt[i])
+            Moles[:, kinetic] = z[:, 2+Nel:]
+            solution = np.concatenate([z[:, :2], rx.equilibrium_Moles(z[:, 0], z[:, 2:2+Nel], Moles)], axis=1)
+        except ValueError as err:
+            warnings.warn('the equilibrium composition could not be solved for ({}), integrating the kinetic ODE '
+                          'instead'.format(err), RuntimeWarning)
+            solution, info = self._integrate(times, x0, scaled=True, tol=tol)
+            info['fallback'] = str(err)
+        finally:
+            self._equilibrium_history = []
+            self._equilibrium_times = None
+        if full_output:
+            return solution, info
+        return solution
+
+    def _scaled_equilibrium_ODE(self, y, t, scales):
+        return self.equilibrium_ODE(y*scales, t)/scales
+
+    def split_step(self, x, t, H, atol, rtol, dx_dt=None):
+        '''one Strang splitting step of length H: the chemistry for H/2 at the starting temperature and cooling rate,
+        the temperatures for H at that composition with Heun's method, and the chemistry for H/2 at the new
+        temperature and cooling rate. The chemistry is stiff and is integrated with LSODA, so it sub-cycles within
+        the step.
+
+        :param x: state at t
+        :param t: time
+        :param H: step [s]
+        :param atol: absolute tolerance of each state component
+        :param rtol: relative tolerance
+        :param dx_dt: ODE at x and t if already known
+        :return: state at t+H, number of thermal and chemical RHS calls
+        '''
+        x = np.array(x, dtype=float)
+        nfe = np.zeros(2, dtype=int)
+
+        def chemistry(x, t0, t1, dTc_dt):
+            M, info = integrate.odeint(self.chemistry_ODE, x[2:], [t0, t1], args=(x[0], dTc_dt), full_output=True,
+                                       rtol=rtol, atol=atol[2:], mxstep=5000000)
+            nfe[1] += info['nfe'][-1]
+            x[2:] = M[-1]
+
+        if dx_dt is None:
+            dx_dt = self.ODE(x, t)
+            nfe += 1
+        chemistry(x, t, t + H/2, dx_dt[0])
+        k1 = self.thermal_ODE(x[:2], t, x[2:])
+        k2 = self.thermal_ODE(x[:2] + H*k1, t + H, x[2:])
+        x[:2] += H/2*(k1 + k2)
+        dTc_dt = self.thermal_ODE(x[:2], t + H, x[2:])[0]
+        nfe[0] += 3
+        chemistry(x, t + H/2, t + H, dTc_dt)
+        return x, nfe
+
+    def _integrate_split(self, times, x0, full_output=False, tol=None):
+        '''integrate with split_step, choosing the step by step doubling: a step H is compared with two steps H/2
+        and the difference / 3 (Strang splitting is second order) is the error estimate of the two half steps,
+        which are kept if it is within tol. The output times are interpolated with cubic Hermite polynomials
+        between the accepted steps.'''
+        x = np.asarray(x0, dtype=float)
+        tol = dict(self.scaled_tolerances, **(tol or {}))
+        rtol, atol = self.state_tolerances(x, tol)
+        atol = atol*self.state_scales(x)
+        solution = np.empty((len(times), len(x)))
+        solution[0] = x
+        err_est = np.zeros(len(times))
+        nfe = np.zeros(2, dtype=int)
+        nst = 0
+        nrej = 0
+        t = times[0]
+        f = self.ODE(x, t)
+        nfe += 1
+        H = 1e7 # [s] initial step, as h0 of the full integration
+        i = 1
+        while i < len(times):
+            h = min(H, times[-1] - t)
+            x_full, n0 = self.split_step(x, t, h, atol, rtol, dx_dt=f)
+            x_half, n1 = self.split_step(x, t, h/2, atol, rtol, dx_dt=f)
+            x_half, n2 = self.split_step(x_half, t + h/2, h/2, atol, rtol)
+            nfe += n0 + n1 + n2
+            err = np.max(np.abs(x_half - x_full) / 3 / (atol + rtol*np.abs(x_half)))
+            H = h*min(5., max(0.2, 0.9*max(err, 1e-10)**(-1/3)))
+            if err > 1. and h > 1.:
+                nrej += 1
+                continue
+            f_new = self.ODE(x_half, t + h)
+            nfe += 1
+            nst += 1
+            while i < len(times) and times[i] <= t + h:
+                s = (times[i] - t) / h
+                solution[i] = (2*s**3 - 3*s**2 + 1)*x + (s**3 - 2*s**2 + s)*h*f \
+                              + (-2*s**3 + 3*s**2)*x_half + (s**3 - s**2)*h*f_new
+                err_est[i] = err
+                i += 1
+            x, f, t = x_half, f_new, t + h
+        if full_output:
+            return solution, {'nfe_thermal': nfe[0], 'nfe_chemistry': nfe[1], 'nst': nst, 'nrejected': nrej,
+                              'err_estimate': err_est}
+        return solution
+
+class Solution(object):
+    def __init__(self, times, t, x, interpolant, scales, info):
+        '''
+        solution of Custom.integrate(dense=True): the states at the accepted solver steps and an interpolant between
+        them. Calling it gives the state at any times, and array() the legacy solution array at the requested times.
+
+        :param times: times requested from integrate, kept as their number only if evenly spaced over the span
+        :param t: times of the accepted steps
+        :param x: states at t [len(t) x state]
+        :param interpolant: dense output of the scaled state over the span of t
+        :param scales: state scales the interpolant is in
+        :param info: solver counts nfe, nje, nlu and nst
+        '''
+        self.N_times = len(times)
+        if np.allclose(times, np.linspace(t[0], t[-1], len(times)), rtol=0., atol=1e-12*(t[-1] - t[0])):
+            self._times = None
+        else:
+            self._times = times
+        self.t = t
+        self.x = x
+        self.interpolant = interpolant
+        self.scales = scales
+        self.info = info
+
+    @property
+    def times(self):
+        '''times requested from integrate'''
+        if self._times is None:
+            return np.linspace(self.t[0], self.t[-1], self.N_times)
+        return self._times
+
+    def __call__(self, times):
+        '''state at times
+
+        :param times: time or array of times within the integrated span
+        :return: state, or states [len(times) x state]
+        '''
+        x = self.interpolant(times)
+        if np.ndim(times) == 0:
+            return x*self.scales
+        return x.T*self.scales
+
+    def array(self, times=None):
+        '''the legacy solution array, as returned by integrate without dense
+
+        :param times: times, those requested from integrate by default
+        :return: states [len(times) x state]
+        '''
+        if times is None:
+            times = self.times
+        return self(np.asarray(times, dtype=float))
+
+    def sample(self, N):
+        '''N evenly spaced times over the integrated span and the states at them, e.g. for plot.* or
+        core.Custom.compute_all_parameters with N = N_approx + 1 so they need not decimate
+
+        :param N: number of times
+        :return: times, states [N x state]
+        '''
+        times = np.linspace(self.t[0], self.t[-1], N)
+        return times, self.array(times)
+
+def _to_json(value):
+    '''json form of numpy values in run parameters'''
+    return np.asarray(value).tolist()
+
+class Custom_LightElements(Custom):
+    '''Custom planet with the reaction layer exchanging any set of light elements with the core
+
+    extends Custom, with reactions.LightElements in place of reactions.MgSi. The state is T_cmb, T_um, then the
+    moles of each core species and each layer species in the order given.
+    '''
+    def __init__(self, case=1, core_species=None, mantle_species=None, reactions=None):
+        '''
+        :param core_species: list of core species, e.g. ['Mg', 'Si', 'Fe', 'O', 'S', 'Ni', 'C', 'H']
+        :param mantle_species: list of layer species, e.g. ['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3', 'FeS']
+        :param reactions: reaction table, see mg_si.reactions.MGSI_REACTION_TABLE
+        '''
+        super(Custom_LightElements, self).__init__(case=case)
+        self.reactions = mg_si.reactions.LightElements(params=self.params, core_species=core_species,
+                                                       mantle_species=mantle_species, reactions=reactions)
+
+    def integrate(self, times, x0, full_output=False, reduced=False, tol=None, **kwargs):
+        '''integrate the ODE (see Custom.integrate)
+
+        :param reduced: leave the inert species out of the integrated state (see reduced_ODE), scaled as in
+            integrate(scaled=True) with tolerances from tol
+        :param kwargs: arguments of Custom.integrate, which cannot be combined with reduced
+        '''
+        if not reduced:
+            return super(Custom_LightElements, self).integrate(times, x0, full_output=full_output, tol=tol, **kwargs)
+        if any(value not in (None, False, 'kinetic') for value in kwargs.values()):
+            raise ValueError('the reduced integration takes none of {}'.format(', '.join(kwargs)))
+        if not np.any(self.reactions.network.inert):
+            raise ValueError('no inert species to leave out of the integrated state')
+        return self._with_stats(lambda: self._integrate_reduced(times, x0, full_output=True, tol=tol), full_output)
+
+    def reduced_ODE(self, z, t, Moles_0):
+        '''the ODE for T_cmb, T_um and the moles of the species that are not inert (see
+        reactions.ReactionNetwork.inert), with the inert species held at Moles_0
+
+        :param z: [T_cmb, T_um, moles of the active species]
+        :param t: time
+        :param Moles_0: initial moles of all species
+        :return: dz/dt
+        '''
+        active = ~self.reactions.network.inert
+        Moles = np.array(Moles_0, dtype=float)
+        Moles[active] = z[2:]
+        dx_dt = self.ODE(np.concatenate([z[:2], Moles]), t)
+        return np.concatenate([dx_dt[:2], dx_dt[2:][active]])
+
+    def _integrate_reduced(self, times, x0, full_output=False, tol=None):
+        '''integrate reduced_ODE, scaled as in integrate(scaled=True), and reconstruct the full state'''
+        active = np.concatenate([[True, True], ~self.reactions.network.inert])
+        x0 = np.asarray(x0, dtype=float)
+        scales = self.state_scales(x0)[active]
+        rtol, atol = self.state_tolerances(x0, tol)
+        out = integrate.odeint(self._scaled_reduced_ODE, x0[active]/scales, times, args=(x0[2:], scales),
+                               full_output=full_output, h0=1e7, rtol=rtol, atol=atol[active], mxstep=5000000)
+        solution = np.tile(x0, (len(times), 1))
+        solution[:, active] = (out[0] if full_output else out)*scales
+        if full_output:
+            return solution, out[1]
+        return solution
+
+    def _scaled_reduced_ODE(self, y, t, Moles_0, scales):
+        return self.reduced_ODE(y*scales, t, Moles_0)/scales
+
+class Custom_backward(Custom):
+    '''Custom planet integrated backward in time from a present-day state
+
+    extends Custom, with the time counted back from time_end as in Stevenson_backward. The reactions see the
+    physical time and cooling rate, so the core keeps cooling forward in time and exsolved species dissolve back
+    into the core going backward. The mantle layer relaxes towards the core and the background mantle within a few
+    Myr, which cannot be integrated backward, so the layer is held in equilibrium with the core (as at the start of
+    a forward run) and only the temperatures and the core moles are integrated.
+    '''
+    def __init__(self, case=1, time_end=4568e6*365.25*24*3600):
+        '''
+        :param time_end: age of the planet at the present-day state [s]
+        '''
+        super(Custom_backward, self).__init__(case=case)
+        self.time_end = time_end
+
+    def setup_present(self, X_Mg, X_Si, X_O, r_i=1220e3, T_um=None, T_cmb0=5500., nu_present=None,
+                      layer_thickness=100., overturn=600., X_MgFeO_b=0.311, X_SiO2_b=0.015, MgNumFp=0.8, MgNumPv=0.93,
+                      T_present=1350.):
+        '''set the planet up from a present-day state: T_cmb at the inner core radius r_i, the given core composition
+        and the layer in equilibrium with it. The mantle viscosity law is anchored as in setup, to nu_present at
+        T_present and nu_present/1e3 at the initial T_um of a forward run from T_cmb0.
+
+        :param X_Mg: present mole fraction Mg in the core
+        :param X_Si: present mole fraction Si in the core
+        :param X_O: present mole fraction O in the core
+        :param r_i: present inner core radius [m]
+        :param T_um: present upper mantle temperature [K], T_present by default. It must be one the model cools
+            towards, e.g. the end of a forward run (~1430 K for the Hirose case), as the mantle heats backward
+            in time otherwise
+        :param T_cmb0: nominal initial CMB temperature fixing the viscosity law [K]
+        :param nu_present: present mantle viscosity [m^2/s], 10^21 Pa s by default
+        :param layer_thickness: thickness of the mantle layer in contact with the core [m]
+        :param overturn: overturn time of the mantle layer [Myr]
+        :param X_MgFeO_b: background mantle mole fraction (Mg,Fe)O
+        :param X_SiO2_b: background mantle mole fraction SiO2
+        :param MgNumFp: background mantle Mg number of ferropericlase
+        :param MgNumPv: background mantle Mg number of bridgmanite
+        :param T_present: present upper mantle temperature of the viscosity law [K]
+        :return: present state
+        '''
+        if nu_present is None:
+            nu_present = 10**21/self.params.mantle.rho
+        if T_um is None:
+            T_um = T_present
+        self.present_params = {'X_Mg': X_Mg, 'X_Si': X_Si, 'X_O': X_O, 'r_i': r_i, 'T_um': T_um, 'T_cmb0': T_cmb0,
+                               'nu_present': nu_present, 'layer_thickness': layer_thickness, 'overturn': overturn,
+                               'X_MgFeO_b': X_MgFeO_b, 'X_SiO2_b': X_SiO2_b, 'MgNumFp': MgNumFp, 'MgNumPv': MgNumPv,
+                               'T_present': T_present}
+        self.reactions._set_layer_thickness(layer_thickness)
+        self.reactions._set_overturn_time(overturn)
+        T_cmb = self.core_layer.T_cmb_from_r_i(r_i)
+        Moles = self.reactions.compute_Moles_0(X_Mg, X_Si, X_O, T_cmb)
+        self.params.reactions.Moles_0 = Moles
+        self.params.reactions.Mm_b = self.reactions.mantle.compute_Mm_b(X_MgFeO=X_MgFeO_b, X_SiO2=X_SiO2_b,
+                                                                        MgNumFp=MgNumFp, MgNumPv=MgNumPv)
+        T_um0 = T_cmb0 - self.mantle_layer.get_dT0(T_cmb0)
+        self.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_present/1e3, T_um0, set_values=True)
+        return [T_cmb, T_um] + list(Moles)
+
+    def full_state(self, z):
+        '''state with the layer in equilibrium with the core
+
+        :param z: [T_cmb, T_um, moles of the core species]
+        :return: state
+        '''
+        return np.concatenate([z, self.reactions.equilibrium_layer(z[0], z[2:])])
+
+    def ODE(self, z, t):
+        '''the ODE of Custom for the temperatures and core moles, with time t counted back from time_end
+
+        :param z: [T_cmb, T_um, moles of the core species]
+        :param t: time before present [s]
+        :return: dz/dt backward in time
+        '''
+        return -Custom.ODE(self, self.full_state(z), self.time_end - t)[:len(z)]
+
+    def integrate(self, times, x0, full_output=False, tol=None):
+        '''integrate backward from the present-day state x0, scaled as in Custom.integrate(scaled=True). Errors
+        grow going backward in time as the forward flow contracts, so tight tolerances (rtol ~1e-9) are needed for a
+        forward run from the result to return to the present-day state.
+
+        :param times: times before present [s], increasing from 0
+        :param x0: present-day state, e.g. from setup_present
+        :param tol: dict overriding any of scaled_tolerances
+        :return: states at times, with the layer in equilibrium with the core. The solver statistics and wall time
+            of the integration are kept in self.stats whether it succeeds or not.
+        '''
+        return self._with_stats(lambda: self._integrate_backward(times, x0, tol=tol), full_output)
+
+    def _integrate_backward(self, times, x0, tol=None):
+        '''integrate the scaled temperatures and core moles backward and reconstruct the full state (see integrate)'''
+        Nc = len(self.reactions.core.species)
+        scales = self.state_scales(x0)[:2+Nc]
+        rtol, atol = self.state_tolerances(x0, tol)
+        z, info = integrate.odeint(self.scaled_ODE, np.asarray(x0[:2+Nc], dtype=float)/scales, times, args=(scales,),
+                                   full_output=True, h0=1e7, rtol=rtol, atol=atol[:2+Nc], mxstep=5000000)
+        return np.array([self.full_state(zi) for zi in z*scales]), info
@@ -44,9 +44,9 @@ def coremoles(planet, times, solution, filepath='./', savename='coremoles.png',
     T_um = solution[:, 1]
     M_c, M_m = planet.reactions.unwrap_Moles(solution[:, 2:], return_sum=True, split_coremantle=True)
     t_plt = times / 3.16e7 / 1e9
-    names_c = planet.params.reactions.core.species
+    names_c = list(planet.params.reactions.core.species)
     names_c.append('core')
-    names_m = planet.params.reactions.mantle.species
+    names_m = list(planet.params.reactions.mantle.species)
     names_m.append('mantle')
 
     plt.figure(figsize=(13, 4))
@@ -83,9 +83,9 @@ def composition(planet, times, solution, filepath='./', savename='composition.pn
     # T_um = solution[:, 1]
     M_c, M_m = planet.reactions.unwrap_Moles(solution[:, 2:], return_sum=True, split_coremantle=True)
     t_plt = times / 3.16e7 / 1e9
-    names_c = planet.params.reactions.core.species
+    names_c = list(planet.params.reactions.core.species)
     names_c.append('core')
-    names_m = planet.params.reactions.mantle.species
+    names_m = list(planet.params.reactions.mantle.species)
     names_m.append('mantle')
 
     plt.figure(figsize=(13, 4))
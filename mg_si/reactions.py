@@ -4,6 +4,8 @@ Created on Sun Jul 17 17:11:58 2016
 @author: nknezek
 """
 
+from collections import OrderedDict
+import re
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
@@ -30,13 +32,23 @@ class Molar_Calculations():
         self._molmass_dict = molmass
         self.species = species
         if self.species is not None:
-            self.molmass = [molmass[sp] for sp in self.species]
+            self.molmass = [self.get_molmass(sp) for sp in self.species]
         else:
             self.molmass = None
 
+    def get_molmass(self, species):
+        '''molar mass of species, summed from its formula if not tabulated, e.g. 'FeS' or 'NiO'
+
+        :param species: element or formula
+        :return: molar mass [g/mol]
+        '''
+        if species not in self._molmass_dict:
+            self._molmass_dict[species] = sum(self._molmass_dict[el] * n for el, n in parse_formula(species).items())
+        return self._molmass_dict[species]
+
     def _set_species(self, species):
         self.species = species
-        self.molmass = [self._molmass[sp] for sp in species]
+        self.molmass = [self.get_molmass(sp) for sp in species]
 
     def X2M(self, X, M_tot=None, wt_tot=None):
         '''compute moles given an array of mole fractions
@@ -284,7 +296,441 @@ class Mantle_MgSi(Molar_Calculations):
         pr.Mm_b = self.X2M(Xm, wt_tot=mass_l)
         return pr.Mm_b
 
+class Mantle_LightElements(Mantle_MgSi):
+    '''class to compute molar concentrations in the mantle layer for any set of layer species
+
+    extends Mantle_MgSi
+    '''
+    def __init__(self, params=None, species=None, reactions=None):
+        '''
+        :param species: list of mantle layer species
+        :param reactions: reaction table, see MGSI_REACTION_TABLE
+        '''
+        if reactions is None:
+            reactions = MGSI_REACTION_TABLE
+        self.reactions = reactions
+        super(Mantle_LightElements, self).__init__(params=params, species=species)
+
+    def compute_Mm_b(self, fraction_MgFe=None, X_MgFeO=None, X_SiO2=None, MgNumFp=None, MgNumPv=None, M_tot=None,
+                     X_extra=None):
+        ''' computes background mantle composition as Mantle_MgSi, with the layer species not in Mantle_MgSi
+        taking the background mole fractions in X_extra and the others scaled to the remainder
+
+        :param M_tot: total mass of the layer [kg], mass_l_0 by default
+        :param X_extra: dict of species -> background mole fraction for the species not in Mantle_MgSi
+        :return: Mm_b
+        '''
+        pr = self.params.reactions
+        if X_extra is None:
+            X_extra = {}
+        if MgNumFp is None:
+            MgNumFp = fraction_MgFe
+        if MgNumPv is None:
+            MgNumPv = fraction_MgFe
+        X_MgFeSiO3 = (1-X_SiO2-X_MgFeO)
+        X_b = {'MgO': X_MgFeO*MgNumFp, 'SiO2': X_SiO2, 'FeO': X_MgFeO*(1-MgNumFp),
+               'MgSiO3': X_MgFeSiO3*MgNumPv, 'FeSiO3': X_MgFeSiO3*(1-MgNumPv)}
+        missing = [sp for sp in self.species if sp not in X_b and sp not in X_extra]
+        if missing:
+            raise ValueError('background mole fraction of {} must be given in X_extra'.format(missing))
+        # X_extra may also hold the core species of setup, which take no part in the layer
+        scale = 1 - sum(X_extra[sp] for sp in self.species if sp in X_extra)
+        Xm = np.array([X_extra[sp] if sp in X_extra else X_b[sp]*scale for sp in self.species])
+        X = dict(zip(self.species, Xm))
+        for rx in self.reactions:
+            if rx['K'] == 'layer':
+                K_b = np.prod([X[sp]**n for sp, n in rx['stoich'].items() if n > 0])
+                K_b /= np.prod([X[sp]**-n for sp, n in rx['stoich'].items() if n < 0])
+                setattr(pr, 'K_{}_b'.format(rx['name']), K_b)
+        mass_l = pr.mass_l_0 if M_tot is None else M_tot  # [kg]
+        pr.Mm_b = self.X2M(Xm, wt_tot=mass_l)
+        return pr.Mm_b
+
+# K_D fits for the core/mantle exchange reactions, log10(K_D) = a + b/T + c*P/T with T in K and P in GPa.
+# d_a, d_b, d_c are the published 1-sigma uncertainties of each coefficient. dK_dT lists which of b and c
+# enter the temperature derivative, kept identical to the original per-citation expressions.
+KD_FITS = {
+    'MgO': {
+        # Badro et al. 2015 (Eqn 5 in the Supplementary material)
+        'Badro2015': {'a': 1.23, 'b': -18816., 'c': 0., 'd_a': 0.7, 'd_b': 2600., 'd_c': 0., 'dK_dT': ('b',)},
+    },
+    'SiO2': {
+        # Fischer et al. 2015 Si fit (extended Data Table 1 - Hirose 2017) times the square of the Hirose 2017
+        # FeO fit and the x2 empirical correction to match the Hirose 2017 dataset, folded into one fit:
+        # a = 1.3 + 2*0.3009 + log10(2), b = -13500 + 2*0, c = 0 + 2*-36.8332
+        'Hirose2017': {'a': 1.3 + 2 * 0.3009 + np.log10(2.), 'b': -13500., 'c': 2 * -36.8332,
+                       'd_a': (0.3 ** 2 + (2 * 0.1120) ** 2) ** 0.5, 'd_b': 900., 'd_c': 2 * 5.5957,
+                       'dK_dT': ('b', 'c')},
+        'Badro2015': {'a': 0.36, 'b': -4064., 'c': 0., 'd_a': 0.3, 'd_b': 900., 'd_c': 0., 'dK_dT': ('b', 'c')},
+        'Fischer2015': {'a': 1.3, 'b': -13500., 'c': 0., 'd_a': 0.3, 'd_b': 900., 'd_c': 0., 'dK_dT': ('c',)},
+    },
+    'FeO': {
+        # Hirose et al. 2017 (Eqn 5 in the Supplementary material)
+        'Hirose2017': {'a': 0.3009, 'b': 0., 'c': -36.8332, 'd_a': 0.1120, 'd_b': 0., 'd_c': 5.5957, 'dK_dT': ('c',)},
+        # Badro et al. 2015 (in the Supplementary material)
+        'Badro2015': {'a': 2.74, 'b': -11439., 'c': 0., 'd_a': 0.14, 'd_b': 387., 'd_c': 0., 'dK_dT': ('c',)},
+        # Fischer et al. 2015
+        'Fischer2015': {'a': 0.60, 'b': -3800., 'c': 22., 'd_a': 0.4, 'd_b': 900., 'd_c': 14., 'dK_dT': ('c',)},
+    },
+}
+# names of the parameters read by the 'from_params' citation, and the default citation of each species
+KD_PARAM_NAMES = {'MgO': 'fit_KD_MgO', 'SiO2': 'fit_KD_Si', 'FeO': 'fit_KD_FeO'}
+KD_DEFAULT_CITATIONS = {'MgO': 'Badro2015', 'SiO2': 'Hirose2017', 'FeO': 'Hirose2017'}
+KD_FROM_PARAMS_DK_DT = {'MgO': ('b',), 'SiO2': ('c',), 'FeO': ('c',)}
+
+class KD_Model():
+    '''K_D values for the MgO, SiO2 and FeO exchange reactions with the fit coefficients of one citation per
+    species bound once, so that every evaluation is a single vectorized expression.
+    '''
+    species = ['MgO', 'SiO2', 'FeO']
+    composition_dependent = False # none of the fits depend on X_Si or X_O
+
+    def __init__(self, citations=None, params=None, P=139.):
+        '''bind the coefficients of the chosen citations
+
+        :param citations: dict of species -> citation, missing species use KD_DEFAULT_CITATIONS
+        :param params: reactions parameters, only read for 'from_params' citations
+        :param P: pressure at the CMB [GPa]
+        '''
+        if citations is None:
+            citations = {}
+        self.citations = tuple(citations.get(sp, KD_DEFAULT_CITATIONS[sp]) for sp in self.species)
+        self.P = P
+        self.fits = [self.get_fit(sp, ct, params) for sp, ct in zip(self.species, self.citations)]
+        a = np.array([f['a'] for f in self.fits], dtype=float)
+        b = np.array([f['b'] for f in self.fits], dtype=float)
+        c = np.array([f['c'] for f in self.fits], dtype=float)
+        self._a = a
+        self._bcP = b + c * P
+        self._dbcP = np.array([self.dbcP(f, P) for f in self.fits], dtype=float)
+        self.key = (self.citations, P) + tuple(a) + tuple(b) + tuple(c) + tuple(self._dbcP)
+
+    @staticmethod
+    def get_fit(species, citation, params=None):
+        '''look up the fit coefficients for species given citation
+
+        :param species: 'MgO', 'SiO2', or 'FeO'
+        :param citation: key in KD_FITS[species] or 'from_params'
+        :param params: reactions parameters holding fit_KD_*_a, _b, _c (and optionally _dK_dT) for 'from_params'
+        :return: dict of fit coefficients
+        '''
+        if citation == 'from_params':
+            name = KD_PARAM_NAMES[species]
+            return {'a': getattr(params, name + '_a'), 'b': getattr(params, name + '_b'),
+                    'c': getattr(params, name + '_c'), 'd_a': 0., 'd_b': 0., 'd_c': 0.,
+                    'dK_dT': tuple(getattr(params, name + '_dK_dT', KD_FROM_PARAMS_DK_DT[species]))}
+        try:
+            return KD_FITS[species][citation]
+        except KeyError:
+            raise ValueError('ParamCitation for {} unknown'.format(species))
+
+    @staticmethod
+    def dbcP(fit, P):
+        '''T^2 dln(K)/dT / K of a fit, from the coefficients listed in its dK_dT: -ln(10) (b + c*P) with the
+        coefficients not listed left out
+
+        :param fit: dict of fit coefficients, as from get_fit
+        :param P: pressure at the CMB [GPa]
+        :return: float
+        '''
+        b_T = fit['b'] if 'b' in fit['dK_dT'] else 0.
+        c_T = fit['c'] if 'c' in fit['dK_dT'] else 0.
+        return -np.log(10.) * (b_T + c_T * P)
+
+    def __call__(self, T):
+        '''compute K_D and dK_D/dT for all species
+
+        :param T: temperature [K], scalar or array
+        :return: K [MgO, SiO2, FeO], dK_dT [MgO, SiO2, FeO], each of shape (3,) + shape(T)
+        '''
+        T = np.asarray(T, dtype=float)
+        expand = (slice(None),) + (None,) * T.ndim
+        invT = 1. / T
+        K = 10. ** (self._a[expand] + self._bcP[expand] * invT)
+        dK_dT = K * self._dbcP[expand] * invT ** 2
+        return K, dK_dT
+
+class KD_Cache():
+    '''bounded least-recently-used store of K_D values for scalar temperatures, shared by every caller that
+    evaluates the same bound KD_Model (RHS, compute_Moles_eq, compute_Moles_0 and the core diagnostics)
+    '''
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, model, T, X_Si=None, X_O=None):
+        '''return model(T), computing and storing it if not already present
+
+        :param model: bound KD_Model
+        :param T: temperature [K], scalar
+        :param X_Si: mole fraction Si in the core, part of the key only for composition dependent models
+        :param X_O: mole fraction O in the core, part of the key only for composition dependent models
+        :return: K [MgO, SiO2, FeO], dK_dT [MgO, SiO2, FeO]
+        '''
+        if model.composition_dependent:
+            key = (model.key, float(T), float(X_Si), float(X_O))
+        else:
+            key = (model.key, float(T))
+        try:
+            value = self._store[key]
+        except KeyError:
+            self.misses += 1
+            value = model(T)
+            self._store[key] = value
+            if len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+            return value
+        self.hits += 1
+        self._store.move_to_end(key)
+        return value
+
+    def info(self):
+        '''hit/miss counts and hit rate since creation or the last clear()'''
+        calls = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._store), 'maxsize': self.maxsize,
+                'hit_rate': self.hits / calls if calls else 0.}
+
+    def clear(self):
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+# default cache used by all MgSi instances, so repeated planets at the same T_cmb0 share entries
+KD_CACHE = KD_Cache()
+
+def parse_formula(formula):
+    '''count the atoms of each element in a chemical formula, e.g. 'MgSiO3' -> {'Mg': 1, 'Si': 1, 'O': 3}'''
+    counts = {}
+    for element, n in re.findall('([A-Z][a-z]?)([0-9]*)', formula):
+        counts[element] = counts.get(element, 0) + (int(n) if n else 1)
+    return counts
+
+class ReactionNetwork():
+    '''Assembles and solves the linear system for the change in moles of every species with CMB temperature.
+
+    The unknowns are dM_i/dT of the core species followed by the mantle layer species, in state order. One row
+    per element balances core and layer against erosion exchange with the background mantle, and one row per
+    reaction relates the change in mole fractions to dln(K)/dT, with K = prod(X_products) / X_reactant.
+    '''
+    def __init__(self, core_species, mantle_species, reactions):
+        '''
+        :param core_species: list of core species, e.g. ['Mg', 'Si', 'Fe', 'O']
+        :param mantle_species: list of mantle layer species, e.g. ['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3']
+        :param reactions: list of {species: stoichiometric coefficient}, products > 0 and reactant < 0, in the
+            order of the dlnK/dT values passed to dMoles_dT
+        '''
+        self.core_species = list(core_species)
+        self.mantle_species = list(mantle_species)
+        self.species = self.core_species + self.mantle_species
+        self.reactions = reactions
+        Nc = len(self.core_species)
+        N = len(self.species)
+
+        formulas = [parse_formula(sp) for sp in self.species]
+        self.elements = []
+        for f in formulas:
+            self.elements += [el for el in f if el not in self.elements]
+        self.E = np.array([[f.get(el, 0) for f in formulas] for el in self.elements], dtype=float)
+        self.nu = np.array([[rx.get(sp, 0) for sp in self.species] for rx in reactions], dtype=float)
+        if len(self.elements) + len(reactions) != N:
+            raise ValueError('{} elements and {} reactions do not determine {} species'.format(
+                len(self.elements), len(reactions), N))
+
+        # phase of each species, and for each reaction the net stoichiometry of each phase spread over its species
+        self.phase = np.array([0] * Nc + [1] * (N - Nc))
+        phase_nu = np.stack([self.nu[:, :Nc].sum(axis=1), self.nu[:, Nc:].sum(axis=1)], axis=1)
+        self.S = phase_nu[:, self.phase]
+        self.E_m = self.E[:, Nc:]
+        self.Nc = Nc
+        self.N = N
+
+        # elements in no layer species are not exchanged with the background mantle, so their totals are conserved,
+        # and core species in no reaction made only of such elements (e.g. C or H in the core) keep their moles
+        self.exchanged = np.any(self.E_m != 0, axis=1)
+        self.inert = ~np.any(self.nu != 0, axis=0) & ~np.any(self.E[self.exchanged] != 0, axis=0)
+        self.inert[Nc:] = False
+
+    def element_totals(self, Moles):
+        '''total moles of each element in the core and layer
+
+        :param Moles: moles of each species, shape (..., N)
+        :return: shape (..., Nelements)
+        '''
+        return np.asarray(Moles, dtype=float) @ self.E.T
+
+    def equilibrium(self, N, lnK, Moles_guess, reactions=None, free=None, tol=1e-12, maxiter=100):
+        '''solve for the moles of the free species with element totals N and the given reactions at equilibrium
+        constant K, by Newton iteration on ln(Moles) from Moles_guess. The other species keep their moles. A stack of
+        states is solved at once, each from its own guess.
+
+        :param N: total moles of each element, shape (..., Nelements)
+        :param lnK: ln(K) of each reaction in reactions, shape (..., len(reactions))
+        :param Moles_guess: starting moles, shape (..., N), > 0 for the free species
+        :param reactions: indices of the reactions held at equilibrium, default all
+        :param free: boolean mask of the species solved for, default all. There must be one per element and reaction.
+        :return: Moles, shape (..., N)
+        '''
+        Nel = len(self.elements)
+        if reactions is None:
+            reactions = np.arange(len(self.reactions))
+        if free is None:
+            free = np.ones(self.N, dtype=bool)
+        if Nel + len(reactions) != np.sum(free):
+            raise ValueError('{} constraints for {} free species'.format(Nel + len(reactions), np.sum(free)))
+        nu = self.nu[reactions]
+        used = np.any(nu != 0, axis=0)
+        nu_used = nu[:, used]
+        # the rows of matrix times the moles, i.e. the derivatives of the constraints by ln(M) of the free species,
+        # are E*M/N for the elements and nu - S*X for the reactions
+        E_free = self.E[:, free]
+        nu_free = nu[:, free]
+        S_free = self.S[reactions][:, free]
+        N = np.asarray(N, dtype=float)
+        lnK = np.asarray(lnK, dtype=float)
+        shape = np.broadcast_shapes(np.shape(Moles_guess)[:-1], N.shape[:-1], lnK.shape[:-1])
+        Moles = np.array(np.broadcast_to(Moles_guess, shape + (self.N,)), dtype=float)
+        # only the free species need to be positive, the fixed ones enter through the phase totals
+        lnM = np.log(Moles[..., free])
+        for i in range(maxiter):
+            Moles[..., free] = np.exp(lnM)
+            M_phase = np.stack([Moles[..., :self.Nc].sum(axis=-1), Moles[..., self.Nc:].sum(axis=-1)], axis=-1)
+            X = Moles / M_phase[..., self.phase]
+            F = np.concatenate([Moles @ self.E.T / N - 1., np.log(X[..., used]) @ nu_used.T - lnK], axis=-1)
+            if np.max(np.abs(F)) < tol:
+                return Moles
+            J = np.empty(shape + (len(nu_free) + Nel,) * 2)
+            J[..., :Nel, :] = E_free * Moles[..., None, free] / N[..., :, None]
+            J[..., Nel:, :] = nu_free - S_free * X[..., None, free]
+            dlnM = np.linalg.solve(J, -F[..., None])[..., 0]
+            lnM += dlnM / np.maximum(1., np.max(np.abs(dlnM), axis=-1, keepdims=True))
+        raise ValueError('equilibrium composition did not converge, residual {:.2e}'.format(np.max(np.abs(F))))
+
+    def matrix(self, Moles):
+        '''assemble the system matrix
+
+        :param Moles: moles of each species, shape (..., N)
+        :return: A, shape (..., N, N)
+        '''
+        Moles = np.asarray(Moles, dtype=float)
+        M_phase = np.stack([Moles[..., :self.Nc].sum(axis=-1), Moles[..., self.Nc:].sum(axis=-1)], axis=-1)
+        # species absent from a reaction contribute nothing, even if they have no moles (e.g. an inert element)
+        nu = np.broadcast_to(self.nu, Moles.shape[:-1] + self.nu.shape)
+        A_rx = np.divide(nu, Moles[..., None, :], out=np.zeros(nu.shape), where=nu != 0) \
+               - self.S / M_phase[..., None, self.phase]
+        A_el = np.broadcast_to(self.E, Moles.shape[:-1] + self.E.shape)
+        return np.concatenate([A_el, A_rx], axis=-2)
+
+    def rhs(self, dlnK_dT, dM_erode):
+        '''assemble the right-hand side
+
+        :param dlnK_dT: dln(K)/dT of each reaction, shape (..., Nreactions)
+        :param dM_erode: erosion term of each mantle species, shape (..., Nmantle)
+        :return: b, shape (..., N)
+        '''
+        b_el = -np.einsum('em,...m->...e', self.E_m, np.asarray(dM_erode, dtype=float))
+        return np.concatenate([b_el, np.asarray(dlnK_dT, dtype=float)], axis=-1)
+
+    def dMoles_dT(self, Moles, dlnK_dT, dM_erode):
+        '''solve for dM_i/dT of every species, for one state or a stack of states
+
+        :param Moles: moles of each species, shape (..., N)
+        :param dlnK_dT: dln(K)/dT of each reaction, shape (..., Nreactions)
+        :param dM_erode: erosion term of each mantle species, shape (..., Nmantle)
+        :return: dMoles_dT, shape (..., N)
+        '''
+        A = self.matrix(Moles)
+        b = self.rhs(dlnK_dT, dM_erode)
+        b = np.broadcast_to(b, A.shape[:-1])
+        return np.linalg.solve(A, b[..., None])[..., 0]
+
+# Mg, Si and O exchange between the core and the layer, and MgSiO3 and FeSiO3 formation within the layer,
+# in the order of MgSi.dKs_dT
+MGSI_REACTIONS = [
+    {'MgO': -1, 'Mg': 1, 'O': 1},
+    {'SiO2': -1, 'Si': 1, 'O': 2},
+    {'FeO': -1, 'Fe': 1, 'O': 1},
+    {'MgSiO3': -1, 'MgO': 1, 'SiO2': 1},
+    {'FeSiO3': -1, 'FeO': 1, 'SiO2': 1},
+]
+
+# the same reactions as a table for LightElements: 'K' is 'KD' for the K_D fits of KD_Model, 'fit' for a
+# log10(K) = a + b/T + c*P/T fit read from params.reactions.fit_KD_<name>_a, _b, _c (and optionally _dK_dT, the
+# coefficients entering dK/dT as for a 'from_params' K_D fit, by default both for reactions other than MgO, SiO2 and
+# FeO), or 'layer' for reactions within the layer relaxed toward the background mantle. 'gate' is the core species
+# that is only allowed to leave the core, and only near its equilibrium with this reaction.
+MGSI_REACTION_TABLE = [
+    {'name': 'MgO', 'stoich': MGSI_REACTIONS[0], 'K': 'KD', 'gate': 'Mg'},
+    {'name': 'SiO2', 'stoich': MGSI_REACTIONS[1], 'K': 'KD', 'gate': 'Si'},
+    {'name': 'FeO', 'stoich': MGSI_REACTIONS[2], 'K': 'KD', 'gate': 'O'},
+    {'name': 'MgSiO3', 'stoich': MGSI_REACTIONS[3], 'K': 'layer'},
+    {'name': 'FeSiO3', 'stoich': MGSI_REACTIONS[4], 'K': 'layer'},
+]
+# exchange of S and Ni with the layer, to be added to the table together with 'FeS' or 'NiO' in the layer species
+# and their fit coefficients in params.reactions
+FES_REACTION = {'name': 'FeS', 'stoich': {'FeS': -1, 'Fe': 1, 'S': 1}, 'K': 'fit'}
+NIO_REACTION = {'name': 'NiO', 'stoich': {'NiO': -1, 'Ni': 1, 'O': 1}, 'K': 'fit'}
+
+def _return(value, dvalue, derivative):
+    '''return scalars for scalar input, and the derivative only if requested'''
+    if value.ndim == 0:
+        value = value[()]
+        dvalue = dvalue[()]
+    if derivative:
+        return value, dvalue
+    return value
+
+def smooth_nonnegative(x, derivative=False):
+    '''smoothly clamp x to be >= 0: 0 below 0, x above 10, and x/(1+2^(-10(x-0.3))) between
+
+    :param x: scalar or array
+    :param derivative: also return d/dx
+    :return: value, or (value, d value/dx)
+    '''
+    x = np.asarray(x, dtype=float)
+    x_in = np.clip(x, 0., 10.)
+    g = 1. / (1. + 2. ** (-(x_in - 0.3) * 10))
+    value = np.where(x < 0, 0., np.where(x < 10, x_in * g, x))
+    dvalue = np.where(x < 0, 0., np.where(x < 10, g + x_in * 10 * np.log(2.) * g * (1 - g), 1.))
+    return _return(value, dvalue, derivative)
+
+def smooth_nonpositive(x, derivative=False):
+    '''smoothly clamp x to be <= 0: 0 above 0, x below -10, and x/(1+2^(10(x+0.3))) between
+
+    :param x: scalar or array
+    :param derivative: also return d/dx
+    :return: value, or (value, d value/dx)
+    '''
+    x = np.asarray(x, dtype=float)
+    x_in = np.clip(x, -10., 0.)
+    g = 1. / (1. + 2. ** ((x_in + 0.3) * 10))
+    value = np.where(x > 0, 0., np.where(x > -10, x_in * g, x))
+    dvalue = np.where(x > 0, 0., np.where(x > -10, g - x_in * 10 * np.log(2.) * g * (1 - g), 1.))
+    return _return(value, dvalue, derivative)
+
+def logit(x, mu=None, sig=1, derivative=False):
+    '''smooth step from 0 to 1 centered on mu with width sig, exactly 0 or 1 more than 10*sig from mu
+
+    :param x: scalar or array
+    :param mu: center of the step, default 10*sig
+    :param sig: width of the step
+    :param derivative: also return d/dx
+    :return: value, or (value, d value/dx)
+    '''
+    if mu is None:
+        mu = sig * 10
+    x = np.asarray(x, dtype=float)
+    z = np.clip((x - mu) / sig, -10., 10.)
+    g = 1. / (1. + 2. ** -z)
+    outside = (x > mu + 10 * sig) | (x < mu - 10 * sig)
+    value = np.where(x > mu + 10 * sig, 1., np.where(x < mu - 10 * sig, 0., g))
+    dvalue = np.where(outside, 0., np.log(2.) / sig * g * (1 - g))
+    return _return(value, dvalue, derivative)
+
 class MgSi():
+    KD_cache = KD_CACHE
+
     def __init__(self, params = None):
         if params is None:
             params = Parameters('Mantle reaction layer parameters')
@@ -318,6 +764,9 @@ class MgSi():
 
         self.core = Core_MgSi(params=params)
         self.mantle = Mantle_MgSi(params=params)
+        self.network = ReactionNetwork(self.core.species, self.mantle.species, MGSI_REACTIONS)
+        self.layer_reactions = [3, 4] # MgSiO3 and FeSiO3 form within the layer, the rest exchange with the core
+        self.bind_KD_model()
 
     def C_m(self, dMoles, Moles):
         ''' compute wt % MgO exsolved from the core given dM and M
@@ -371,9 +820,9 @@ class MgSi():
         pr.mass_l_0 = pr.V_l * pr.rho_m # total initial mass of the layer -- this was not added earlier
 
     def dKs_dT(self, T_cmb=None, Moles=None, dTdt=None, time=None):
-        dKMgO_dT_KMgO = self.dKMgO_dT_KMgO(T_cmb, Moles)
-        dKSiO2_dT_KSiO2 = self.dKSiO2_dT_KSiO2(T_cmb, Moles)
-        dKFeO_dT_KFeO = self.dKFeO_dT_KFeO(T_cmb, Moles)
+        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
+        K, dK_dT = self.KD_vals(T_cmb, M_Si/M_c, M_O/M_c)
+        dKMgO_dT_KMgO, dKSiO2_dT_KSiO2, dKFeO_dT_KFeO = dK_dT / K
         dKMgSiO3_dT_KMgSiO3 = self.dKMgSiO3_dT_KMgSiO3(T_cmb=T_cmb, Moles=Moles, dTdt=dTdt, time=time)
         dKFeSiO3_dT_KFeSiO3 = self.dKFeSiO3_dT_KFeSiO3(T_cmb=T_cmb, Moles=Moles, dTdt=dTdt, time=time)
         dKs_dT = [dKMgO_dT_KMgO, dKSiO2_dT_KSiO2, dKFeO_dT_KFeO, dKMgSiO3_dT_KMgSiO3, dKFeSiO3_dT_KFeSiO3]
@@ -437,132 +886,108 @@ class MgSi():
         # dKFeSiO3_KFeSiO3 = pr.dKFeSiO3_KFeSiO3
         return dKFeSiO3_KFeSiO3
 
+    def set_KD_citation(self, MgO=None, SiO2=None, FeO=None):
+        '''choose the K_D fit citation for any of the species and bind the model
+
+        :param MgO: citation for MgO, e.g. 'Badro2015' or 'from_params'
+        :param SiO2: citation for SiO2, e.g. 'Hirose2017', 'Fischer2015', 'Badro2015' or 'from_params'
+        :param FeO: citation for FeO, e.g. 'Hirose2017', 'Fischer2015', 'Badro2015' or 'from_params'
+        :return: bound KD_Model
+        '''
+        pr = self.params.reactions
+        if MgO is not None:
+            pr.ParamCitationMgO = MgO
+        if SiO2 is not None:
+            pr.ParamCitationSiO2 = SiO2
+        if FeO is not None:
+            pr.ParamCitationFeO = FeO
+        return self.bind_KD_model()
+
+    def bind_KD_model(self):
+        '''bind the K_D model to the citations (and 'from_params' coefficients) currently in params.reactions
+
+        :return: bound KD_Model
+        '''
+        pr = self.params.reactions
+        citations = {}
+        for sp in KD_Model.species:
+            name = 'ParamCitation' + sp
+            if hasattr(pr, name):
+                citations[sp] = getattr(pr, name)
+        self.KD_model = KD_Model(citations, params=pr)
+        # models bound for other pressures or citations by _KD_vals_for
+        self._KD_models = {}
+        return self.KD_model
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'network' not in state:
+            self.network = ReactionNetwork(self.core.species, self.mantle.species, MGSI_REACTIONS)
+        if 'layer_reactions' not in state:
+            self.layer_reactions = [3, 4]
+        if 'KD_model' not in state:
+            self.bind_KD_model()
+        if '_KD_models' not in self.__dict__:
+            self._KD_models = {}
+
+    def _KD_vals_for(self, T_inp, P_inp_base, species, ParamCitation, X_Si=None, X_O=None):
+        '''K_D values from the bound model, or from a model bound for a different pressure or citation, kept until
+        the next bind_KD_model'''
+        if ParamCitation is None and P_inp_base == 139e6:
+            return self.KD_vals(T_inp, X_Si, X_O)
+        citations = dict(zip(KD_Model.species, self.KD_model.citations))
+        if ParamCitation is not None:
+            citations[species] = ParamCitation
+        key = (tuple(citations[sp] for sp in KD_Model.species), P_inp_base)
+        model = self._KD_models.get(key)
+        if model is None:
+            model = KD_Model(citations, params=self.params.reactions, P=P_inp_base / 1e6)
+            self._KD_models[key] = model
+        return model(T_inp)
+
+    def KD_vals(self, T_cmb, X_Si=None, X_O=None):
+        '''K_D values and temperature derivatives of all exchange reactions from the bound model, through
+        KD_cache for scalar temperatures
+
+        :param T_cmb: CMB temperature [K], scalar or array
+        :param X_Si: mole fraction Si in the core
+        :param X_O: mole fraction O in the core
+        :return: K [MgO, SiO2, FeO], dK_dT [MgO, SiO2, FeO]
+        '''
+        if np.ndim(T_cmb) == 0:
+            return self.KD_cache(self.KD_model, T_cmb, X_Si, X_O)
+        return self.KD_model(T_cmb)
+
+    def KD_cache_info(self):
+        '''hit/miss statistics of the K_D cache'''
+        return self.KD_cache.info()
+
     def func_KD_SiO2_val(self, X_Si, X_O, T_inp, P_inp_base=139e6, temp_diff_pm=10, ParamCitation=None):
         '''
         K_D for SiO2 value
         Needs the following inputs : T_inp (Temperature in K), P_inp (Pressure in GPa),
         X_Si - mole frac Si in the core
         X_O - mole frac O in the core
-        diff_pm = value of temp diff to calculate local deriv
         Note - (all the Mg related terms are zero since no data)
         '''
-        pr = self.params.reactions
-        if ParamCitation is None:
-            try:
-                ParamCitation = pr.ParamCitationSiO2
-            except:
-                ParamCitation = 'Hirose2017'
-        P_inp = P_inp_base / 1e6  # convert to GPa
-        if ParamCitation == 'Hirose2017':
-            ### Fit values from Hirose et al. 2017 paper (Eqn 5 in the Supplementary material)
-            fit_KD_FeO_a = 0.3009  # (+/- 0.1120)
-            fit_KD_FeO_b = 0  # K (+/- 0)
-            fit_KD_FeO_c = -36.8332  # K/GPa (+/- 5.5957)
-            log_KD_FeO = fit_KD_FeO_a + fit_KD_FeO_b / T_inp + fit_KD_FeO_c * P_inp / T_inp
-            # Fit values from Rebecca Fischer et al. 2015 (extended Data Table 1 - Hirose 2017)
-            fit_KD_Si_a = 1.3  # (+/- 0.3)
-            fit_KD_Si_b = -13500  # (+/- 900)
-            fit_KD_Si_c = 0  # K/GPa (+/- 0)
-            log_KD_Si = fit_KD_Si_a + fit_KD_Si_b / T_inp + fit_KD_Si_c * P_inp / T_inp
-            KD_SiO2_p = (10. ** log_KD_Si) * ((10. ** log_KD_FeO) ** 2.)
-            emp_corr_fac = 2.  # to match the dataset from Hirose et al. 2017
-            KD_SiO2 = KD_SiO2_p * emp_corr_fac
-            KD_SiO2_T_deriv = -1. * np.log(10) * KD_SiO2 * (2. * fit_KD_FeO_c * P_inp + fit_KD_Si_b) / T_inp ** 2.
-        elif ParamCitation == 'Badro2015':
-            fit_KD_Si_a = 0.36  # (+/- 0.3)
-            fit_KD_Si_b = -4064  # (+/- 900)
-            fit_KD_Si_c = 0 # K/GPa (+/- 0)
-            log_KD_Si = fit_KD_Si_a + fit_KD_Si_b / T_inp + fit_KD_Si_c * P_inp / T_inp
-            KD_SiO2 = (10. ** log_KD_Si)
-        elif ParamCitation == 'Fischer2015':
-            fit_KD_Si_a = 1.3  # (+/- 0.3)
-            fit_KD_Si_b = -13500 # K (+/- 900)
-            fit_KD_Si_c = 0  # K/GPa (+/- 0)
-            log_KD_Si = fit_KD_Si_a + fit_KD_Si_b / T_inp + fit_KD_Si_c * P_inp / T_inp
-            KD_SiO2 = 10**log_KD_Si
-            KD_SiO2_T_deriv = (KD_SiO2) * -1. * fit_KD_Si_c * P_inp * np.log(10.) / T_inp ** 2.
-        elif ParamCitation == 'from_params':
-            fit_KD_Si_a = pr.fit_KD_Si_a  #
-            fit_KD_Si_b = pr.fit_KD_Si_b # K
-            fit_KD_Si_c = pr.fit_KD_Si_c  # K/GPa
-            log_KD_Si = fit_KD_Si_a + fit_KD_Si_b / T_inp + fit_KD_Si_c * P_inp / T_inp
-            KD_SiO2 = 10**log_KD_Si
-            KD_SiO2_T_deriv = (KD_SiO2) * -1. * fit_KD_Si_c * P_inp * np.log(10.) / T_inp ** 2.
-        else:
-            raise ValueError('ParamCitation for SiO2 unknown')
-        ### Checked this against doing the integration numerically (with a small dT)
-        return KD_SiO2, KD_SiO2_T_deriv
+        K, dK_dT = self._KD_vals_for(T_inp, P_inp_base, 'SiO2', ParamCitation, X_Si, X_O)
+        return K[1], dK_dT[1]
 
     def func_KD_FeO_val(self, T_inp, P_inp_base=139e6, ParamCitation=None):
         '''
         K_D for FeO value
         Needs the following inputs : T_inp (Temperature in K), P_inp (Pressure in GPa),
         '''
-        pr = self.params.reactions
-        if ParamCitation is None:
-            try:
-                ParamCitation = pr.ParamCitationFeO
-            except:
-                ParamCitation = 'Hirose2017'
-        P_inp = P_inp_base / 1e6  # convert to GPa
-
-        if ParamCitation == 'Hirose2017':
-            ### Fit values from Hirose et al. 2017 paper (Eqn 5 in the Supplementary material)
-            fit_KD_FeO_a = 0.3009  # (+/- 0.1120)
-            fit_KD_FeO_b = 0
-            fit_KD_FeO_c = -36.8332  # (+/- 5.5957)
-            log_KD_FeO = fit_KD_FeO_a + fit_KD_FeO_b / T_inp + fit_KD_FeO_c * P_inp / T_inp
-        elif ParamCitation == 'Badro2015':
-            ### Fit values from Badro et al. 2015 paper (in the Supplementary material)
-            fit_KD_FeO_a = 2.74 # +/- 0.14
-            fit_KD_FeO_b = -11439 # K +/- 387
-            fit_KD_FeO_c = 0 # K/GPa
-            log_KD_FeO = fit_KD_FeO_a + fit_KD_FeO_b / T_inp + fit_KD_FeO_c * P_inp / T_inp
-        elif ParamCitation == 'Fischer2015':
-            ### Fit values from Fischer et al. 2015 paper
-            fit_KD_FeO_a = 0.60  # (+/- 0.4)
-            fit_KD_FeO_b = -3800  # K (+/- 900)
-            fit_KD_FeO_c = 22 # K/GPa (+/- 14)
-            log_KD_FeO = fit_KD_FeO_a + fit_KD_FeO_b / T_inp + fit_KD_FeO_c * P_inp / T_inp
-        elif ParamCitation == 'from_params':
-            fit_KD_FeO_a = pr.fit_KD_FeO_a  #
-            fit_KD_FeO_b = pr.fit_KD_FeO_b # K
-            fit_KD_FeO_c = pr.fit_KD_FeO_c  # K/GPa
-            log_KD_FeO = fit_KD_FeO_a + fit_KD_FeO_b / T_inp + fit_KD_FeO_c * P_inp / T_inp
-        else:
-            raise ValueError('ParamCitation for FeO unknown')
-        KD_FeO = 10. ** log_KD_FeO
-        KD_FeO_Tderiv = (KD_FeO) * -1. * fit_KD_FeO_c * P_inp * np.log(10.) / T_inp ** 2.
-        return KD_FeO, KD_FeO_Tderiv
+        K, dK_dT = self._KD_vals_for(T_inp, P_inp_base, 'FeO', ParamCitation)
+        return K[2], dK_dT[2]
 
     def func_KD_MgO_val(self, T_inp, P_inp_base=139e6, ParamCitation=None):
         '''
         K_D for MgO value
         Needs the following inputs : T_inp (Temperature in K), P_inp (Pressure in GPa),
         '''
-        pr = self.params.reactions
-        if ParamCitation is None:
-            try:
-                ParamCitation = pr.ParamCitationMgO
-            except:
-                ParamCitation = 'Badro2015'
-        P_inp = P_inp_base / 1e6  # convert to GPa
-        if ParamCitation=='Badro2015':
-            ### Fit values from Badro et al. 2015 paper (Eqn 5 in the Supplementary material)
-            fit_KD_MgO_a = 1.23  # (+/- 0.7)
-            fit_KD_MgO_b = -18816  # (+/- 2600)
-            fit_KD_MgO_c = 0
-            log_KD_MgO = fit_KD_MgO_a + fit_KD_MgO_b / T_inp + fit_KD_MgO_c * P_inp / T_inp
-        elif ParamCitation == 'from_params':
-            fit_KD_MgO_a = pr.fit_KD_MgO_a  #
-            fit_KD_MgO_b = pr.fit_KD_MgO_b  # K
-            fit_KD_MgO_c = pr.fit_KD_MgO_c  # K/GPa
-            log_KD_MgO = fit_KD_MgO_a + fit_KD_MgO_b / T_inp + fit_KD_MgO_c * P_inp / T_inp
-        else:
-            raise ValueError('ParamCitation for MgO unknown')
-        KD_MgO = 10. ** log_KD_MgO
-        KD_MgO_Tderiv = (KD_MgO) * -1. * fit_KD_MgO_b * np.log(10.) / T_inp ** 2.
-        return KD_MgO, KD_MgO_Tderiv
+        K, dK_dT = self._KD_vals_for(T_inp, P_inp_base, 'MgO', ParamCitation)
+        return K[0], dK_dT[0]
 
     def unwrap_dKs_dT(self, dKs_dT):
         ''' helper function to unwrap dK values from dKs_dT'''
@@ -689,14 +1114,14 @@ class MgSi():
             dKs_dT = self.dKs_dT(Moles=Moles, T_cmb=T_cmb, dTdt=dTdt, time=time)
         if dMi_b is None:
             dMi_b = self.dMm_b(Moles=Moles, dTdt=dTdt, time=time)
-        if dTdt > 0.:
+        if np.any(np.asarray(dTdt) > 0.):
             raise AssertionError("dTdt should not be >0., something is wrong.")
 
-        # core
-        dM_Mg_dT = self.dM_Mg_dTc(Moles, dKs_dT, dMi_b)
-        dM_Si_dT = self.dM_Si_dTc(Moles, dKs_dT, dMi_b)
-        dM_O_dT = self.dM_O_dTc(Moles, dKs_dT, dMi_b)
-        dM_Fe_dT = self.dM_Fe_dTc(Moles, dKs_dT, dMi_b)
+        dM_dT = self.network.dMoles_dT(np.asarray(Moles, dtype=float),
+                                       np.stack(np.broadcast_arrays(*dKs_dT), axis=-1),
+                                       np.stack(np.broadcast_arrays(*dMi_b), axis=-1))
+        dM_Mg_dT, dM_Si_dT, dM_Fe_dT, dM_O_dT, dM_MgO_dT, dM_SiO2_dT, dM_FeO_dT, dM_MgSiO3_dT, dM_FeSiO3_dT = \
+            np.moveaxis(dM_dT, -1, 0)
 
         # Don't let these species go into the core
         dM_Mg_dT = self.logit(dM_Mg_dT)*dM_Mg_dT
@@ -714,21 +1139,42 @@ class MgSi():
         dM_Si_dT = self.logit((M_Si-M_Si_eq*near)/np.abs(M_Si_eq)*A)*np.abs((M_Si-M_Si_eq)/np.abs(M_Si_eq)+1)**d*dM_Si_dT
         dM_O_dT = self.logit((M_O-M_O_eq*near)/np.abs(M_O_eq)*A)*np.abs((M_O-M_O_eq)/np.abs(M_O_eq)+1)**d*dM_O_dT
 
-        # mantle
-        dM_MgO_dT = self.dM_MgO_dTc(Moles, dKs_dT, dMi_b)
-        dM_SiO2_dT = self.dM_SiO2_dTc(Moles, dKs_dT, dMi_b)
-        dM_FeO_dT = self.dM_FeO_dTc(Moles, dKs_dT, dMi_b)
-        dM_MgSiO3_dT = self.dM_MgSiO3_dTc(Moles, dKs_dT, dMi_b)
-        dM_FeSiO3_dT = self.dM_FeSiO3_dTc(Moles, dKs_dT, dMi_b)
         return [dM_Mg_dT, dM_Si_dT, dM_Fe_dT, dM_O_dT, dM_MgO_dT, dM_SiO2_dT, dM_FeO_dT, dM_MgSiO3_dT, dM_FeSiO3_dT]
 
+    def exchange_K(self, T_cmb, X_Si=None, X_O=None):
+        '''K and dK/dT of the core exchange reactions, in the order of the reactions'''
+        return self.KD_vals(T_cmb, X_Si, X_O)
+
+    def kinetic_species(self):
+        '''mask of the species formed within the layer (the reactants of the layer reactions), which stay kinetic
+        when the core exchange is held at equilibrium'''
+        return np.any(self.network.nu[self.layer_reactions] < 0, axis=0)
+
+    def equilibrium_Moles(self, T_cmb, N, Moles_guess):
+        '''moles of every species with element totals N and the core exchange reactions at their K_D at T_cmb, with
+        the species formed within the layer (kinetic_species) kept at their moles in Moles_guess
+
+        :param T_cmb: CMB temperature [K], scalar or array for a stack of states
+        :param N: total moles of each element in the core and layer, in the order of network.elements, shape
+            shape(T_cmb) + (Nelements,)
+        :param Moles_guess: starting moles for the solve, e.g. the previous composition, shape shape(T_cmb) + (N,)
+        :return: Moles
+        '''
+        net = self.network
+        Moles_guess = np.asarray(Moles_guess, dtype=float)
+        M_c = np.sum(Moles_guess[..., :net.Nc], axis=-1)
+        X_Si = Moles_guess[..., net.species.index('Si')] / M_c if 'Si' in net.species else None
+        X_O = Moles_guess[..., net.species.index('O')] / M_c if 'O' in net.species else None
+        K, _ = self.exchange_K(T_cmb, X_Si, X_O)
+        exchange = [i for i in range(len(net.reactions)) if i not in self.layer_reactions]
+        return net.equilibrium(N, np.moveaxis(np.log(K), 0, -1), Moles_guess, reactions=exchange,
+                               free=~self.kinetic_species())
+
     def compute_Moles_eq(self, Moles=None, T_cmb=None):
         M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
         X_Si = M_Si/M_c
         X_O = M_O/M_c
-        K_Si,_ = self.func_KD_SiO2_val(X_Si, X_O, T_inp=T_cmb)
-        K_Fe, _ = self.func_KD_FeO_val(T_cmb)
-        K_Mg, _ = self.func_KD_MgO_val(T_cmb)
+        (K_Mg, K_Si, K_Fe), _ = self.KD_vals(T_cmb, X_Si, X_O)
         M_Mg_eq = K_Mg*M_MgO*M_c**2 / (M_O*M_m)
         M_Si_eq = K_Si*M_SiO2*M_c**3 / (M_O**2 * M_m)
         M_O_eq = K_Fe*M_FeO*M_c**2 / (M_Fe*M_m)
@@ -745,21 +1191,33 @@ class MgSi():
         pr = self.params.reactions
         X_Fe = 1 - X_Mg - X_Si - X_O
         X_c = np.array([X_Mg, X_Si, X_Fe, X_O])
-        K4, _ = self.func_KD_MgO_val(T_cmb)
-        K5, _ = self.func_KD_FeO_val(T_cmb)
-        K6, _ = self.func_KD_SiO2_val(X_Si, X_O, T_cmb)
+        # citations are set on params.reactions before the initial state is computed, so bind them here
+        self.bind_KD_model()
+        M_c = self.core.X2M(X_c, wt_tot=pr.mass_c_0)
+        M_m = self.equilibrium_layer(T_cmb, M_c)
+        Moles = list(M_c) + list(M_m)
+        if np.min(Moles) < 0.:
+            raise ValueError("initial core composition invalid, no mantle equilibrium composition possible.")
+        return Moles
+
+    def equilibrium_layer(self, T_cmb, M_c):
+        '''moles of the mantle layer species in equilibrium with a core of moles M_c at T_cmb, for the initial layer
+        mass
+
+        :param T_cmb: CMB temperature [K]
+        :param M_c: moles of Mg, Si, Fe, O in the core
+        :return: moles of MgO, SiO2, FeO, MgSiO3, FeSiO3, negative where no equilibrium layer exists
+        '''
+        pr = self.params.reactions
+        X_Mg, X_Si, X_Fe, X_O = self.core.M2X(np.asarray(M_c, dtype=float))
+        (K4, K6, K5), _ = self.KD_vals(T_cmb, X_Si, X_O)
         X_MgO = X_Mg * X_O / K4
         X_FeO = X_Fe * X_O / K5
         X_SiO2 = X_Si * X_O ** 2 / K6
         X_FeSiO3 = (1 - X_MgO - X_FeO - X_SiO2) / (1 + X_MgO / X_FeO)
         X_MgSiO3 = 1 - X_MgO - X_FeO - X_SiO2 - X_FeSiO3
         X_m = np.array([X_MgO, X_SiO2, X_FeO, X_MgSiO3, X_FeSiO3])
-        M_m = self.mantle.X2M(X_m, wt_tot=pr.mass_l_0)
-        M_c = self.core.X2M(X_c, wt_tot=pr.mass_c_0)
-        Moles = list(M_c) + list(M_m)
-        if np.min(Moles) < 0.:
-            raise ValueError("initial core composition invalid, no mantle equilibrium composition possible.")
-        return Moles
+        return self.mantle.X2M(X_m, wt_tot=pr.mass_l_0)
 
     def dMoles_dt(self, Moles=None, T_cmb=None, dTc_dt=None, dKs_dT=None, dMoles_dT=None, time=None):
         '''calculate the change in Moles vs time (t) for each molar species in the core and mantle
@@ -795,31 +1253,14 @@ class MgSi():
         '''
         return np.sum(dM_im_dTc)
 
-    def smooth_nonnegative(self, x):
-        if x < 0:
-            return 0
-        elif x < 10:
-            return x / (1 + 2 ** (-(x - 0.3) * 10))
-        else:
-            return x
+    def smooth_nonnegative(self, x, derivative=False):
+        return smooth_nonnegative(x, derivative=derivative)
 
-    def smooth_nonpositive(self, x):
-        if x > 0:
-            return 0
-        elif x > -10:
-            return x / (1 + 2 ** ((x + 0.3) * 10))
-        else:
-            return x
-
-    def logit(self, x, mu=None, sig=1):
-        if mu is None:
-            mu = sig * 10
-        if x > mu + 10 * sig:
-            return 1
-        elif x < mu - 10 * sig:
-            return 0
-        else:
-            return 1 / (1 + 2 ** -((x - mu) / sig))
+    def smooth_nonpositive(self, x, derivative=False):
+        return smooth_nonpositive(x, derivative=derivative)
+
+    def logit(self, x, mu=None, sig=1, derivative=False):
+        return logit(x, mu=mu, sig=sig, derivative=derivative)
 
     def tau(self, time):
         '''computes the mantle overturn time given current time since formation of Earth in seconds
@@ -831,79 +1272,292 @@ class MgSi():
         #return (pr.tau_p - pr.tau_0) * (1 - np.exp(-time / pr.T_tau)) + pr.tau_0
         return (pr.tau_p - pr.tau_0) * (1 - np.exp(-time / pr.T_tau)) + pr.tau_0
 
-    def dM_SiO2_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_SiO2 given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_SiO2*(M_Fe*(M_O*(M_MgO*(M_FeO*M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)))) + dKFeO_KFeO*(M_Mg*M_O*M_m*(-4.0*M_FeO*M_MgSiO3 + 4.0*M_FeSiO3*M_MgO) + M_Si*(M_Mg*(M_O*(M_FeO*(-6.0*M_MgSiO3 + 6.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 3.0*M_MgO + 15.0*M_m)) + M_m*(-M_FeO*M_MgSiO3 + M_FeSiO3*M_MgO)) + M_O*(M_MgO*(6.0*M_FeO*M_m + M_FeSiO3*(-9.0*M_FeO + 15.0*M_m)) + M_MgSiO3*(M_FeO*(-9.0*M_MgO + 6.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO + 15.0*M_m)))) + M_c*(M_Mg*(M_FeO*M_MgSiO3*M_m + M_FeSiO3*(-M_MgO*M_m + M_O*(M_FeO + M_MgO - M_m))) + M_O*(M_FeSiO3*M_MgO*(M_FeO - M_m) + M_MgSiO3*(M_FeO*M_MgO + M_FeSiO3*(M_FeO + M_MgO - M_m))) + M_Si*(M_Mg*(M_FeO*(2.0*M_MgSiO3 - 2.0*M_m) + M_FeSiO3*(4.0*M_FeO + 2.0*M_MgO - 6.0*M_m) + M_O*(M_FeO + M_FeSiO3)) + M_MgO*(-2.0*M_FeO*M_m + M_FeSiO3*(4.0*M_FeO - 6.0*M_m)) + M_MgSiO3*(M_FeO*(4.0*M_MgO - 2.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO - 6.0*M_m)) + M_O*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*M_m*(M_Fe*M_FeO*(4.0*M_MgO + 4.0*M_MgSiO3) + M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO) + M_FeO*(4.0*M_MgO + 4.0*M_MgSiO3))) + M_Si*(M_Fe*(M_FeO*M_m*(M_MgO + M_MgSiO3) + M_O*(M_MgO*(-3.0*M_FeO + 15.0*M_m) + M_MgSiO3*(-3.0*M_FeO - 9.0*M_MgO + 15.0*M_m))) + M_FeO*M_O*M_m*(9.0*M_MgO + 9.0*M_MgSiO3) + M_Mg*(M_Fe*(M_O*(-3.0*M_FeO - 3.0*M_MgO + 15.0*M_m) + M_m*(M_FeO + M_MgO)) + M_FeO*(M_O*(-3.0*M_MgO + 6.0*M_MgSiO3 + 9.0*M_m) + M_m*(M_MgO + M_MgSiO3)))) + M_c*(M_Fe*(M_FeO*M_m*(-M_MgO - M_MgSiO3) + M_O*(M_MgO*(M_FeO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m))) + M_FeO*M_O*M_m*(-M_MgO - M_MgSiO3) + M_Mg*(M_Fe*(M_O*(M_FeO + M_MgO - M_m) + M_m*(-M_FeO - M_MgO)) + M_FeO*(M_O*(M_MgO - M_m) + M_m*(-M_MgO - M_MgSiO3))) + M_Si*(M_Fe*(M_MgO*(2.0*M_FeO - 6.0*M_m) + M_MgSiO3*(2.0*M_FeO + 4.0*M_MgO - 6.0*M_m) + M_O*(M_MgO + M_MgSiO3)) + M_FeO*M_m*(-4.0*M_MgO - 4.0*M_MgSiO3) + M_Mg*(M_Fe*(2.0*M_FeO + 2.0*M_MgO + M_O - 6.0*M_m) + M_FeO*(2.0*M_MgO - 2.0*M_MgSiO3 - 4.0*M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_m*(M_FeO*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgO*(M_FeO*M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)))) + dKMgO_KMgO*(M_Fe*M_O*M_m*(4.0*M_FeO*M_MgSiO3 - 4.0*M_FeSiO3*M_MgO) + M_Si*(M_Fe*(M_O*(M_MgO*(-6.0*M_FeSiO3 + 6.0*M_m) + M_MgSiO3*(-3.0*M_FeO - 9.0*M_MgO + 15.0*M_m)) + M_m*(M_FeO*M_MgSiO3 - M_FeSiO3*M_MgO)) + M_O*(M_MgO*(6.0*M_FeO*M_m + M_FeSiO3*(-9.0*M_FeO + 6.0*M_m)) + M_MgSiO3*(M_FeO*(-9.0*M_MgO + 15.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO + 15.0*M_m)))) + M_c*(M_Fe*(M_FeSiO3*M_MgO*M_m + M_MgSiO3*(-M_FeO*M_m + M_O*(M_FeO + M_MgO - M_m))) + M_O*(M_FeO*M_FeSiO3*M_MgO + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m))) + M_Si*(M_Fe*(M_MgO*(2.0*M_FeSiO3 - 2.0*M_m) + M_MgSiO3*(2.0*M_FeO + 4.0*M_MgO - 6.0*M_m) + M_O*(M_MgO + M_MgSiO3)) + M_MgO*(-2.0*M_FeO*M_m + M_FeSiO3*(4.0*M_FeO - 2.0*M_m)) + M_MgSiO3*(M_FeO*(4.0*M_MgO - 6.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO - 6.0*M_m)) + M_O*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*M_m*(M_Fe*M_MgO*(4.0*M_FeO + 4.0*M_FeSiO3) + M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO) + M_MgO*(4.0*M_FeO + 4.0*M_FeSiO3))) + M_Si*(M_Mg*(M_Fe*(M_O*(-3.0*M_FeO - 3.0*M_MgO + 15.0*M_m) + M_m*(M_FeO + M_MgO)) + M_MgO*M_m*(M_FeO + M_FeSiO3) + M_O*(M_FeO*(-3.0*M_MgO + 15.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 3.0*M_MgO + 15.0*M_m))) + M_MgO*(M_Fe*(M_O*(-3.0*M_FeO + 6.0*M_FeSiO3 + 9.0*M_m) + M_m*(M_FeO + M_FeSiO3)) + M_O*M_m*(9.0*M_FeO + 9.0*M_FeSiO3))) + M_c*(M_Mg*(M_Fe*(M_O*(M_FeO + M_MgO - M_m) + M_m*(-M_FeO - M_MgO)) + M_MgO*M_m*(-M_FeO - M_FeSiO3) + M_O*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m))) + M_MgO*(M_Fe*(M_O*(M_FeO - M_m) + M_m*(-M_FeO - M_FeSiO3)) + M_O*M_m*(-M_FeO - M_FeSiO3)) + M_Si*(M_Mg*(M_Fe*(2.0*M_FeO + 2.0*M_MgO + M_O - 6.0*M_m) + M_FeO*(2.0*M_MgO - 6.0*M_m) + M_FeSiO3*(4.0*M_FeO + 2.0*M_MgO - 6.0*M_m) + M_O*(M_FeO + M_FeSiO3)) + M_MgO*(M_Fe*(2.0*M_FeO - 2.0*M_FeSiO3 - 4.0*M_m) + M_m*(-4.0*M_FeO - 4.0*M_FeSiO3))))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(-1.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er))) + M_O*(M_MgO*(M_FeO*(2*dM_FeO_er + 5.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_FeSiO3*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 16.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(2*dM_FeO_er + 5.0*dM_FeSiO3_er - 1.0*dM_MgO_er + 2.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_FeSiO3*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_MgO*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_m*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er + 9.0*dM_MgO_er - 9.0*dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_O*(M_FeO*(2*dM_FeO_er + 5.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_FeSiO3*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_MgO*(2*dM_FeO_er + 5.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_MgSiO3*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_m*(M_FeO*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_MgO*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_MgO*(M_FeO*M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(-1.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeO_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(2*dM_FeO_er + 5.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(-9.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er) + M_MgO*(-1.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(9.0*dM_FeO_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-10.0*dM_FeO_er - 16.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_FeSiO3*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*M_m*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_m*(9.0*dM_FeO_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_m*(-9.0*dM_FeSiO3_er + 9.0*dM_MgO_er - 9.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_MgO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_m*(9.0*dM_FeO_er + 9.0*dM_MgO_er - 9.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(-4.0*M_FeO*M_m + M_FeSiO3*(6.0*M_FeO - 10.0*M_m)) + M_MgSiO3*(M_FeO*(6.0*M_MgO - 4.0*M_m) + M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 10.0*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 10.0*M_m) + M_MgSiO3*(6.0*M_FeO + 6.0*M_MgO - 10.0*M_m) + M_m*(-4.0*M_FeO - 4.0*M_MgO)) + M_MgO*(-4.0*M_FeO*M_m + M_FeSiO3*(6.0*M_FeO - 4.0*M_m)) + M_MgSiO3*(M_FeO*(6.0*M_MgO - 10.0*M_m) + M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 10.0*M_m)))) + M_c*(M_Fe*(M_MgO*(M_FeO*M_m + M_FeSiO3*(-2.0*M_FeO + 3.0*M_m)) + M_MgSiO3*(M_FeO*(-2.0*M_MgO + M_m) + M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + 3.0*M_m)) + M_O*(M_MgO*(-M_FeO + M_m) + M_MgSiO3*(-M_FeO + M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + 3.0*M_m) + M_MgSiO3*(-2.0*M_FeO - 2.0*M_MgO + 3.0*M_m) + M_O*(-M_FeO - M_MgO + M_m) + M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_m + M_FeSiO3*(-2.0*M_FeO + M_m)) + M_MgSiO3*(M_FeO*(-2.0*M_MgO + 3.0*M_m) + M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + 3.0*M_m)) + M_O*(M_FeO*(-M_MgO + M_m) + M_FeSiO3*(-M_MgO + M_m))) + M_O*M_m*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3))))) + M_c*(M_Fe*(M_MgO*(M_FeO*M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er - dM_MgO_er + 1.0*dM_SiO2_er))) + M_O*(M_MgO*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er) + M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er - dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er - dM_MgO_er + 1.0*dM_SiO2_er)) + M_O*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_m*(M_FeO*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgO*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er))) + M_MgO*(M_FeO*M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_FeSiO3_er - dM_MgO_er + 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_FeO_er - dM_MgO_er + 1.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_MgO*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_MgO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_m*(-dM_FeO_er - dM_MgO_er + dM_SiO2_er)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(dM_FeO_er + 3.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 5.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_MgO*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_O*(M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_MgSiO3*(dM_MgO_er + dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_MgO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_MgSiO3*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_FeO*(M_MgO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_MgO*(1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(3.0*dM_FeO_er + 5.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_FeSiO3*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_O*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er))) + M_MgO*(M_FeO*M_m*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_FeO_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_MgO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er))) + M_O*(M_MgO*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+class LightElements(MgSi):
+    '''Exchange of any set of light elements between the core and the mantle layer, configured by the core and
+    layer species and a reaction table (see MGSI_REACTION_TABLE). The state layout is the core species followed by
+    the layer species, in the order given. Core species with no reaction, e.g. C or H, keep their moles.
 
-    def dM_FeO_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_FeO given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_FeO*(M_Fe*(M_O*(M_MgO*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er))) + dKFeO_KFeO*(M_Mg*M_O*(M_MgO*(M_FeSiO3*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(M_MgO*(M_FeSiO3*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(9.0*M_MgO + 6.0*M_SiO2 - 15.0*M_m) + M_MgO*(M_SiO2 - 4.0*M_m) + M_MgSiO3*(9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) - 9.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(6.0*M_SiO2 - 15.0*M_m) - 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeSiO3*(6.0*M_SiO2 - 15.0*M_m) + M_MgO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_MgO*(M_FeSiO3*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(-M_MgO + M_m) + M_MgSiO3*(-M_MgO + M_m) + M_SiO2*(-M_MgO + M_m))) + M_O*(M_MgO*M_m*(M_FeSiO3 + M_SiO2) + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_m*(M_FeSiO3 + M_SiO2))) + M_Si*(M_Mg*(M_FeSiO3*(-4.0*M_MgO - 2.0*M_SiO2 + 6.0*M_m) + M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_MgO - M_MgSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_MgO*(M_FeSiO3*(-2.0*M_SiO2 + 6.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeSiO3*(-2.0*M_SiO2 + 6.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + M_m)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*(M_Fe*(4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Mg*(M_MgSiO3*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_Fe + 4.0*M_MgO))) + M_Si*(M_Fe*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgO*(2.0*M_SiO2 + 10.0*M_m) + M_MgSiO3*(-9.0*M_MgO + 2.0*M_SiO2 + 10.0*M_m))) + M_Mg*(M_Fe*(M_O*(2.0*M_SiO2 + 10.0*M_m) + M_SiO2*M_m) + M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m)) + M_O*(9.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_c*(M_Fe*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(M_O + M_SiO2 - M_m) - M_SiO2*M_m)) + M_Mg*(M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_MgSiO3*(M_MgO - M_m) + M_SiO2*(M_MgO - M_m)) + M_SiO2*M_m*(-M_Fe - M_MgO)) + M_O*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_Si*(M_Fe*(M_MgO*(-M_SiO2 - 3.0*M_m) + M_MgSiO3*(4.0*M_MgO - M_SiO2 - 3.0*M_m) + M_O*(M_MgO + M_MgSiO3)) + M_Mg*(M_Fe*(M_O - M_SiO2 - 3.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) - 4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgO*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er))) + dKMgO_KMgO*(M_Fe*M_O*(M_MgO*(M_FeSiO3*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(M_MgO*(M_FeSiO3*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgO*(-9.0*M_FeSiO3 - M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_MgO + 2.0*M_SiO2 + 10.0*M_m))) + M_FeSiO3*M_O*(M_MgO*(-3.0*M_SiO2 - 6.0*M_m) + M_MgSiO3*(6.0*M_SiO2 - 15.0*M_m))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(M_SiO2 - M_m) + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2) - M_SiO2*M_m) + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_FeSiO3*M_O*(M_MgO*M_SiO2 + M_MgSiO3*M_m) + M_Si*(M_Fe*(M_MgO*(4.0*M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(4.0*M_MgO - M_SiO2 - 3.0*M_m) + M_O*(M_MgO + M_MgSiO3)) + M_FeSiO3*(M_MgO*(2.0*M_SiO2 + 2.0*M_m) + M_MgSiO3*(-2.0*M_SiO2 + 6.0*M_m)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*(M_Fe*M_FeSiO3*M_MgO*(4.0*M_SiO2 - 4.0*M_m) + M_Mg*(4.0*M_Fe*M_SiO2*M_m + M_FeSiO3*M_MgO*(4.0*M_SiO2 - 4.0*M_m))) + M_Si*(M_Mg*(M_Fe*(M_O*(2.0*M_SiO2 + 10.0*M_m) + M_SiO2*M_m) + M_FeSiO3*(M_MgO*(M_SiO2 - M_m) + M_O*(9.0*M_MgO + 6.0*M_SiO2 - 15.0*M_m))) + M_MgO*(M_Fe*(M_FeSiO3*(M_SiO2 - M_m) + M_O*(9.0*M_FeSiO3 + 3.0*M_SiO2 + 6.0*M_m)) + M_FeSiO3*M_O*(9.0*M_SiO2 - 9.0*M_m))) + M_c*(M_Mg*(-M_Fe*M_SiO2*M_m + M_FeSiO3*(M_MgO*(-M_SiO2 + M_m) + M_O*(-M_MgO + M_m))) + M_MgO*(M_Fe*(M_FeSiO3*(-M_SiO2 + M_m) + M_O*(-M_FeSiO3 - M_SiO2)) + M_FeSiO3*M_O*(-M_SiO2 + M_m)) + M_Si*(M_Mg*(M_Fe*(M_O - M_SiO2 - 3.0*M_m) + M_FeSiO3*(-4.0*M_MgO - 2.0*M_SiO2 + 6.0*M_m)) + M_MgO*(M_Fe*(-4.0*M_FeSiO3 - 2.0*M_SiO2 - 2.0*M_m) + M_FeSiO3*(-4.0*M_SiO2 + 4.0*M_m))))) + M_Si*(M_Fe*(M_MgO*(M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(1.0*dM_FeO_er + 1.0*dM_FeSiO3_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 15.0*dM_MgO_er - 24.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-2*dM_FeO_er - 5.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_MgSiO3*(M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_MgO*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(-2*dM_FeO_er - 5.0*dM_FeSiO3_er - 3.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er + 6.0*dM_MgO_er - 6.0*dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_O*(M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_MgSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-2*dM_FeO_er - 5.0*dM_FeSiO3_er - 2*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgO*(M_FeSiO3*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-1.0*dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_SiO2*M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_O*(M_FeSiO3*(M_MgO*(3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-9.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeO_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-25.0*dM_FeO_er - 25.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er))) + M_O*(M_MgO*(M_FeSiO3*(M_SiO2*(-9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 18.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeO_er + 9.0*dM_MgSiO3_er + 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeO_er - 9.0*dM_MgO_er + 9.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m) + 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m) + M_MgO*(-6.0*M_SiO2 + 6.0*M_m) + 6.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m) + M_MgSiO3*(-4.0*M_SiO2 + 10.0*M_m) + 6.0*M_SiO2*M_m) + M_FeSiO3*(M_MgO*(2.0*M_SiO2 + 4.0*M_m) + M_MgSiO3*(-4.0*M_SiO2 + 10.0*M_m)))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(M_SiO2 - 3.0*M_m) - 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeSiO3*(M_SiO2 - 3.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeSiO3 + M_SiO2) + M_MgSiO3*(M_FeSiO3 + M_SiO2))) + M_FeSiO3*M_O*(M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - M_m)) + M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2 - 3.0*M_m) + M_MgSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_MgO*(-M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_MgO + M_MgSiO3 + M_SiO2 - M_m)))))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 1.0*dM_FeSiO3_er) + M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeSiO3*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_O*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgO*(M_FeSiO3*(M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_O*(M_FeSiO3*(M_MgO*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_MgSiO3*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)))) + M_O*(M_MgO*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er))) + M_Si*(M_Fe*(M_MgO*(M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(dM_FeO_er + 3.0*dM_FeSiO3_er + 2*dM_MgO_er + 4.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_MgO*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 3.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er - 2.0*dM_MgO_er + 2.0*dM_SiO2_er)) + M_O*(M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_MgSiO3*(dM_MgO_er + dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_MgSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeSiO3*(M_MgO*(-2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er)) + M_O*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_MgSiO3*(-dM_FeO_er - dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgO*(M_FeSiO3*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeSiO3*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    extends MgSi, and with the default species and table gives the same equations
+    '''
+    def __init__(self, params=None, core_species=None, mantle_species=None, reactions=None):
+        '''
+        :param params: planet parameters
+        :param core_species: list of core species, default ['Mg', 'Si', 'Fe', 'O']
+        :param mantle_species: list of layer species, default ['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3']
+        :param reactions: reaction table, default MGSI_REACTION_TABLE
+        '''
+        if reactions is None:
+            reactions = MGSI_REACTION_TABLE
+        for rx in reactions:
+            if rx['K'] not in ('KD', 'fit', 'layer'):
+                raise ValueError("K of reaction {} must be 'KD', 'fit' or 'layer'".format(rx['name']))
+            if rx['K'] == 'KD' and rx['name'] not in KD_Model.species:
+                raise ValueError('no K_D fits for reaction {}'.format(rx['name']))
+            if 'gate' in rx and rx['K'] == 'layer':
+                raise ValueError('only core exchange reactions can gate a species, not {}'.format(rx['name']))
+        self.reaction_table = reactions
+        self._exchange = [rx for rx in reactions if rx['K'] != 'layer']
+        super(LightElements, self).__init__(params=params)
+        self.core = Core_MgSi(params=self.params, species=core_species)
+        self.mantle = Mantle_LightElements(params=self.params, species=mantle_species, reactions=reactions)
+        self.network = ReactionNetwork(self.core.species, self.mantle.species, [rx['stoich'] for rx in reactions])
+        self.layer_reactions = [i for i, rx in enumerate(reactions) if rx['K'] == 'layer']
+        self.species = self.network.species
+        self.Nc = self.network.Nc
+        self.index = {sp: i for i, sp in enumerate(self.species)}
+
+    def bind_KD_model(self):
+        '''bind the K_D model as MgSi, and the coefficients of the 'fit' reactions from params.reactions
+
+        :return: bound KD_Model
+        '''
+        model = super(LightElements, self).bind_KD_model()
+        pr = self.params.reactions
+        fits = []
+        for rx in self._exchange:
+            fit = {'a': np.nan, 'b': np.nan, 'c': np.nan, 'dK_dT': ()}
+            if rx['K'] == 'fit':
+                name = 'fit_KD_' + rx['name']
+                fit = {k: getattr(pr, name + '_' + k, np.nan) for k in ('a', 'b', 'c')}
+                # the coefficients in dK/dT as for a 'from_params' K_D fit of KD_Model
+                dK_dT = KD_FROM_PARAMS_DK_DT.get(rx['name'], ('b', 'c'))
+                fit['dK_dT'] = tuple(getattr(pr, name + '_dK_dT', dK_dT))
+            fits.append(fit)
+        self._fit_a = np.array([f['a'] for f in fits], dtype=float)
+        self._fit_bcP = np.array([f['b'] + f['c'] * model.P for f in fits], dtype=float)
+        self._fit_dbcP = np.array([KD_Model.dbcP(f, model.P) for f in fits], dtype=float)
+        return model
+
+    def exchange_K(self, T_cmb, X_Si=None, X_O=None):
+        '''K and dK/dT of the core exchange reactions, in the order of the reaction table
+
+        :param T_cmb: CMB temperature [K], scalar or array
+        :param X_Si: mole fraction Si in the core
+        :param X_O: mole fraction O in the core
+        :return: K, dK_dT, each of shape (Nexchange,) + shape(T_cmb)
+        '''
+        T = np.asarray(T_cmb, dtype=float)
+        K_D, dK_D = self.KD_vals(T_cmb, X_Si, X_O)
+        invT = 1. / T
+        K = []
+        dK_dT = []
+        for i, rx in enumerate(self._exchange):
+            if rx['K'] == 'KD':
+                j = KD_Model.species.index(rx['name'])
+                K.append(K_D[j])
+                dK_dT.append(dK_D[j])
+            else:
+                if np.isnan(self._fit_a[i]) or np.isnan(self._fit_bcP[i]):
+                    raise ValueError('set params.reactions.fit_KD_{0}_a, fit_KD_{0}_b and fit_KD_{0}_c'.format(
+                        rx['name']))
+                K_i = 10. ** (self._fit_a[i] + self._fit_bcP[i] * invT)
+                K.append(K_i)
+                dK_dT.append(K_i * self._fit_dbcP[i] * invT ** 2)
+        return np.array(K), np.array(dK_dT)
 
-    def dM_Fe_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_Fe given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_Fe*(M_FeSiO3*dKFeSiO3_KFeSiO3*(M_Mg*M_O*(4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-3.0*M_SiO2 - 6.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-3.0*M_SiO2 - 6.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-3.0*M_SiO2 - 6.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_c*(M_Mg*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m))) + M_O*(M_MgO*M_SiO2*(M_FeO - M_m) + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) + M_SiO2*(M_FeO - M_m))) + M_Si*(M_Mg*(M_FeO*(2.0*M_SiO2 + 2.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgO*(M_FeO*(2.0*M_SiO2 + 2.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 2.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - M_m))))) + M_Mg*(M_O*(M_FeSiO3*(M_FeO*(M_SiO2*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(M_FeO*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er))) + dKMgO_KMgO*(M_O*(M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m))) + M_Si*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO - 2.0*M_SiO2 - 10.0*M_m)) + M_MgSiO3*(M_FeO*(9.0*M_MgO - 2.0*M_SiO2 - 10.0*M_m) + M_FeSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m)))) + M_c*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*M_MgO*(-M_FeSiO3 - M_SiO2) + M_MgSiO3*(-M_FeO*M_MgO + M_FeSiO3*(-M_FeO - M_MgO + M_m))) + M_Si*(M_MgO*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO + M_SiO2 + 3.0*M_m)) + M_MgSiO3*(M_FeO*(-4.0*M_MgO + M_SiO2 + 3.0*M_m) + M_FeSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m)) + M_O*(M_MgO*(-M_FeO - M_FeSiO3) + M_MgSiO3*(-M_FeO - M_FeSiO3)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_Mg*M_O*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(-2.0*M_SiO2 - 10.0*M_m) + M_FeSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m))) + M_MgO*M_O*(M_FeO*(-3.0*M_SiO2 - 6.0*M_m) + M_FeSiO3*(6.0*M_SiO2 - 15.0*M_m))) + M_c*(M_Mg*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_O*(-M_FeO - M_MgO + M_m) + M_SiO2*M_m)) + M_MgO*M_O*(M_FeO*M_SiO2 + M_FeSiO3*M_m) + M_Si*(M_Mg*(M_FeO*(M_SiO2 + 3.0*M_m) + M_FeSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_FeO - M_FeSiO3)) + M_MgO*(M_FeO*(2.0*M_SiO2 + 2.0*M_m) + M_FeSiO3*(-2.0*M_SiO2 + 6.0*M_m))))) + M_Si*(M_Mg*(M_FeSiO3*(M_FeO*(M_SiO2*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(1.0*dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-1.0*dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_SiO2*M_m*(1.0*dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_SiO2*M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_O*(M_FeO*(M_SiO2*(3.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(6.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_MgO*(3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-6.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-15.0*dM_FeO_er + 10.0*dM_MgO_er + 25.0*dM_MgSiO3_er + 15.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(15.0*dM_FeO_er + 24.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-25.0*dM_FeO_er - 25.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_SiO2*M_m*(M_FeO*(1.0*dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er))) + M_O*(M_MgO*(M_FeO*(M_SiO2*(3.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(6.0*dM_FeSiO3_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 12.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-15.0*dM_FeO_er + 15.0*dM_MgSiO3_er + 15.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(3.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 3.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(6.0*dM_FeSiO3_er - 6.0*dM_MgO_er + 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_FeSiO3_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-15.0*dM_FeO_er - 15.0*dM_MgO_er + 15.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er))) + dKSiO2_KSiO2*(M_O*(M_Mg*(M_FeO*(M_MgSiO3*(4.0*M_SiO2 - 10.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgO*(-6.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_FeO*(M_MgSiO3*(-M_SiO2 + 3.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-M_SiO2 - M_m) + 2.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_MgSiO3 - M_SiO2) + M_FeSiO3*(M_MgO - M_m))) + M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_O*(M_MgO*(-M_FeO*M_SiO2 - M_FeSiO3*M_m) + M_MgSiO3*(-M_FeO*M_SiO2 - M_FeSiO3*M_m))))) + M_c*(M_Mg*(M_FeSiO3*(M_FeO*(M_SiO2*(dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*M_m*(-dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(1.0*dM_FeSiO3_er - dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_O*(M_FeSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er) + M_MgO*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er))) + M_SiO2*M_m*(M_FeO*(-dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + dM_FeSiO3_er))) + M_O*(M_MgO*(M_FeSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeO_er + dM_FeSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er))) + M_Si*(M_Mg*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_MgO*(-2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(2.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er - 3.0*dM_MgO_er - 9.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(-6.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er)) + M_O*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er) + M_FeSiO3*(-dM_FeO_er - dM_FeSiO3_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_MgSiO3*(-dM_FeO_er - dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgO*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2*dM_MgO_er + 4.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er + 6.0*dM_MgO_er - 6.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er))))) + dKFeO_KFeO*(M_Mg*M_O*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Si*(M_Mg*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Mg*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Mg*(M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    def unwrap_Moles(self, Moles, return_sum=True, split_coremantle=False):
+        ''' unwrap Moles to the moles of each core species followed by each layer species
+        if return_sum, the core total M_c follows the core species and the layer total M_m the layer species
 
-    def dM_FeSiO3_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_FeSiO3 given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_FeSiO3*(M_Fe*(M_O*(M_MgO*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er))) + dKFeO_KFeO*(M_Mg*M_O*(-4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(3.0*M_SiO2 + 6.0*M_m) + M_MgO*(M_SiO2 - 4.0*M_m) + M_MgSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) - 9.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(3.0*M_SiO2 + 6.0*M_m) - 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(3.0*M_SiO2 + 6.0*M_m) + M_MgO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgSiO3*(-M_FeO - M_MgO + M_m) + M_SiO2*(-M_FeO - M_MgO + M_m))) + M_O*(M_MgO*M_SiO2*(-M_FeO + M_m) + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*(-M_FeO + M_m))) + M_Si*(M_Mg*(M_FeO*(-2.0*M_SiO2 - 2.0*M_m) + M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_MgO - M_MgSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_MgO*(M_FeO*(-2.0*M_SiO2 - 2.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-2.0*M_SiO2 - 2.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + M_m)))))) + M_Mg*(M_O*(M_Fe*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgO*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er))) + dKMgO_KMgO*(M_Fe*M_O*(4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgO*(2.0*M_SiO2 + 10.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m))) + M_FeO*M_O*(M_MgO*(3.0*M_SiO2 + 6.0*M_m) + M_MgSiO3*(-6.0*M_SiO2 + 15.0*M_m))) + M_c*(M_Fe*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) - M_SiO2*M_m)) + M_FeO*M_O*(-M_MgO*M_SiO2 - M_MgSiO3*M_m) + M_Si*(M_Fe*(M_MgO*(-M_SiO2 - 3.0*M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_MgO + M_MgSiO3)) + M_FeO*(M_MgO*(-2.0*M_SiO2 - 2.0*M_m) + M_MgSiO3*(2.0*M_SiO2 - 6.0*M_m)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*(M_Fe*M_FeO*M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + M_Mg*(M_Fe*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeO*M_MgO*(-4.0*M_SiO2 + 4.0*M_m))) + M_Si*(M_Mg*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_O*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_O*(-9.0*M_MgO - 6.0*M_SiO2 + 15.0*M_m))) + M_MgO*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_O*(-9.0*M_FeO - 6.0*M_SiO2 + 15.0*M_m)) + M_FeO*M_O*(-9.0*M_SiO2 + 9.0*M_m))) + M_c*(M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) - M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) + M_O*(M_MgO - M_m))) + M_MgO*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_O*(M_FeO - M_m)) + M_FeO*M_O*(M_SiO2 - M_m)) + M_Si*(M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO + M_O + M_SiO2 - 9.0*M_m) + M_FeO*(4.0*M_MgO + 2.0*M_SiO2 - 6.0*M_m)) + M_MgO*(M_Fe*(4.0*M_FeO + 2.0*M_SiO2 - 6.0*M_m) + M_FeO*(4.0*M_SiO2 - 4.0*M_m))))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(1.0*dM_FeO_er + 1.0*dM_FeSiO3_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 12.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 15.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er - 3.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_MgO*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er + 15.0*dM_MgO_er - 15.0*dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_O*(M_FeO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgO*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_SiO2*M_m*(-dM_FeO_er - dM_FeSiO3_er)) + M_O*(M_FeO*(M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(9.0*dM_FeO_er + 18.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + dM_FeSiO3_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(15.0*dM_FeO_er + 24.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_m*(-25.0*dM_FeO_er - 25.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er))) + M_O*(M_MgO*(M_FeO*(M_SiO2*(9.0*dM_FeO_er + 18.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 18.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(9.0*dM_FeO_er + 18.0*dM_FeSiO3_er + 9.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeSiO3_er + 9.0*dM_MgO_er - 9.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er) + M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(M_FeO*(-2.0*M_SiO2 - 4.0*M_m) + 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-2.0*M_SiO2 - 4.0*M_m) + M_MgO*(-6.0*M_SiO2 + 6.0*M_m) + 6.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeO*(-2.0*M_SiO2 - 4.0*M_m) + M_MgO*(-2.0*M_SiO2 - 4.0*M_m) + 6.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-2.0*M_SiO2 - 4.0*M_m) + M_MgSiO3*(4.0*M_SiO2 - 10.0*M_m)))) + M_c*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 + M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_FeO + M_m) + M_MgSiO3*(-M_FeO + M_m))) + M_FeO*M_O*(M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + M_m)) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_MgO*(M_SiO2 + M_m) + M_O*(-M_FeO - M_MgO + M_m) - 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + 3.0*M_m) + M_O*(-M_MgO - M_MgSiO3 - M_SiO2 + M_m)))))) + M_c*(M_Fe*(M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 1.0*dM_FeSiO3_er) + M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er) + M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_O*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(1.0*dM_FeSiO3_er - dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_O*(M_FeO*(M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)))) + M_O*(M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + dM_FeSiO3_er))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er - 6.0*dM_MgO_er + 6.0*dM_SiO2_er)) + M_O*(M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_MgSiO3*(dM_MgO_er + dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_FeO*(M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(-6.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er)) + M_O*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er) + M_MgSiO3*(-dM_FeO_er - dM_FeSiO3_er) + M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgO*(M_FeO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er)) + M_MgSiO3*(M_SiO2*(-dM_FeO_er - dM_FeSiO3_er) + M_m*(dM_FeO_er + dM_FeSiO3_er))))) + dKFeSiO3_KFeSiO3*(M_O*(M_Fe*M_FeO*(-4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_MgSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_SiO2*M_m*(-4.0*M_FeO - 4.0*M_MgO)) + M_FeO*(-4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_FeO*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - 4.0*M_m) - 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(9.0*M_MgO + M_SiO2 - 4.0*M_m) + M_MgO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m))) + M_FeO*M_O*(-9.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - 4.0*M_m) + M_MgSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) - 9.0*M_SiO2*M_m) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_FeO*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_MgO*(M_SiO2 - 4.0*M_m) + M_MgSiO3*(9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) - 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_FeO*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*M_SiO2*(-M_FeO + M_m) + M_MgSiO3*(M_FeO*(-M_MgO - M_SiO2) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m))) + M_FeO*M_O*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_Mg*(M_Fe*(M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgSiO3*(-M_FeO - M_MgO + M_m) + M_SiO2*(-M_FeO - M_MgO + M_m)) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_FeO*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_MgSiO3*(-M_MgO + M_m) + M_SiO2*(-M_MgO + M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(-M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_MgO - M_SiO2 + M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_FeO - M_SiO2 + M_m) + M_MgSiO3*(-M_FeO - M_SiO2 + M_m))) + M_FeO*(4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + M_m))) + M_Mg*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_FeO - M_MgO - M_MgSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_MgSiO3*(-4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_MgO - M_MgSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+        :param Moles: list, 1D array, or 2D array (time, species)
+        :return:
+        '''
+        if type(Moles) is np.ndarray and len(Moles.shape) == 2:
+            M = [Moles[:, i] for i in range(Moles.shape[1])]
+        else:
+            M = list(Moles)
+        if len(M) != len(self.species):
+            raise ValueError('expected moles of {} species, got {}'.format(len(self.species), len(M)))
+        M_core = M[:self.Nc]
+        M_mantle = M[self.Nc:]
+        if return_sum:
+            M_core = M_core + [sum(M_core)]
+            M_mantle = M_mantle + [sum(M_mantle)]
+        if split_coremantle:
+            return M_core, M_mantle
+        return M_core + M_mantle
 
-    def dM_O_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_O given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_O*(M_Fe*dKFeO_KFeO*(M_Si*(M_Mg*(M_FeO*(M_MgSiO3*(2.0*M_SiO2 - 5.0*M_m) - 3.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_MgO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m)) + M_MgO*(-3.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_FeO*M_m*(-M_MgSiO3 - M_SiO2) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m))) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_Si*(M_Mg*(M_FeO*(-2.0*M_MgSiO3 - M_SiO2 - M_m) + M_FeSiO3*(2.0*M_MgO + M_SiO2 - 3.0*M_m)) + M_MgO*(M_FeO*(-M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m)) + M_MgSiO3*(M_FeO*(-M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 + 2.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 + 2.0*M_m) + M_MgO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + 2.0*M_m) + M_MgSiO3*(-2.0*M_SiO2 + 5.0*M_m)))) + M_c*(M_Fe*(M_MgO*M_SiO2*(M_FeO - M_m) + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) + M_SiO2*(M_FeO - M_m))) + M_Mg*(M_Fe*M_SiO2*(M_FeO + M_MgO - M_m) + M_FeO*(M_MgO*M_SiO2 + M_MgSiO3*M_m)) + M_Si*(M_Fe*(M_MgO*(2.0*M_FeO + M_SiO2 - 3.0*M_m) + M_MgSiO3*(2.0*M_FeO + M_SiO2 - 3.0*M_m)) + M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) + M_MgSiO3*(2.0*M_SiO2 - 2.0*M_m)) + M_Mg*(M_Fe*(2.0*M_FeO + 2.0*M_MgO + M_SiO2 - 3.0*M_m) + M_FeO*(2.0*M_MgO + 2.0*M_MgSiO3 + 2.0*M_SiO2 - 2.0*M_m))))) + M_Mg*dKMgO_KMgO*(M_Si*(M_Fe*(M_MgO*(M_FeSiO3*(2.0*M_SiO2 - 5.0*M_m) - 3.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 + 2.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m)) + M_MgO*(-3.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m))) + M_c*(M_Fe*(M_MgO*M_m*(-M_FeSiO3 - M_SiO2) + M_MgSiO3*(M_MgO*(M_SiO2 - M_m) + M_SiO2*(M_FeO - M_m))) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_Si*(M_Fe*(M_MgO*(-2.0*M_FeSiO3 - M_SiO2 - M_m) + M_MgSiO3*(2.0*M_FeO + M_SiO2 - 3.0*M_m)) + M_MgO*(M_FeO*(-M_SiO2 - M_m) + M_FeSiO3*(-M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - 3.0*M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_Si*(M_Fe*M_MgO*(M_FeO*(M_SiO2 + 2.0*M_m) + M_FeSiO3*(-2.0*M_SiO2 + 5.0*M_m)) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 + 2.0*M_m) + M_MgO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_MgO*(M_SiO2 + 2.0*M_m) - 3.0*M_SiO2*M_m))) + M_c*(M_Fe*M_MgO*(M_FeO*M_SiO2 + M_FeSiO3*M_m) + M_Mg*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_SiO2*(M_Fe*(M_FeO + M_MgO - M_m) + M_FeO*(M_MgO - M_m))) + M_Si*(M_Mg*(M_Fe*(2.0*M_FeO + 2.0*M_MgO + M_SiO2 - 3.0*M_m) + M_FeO*(2.0*M_MgO + M_SiO2 - 3.0*M_m) + M_FeSiO3*(2.0*M_MgO + M_SiO2 - 3.0*M_m)) + M_MgO*(M_Fe*(2.0*M_FeO + 2.0*M_FeSiO3 + 2.0*M_SiO2 - 2.0*M_m) + M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_FeSiO3*(2.0*M_SiO2 - 2.0*M_m))))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 4.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(5.0*dM_FeO_er - 5.0*dM_MgSiO3_er - 5.0*dM_SiO2_er)) + M_SiO2*M_m*(3.0*dM_FeO_er + 3.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(5.0*dM_FeO_er + 5.0*dM_MgO_er - 5.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er) + M_m*(3.0*dM_FeO_er + 3.0*dM_FeSiO3_er)) + M_SiO2*M_m*(3.0*dM_FeO_er + 3.0*dM_FeSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(5.0*dM_FeO_er + 5.0*dM_MgO_er - 5.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(5.0*dM_FeO_er + 5.0*dM_MgO_er - 5.0*dM_SiO2_er)) + M_SiO2*M_m*(3.0*dM_FeO_er + 3.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 3.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_SiO2*M_m*(3.0*dM_MgO_er + 3.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(-3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_m*(3.0*dM_MgO_er + 3.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(2.0*dM_FeO_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_SiO2*M_m*(3.0*dM_MgO_er + 3.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(-5.0*dM_FeSiO3_er + 5.0*dM_MgO_er - 5.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_MgO*(-3.0*dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 3.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(5.0*dM_FeO_er + 5.0*dM_MgO_er - 5.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_Fe*(M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_SiO2*M_m*(2.0*M_FeO + 2.0*M_MgO)) + M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(2.0*M_FeO - 3.0*M_m) + M_SiO2*(M_FeO - 2.0*M_m)) + M_MgSiO3*(M_FeO*(2.0*M_MgO + M_SiO2) + M_FeSiO3*(2.0*M_FeO + 2.0*M_MgO - 3.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeSiO3*(2.0*M_FeO + 2.0*M_MgO - 3.0*M_m) + M_MgSiO3*(2.0*M_FeO + 2.0*M_MgO - 3.0*M_m) + M_SiO2*(M_FeO + M_MgO - 2.0*M_m)) + M_FeO*M_SiO2*(M_MgO - 2.0*M_m) + M_FeSiO3*(M_FeO*(2.0*M_MgO + 2.0*M_SiO2 - 2.0*M_m) + M_SiO2*(M_MgO - 2.0*M_m)) + M_MgSiO3*(M_FeO*(2.0*M_MgO - 3.0*M_m) + M_FeSiO3*(2.0*M_FeO + 2.0*M_MgO - 3.0*M_m))) + M_MgO*(-2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m))))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(M_FeO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 1.0*dM_FeSiO3_er) + M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_MgO*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er))) + M_FeO*M_SiO2*(M_MgO*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_SiO2*(M_MgO*(-1.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(-1.0*dM_FeSiO3_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er + 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er - 2.0*dM_MgO_er + 2.0*dM_SiO2_er))) + M_Mg*(M_Fe*(M_FeO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_MgO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_MgSiO3*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeO*(M_MgO*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeSiO3*(M_MgO*(1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_SiO2*(-2.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeO_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-3.0*dM_FeO_er - 5.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_FeSiO3*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er))) + M_MgO*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-2.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeO_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeSiO3_er - 2.0*dM_MgO_er + 2.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeO_er - 2.0*dM_MgO_er + 2.0*dM_SiO2_er))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    def mole_fractions(self, Moles):
+        '''mole fraction of each species within its own phase (core or layer)
 
-    def dM_Si_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_Si given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_Si*(M_Fe*(M_O*(M_MgO*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er - 10.0*dM_MgSiO3_er - 10.0*dM_SiO2_er)) + M_SiO2*M_m*(6.0*dM_FeO_er + 6.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er + 10.0*dM_MgO_er - 10.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er) + M_m*(6.0*dM_FeO_er + 6.0*dM_FeSiO3_er)) + M_SiO2*M_m*(6.0*dM_FeO_er + 6.0*dM_FeSiO3_er))) + dKFeO_KFeO*(M_O*(M_Mg*(M_FeO*(M_MgSiO3*(4.0*M_SiO2 - 10.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgO*(-6.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_FeO*(M_MgSiO3*(-M_SiO2 + 3.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-M_SiO2 - M_m) + 2.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_MgSiO3 - M_SiO2) + M_FeSiO3*(M_MgO - M_m))) + M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_O*(M_MgO*(-M_FeO*M_SiO2 - M_FeSiO3*M_m) + M_MgSiO3*(-M_FeO*M_SiO2 - M_FeSiO3*M_m))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*(M_Fe*(M_MgO*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m) + M_FeO*(M_MgO*(2.0*M_SiO2 + 4.0*M_m) + M_MgSiO3*(-4.0*M_SiO2 + 10.0*M_m)))) + M_c*(M_Fe*(M_MgO*(M_FeO*(-M_SiO2 - M_m) + 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 - M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO - M_m) + M_MgSiO3*(M_FeO - M_m))) + M_FeO*M_O*(M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - M_m)) + M_Mg*(M_Fe*(M_FeO*(-M_SiO2 - M_m) + M_MgO*(-M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) + 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 - M_m) + M_MgSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_MgO + M_MgSiO3 + M_SiO2 - M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er + 10.0*dM_MgO_er - 10.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er + 10.0*dM_MgO_er - 10.0*dM_SiO2_er)) + M_SiO2*M_m*(6.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 6.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(6.0*dM_MgO_er + 6.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_m*(6.0*dM_MgO_er + 6.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-2.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(6.0*dM_MgO_er + 6.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-10.0*dM_FeSiO3_er + 10.0*dM_MgO_er - 10.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_MgO*(-6.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 6.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er + 10.0*dM_MgO_er - 10.0*dM_SiO2_er)))) + dKMgO_KMgO*(M_O*(M_Fe*(M_MgO*(M_FeSiO3*(4.0*M_SiO2 - 10.0*M_m) - 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgO*(-6.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(-M_SiO2 + 3.0*M_m) + 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 - M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_FeSiO3 - M_SiO2) + M_MgSiO3*(M_FeO - M_m))) + M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_O*(M_MgO*M_SiO2*(-M_FeO - M_FeSiO3) + M_MgSiO3*M_m*(-M_FeO - M_FeSiO3))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*(M_Fe*M_MgO*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m)) + M_Mg*(M_Fe*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m) + M_FeO*(M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(2.0*M_SiO2 + 4.0*M_m) - 6.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_Fe*(M_FeO*(-M_SiO2 - M_m) + M_MgO*(-M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) + 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 - M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-M_SiO2 - M_m) + 2.0*M_SiO2*M_m) + M_O*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_MgO - M_m))) + M_MgO*(M_Fe*(M_FeO*(-M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_SiO2 - M_m)) + M_O*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))) + M_c*(M_Fe*(M_MgO*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-3.0*dM_FeO_er + 3.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_SiO2*M_m*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er) + M_m*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_FeSiO3*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er) + M_FeSiO3*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)) + M_O*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_FeSiO3*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgSiO3*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(-2.0*dM_MgO_er - 2.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_m*(-2.0*dM_MgO_er - 2.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(-2.0*dM_MgO_er - 2.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(3.0*dM_FeSiO3_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_MgO*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_MgO*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_FeSiO3*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er - dM_MgO_er + dM_SiO2_er))))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+        :param Moles:
+        :return: dict of species -> mole fraction, M_c, M_m
+        '''
+        M_core, M_mantle = self.unwrap_Moles(Moles, split_coremantle=True)
+        M_c = M_core.pop()
+        M_m = M_mantle.pop()
+        X = dict(zip(self.core.species, [M / M_c for M in M_core]))
+        X.update(zip(self.mantle.species, [M / M_m for M in M_mantle]))
+        return X, M_c, M_m
+
+    def _K_of(self, rx, X):
+        '''K = prod(X_products) / X_reactant of reaction rx for mole fractions X'''
+        K = 1.
+        for sp, n in rx['stoich'].items():
+            K = K * X[sp] ** n
+        return K
 
-    def dM_c_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_c given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_c*(M_Fe*(M_O*(M_MgO*(M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(-2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er)) + M_SiO2*M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er))) + dKFeO_KFeO*(M_O*(M_Mg*(M_FeO*M_m*(-2.0*M_MgSiO3 - 2.0*M_SiO2) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_SiO2*(2.0*M_MgO - 2.0*M_m))) + M_MgO*(-2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m))) + M_Si*(M_Mg*(M_FeO*(M_MgSiO3*(M_SiO2 - 3.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_O*(M_FeO*(-3.0*M_MgSiO3 - M_SiO2 - 2.0*M_m) + M_FeSiO3*(3.0*M_MgO + 2.0*M_SiO2 - 5.0*M_m))) + M_MgO*(-2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 - 2.0*M_m) + M_FeSiO3*(2.0*M_SiO2 - 5.0*M_m)) + M_MgSiO3*(M_FeO*(-M_SiO2 - 2.0*M_m) + M_FeSiO3*(2.0*M_SiO2 - 5.0*M_m)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*(M_Fe*(M_MgO*M_SiO2*(2.0*M_FeO - 2.0*M_m) + M_MgSiO3*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) + M_SiO2*(2.0*M_FeO - 2.0*M_m))) + M_Mg*(M_Fe*M_SiO2*(2.0*M_FeO + 2.0*M_MgO - 2.0*M_m) + M_FeO*(2.0*M_MgO*M_SiO2 + 2.0*M_MgSiO3*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 + M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_O*(M_MgO*(3.0*M_FeO + 2.0*M_SiO2 - 5.0*M_m) + M_MgSiO3*(3.0*M_FeO + 2.0*M_SiO2 - 5.0*M_m))) + M_FeO*M_O*(M_MgO*(3.0*M_SiO2 - 3.0*M_m) + M_MgSiO3*(3.0*M_SiO2 - 3.0*M_m)) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_MgO*(M_SiO2 + M_m) + M_O*(3.0*M_FeO + 3.0*M_MgO + 2.0*M_SiO2 - 5.0*M_m) - 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + M_m) + M_MgSiO3*(-M_SiO2 + 3.0*M_m) + M_O*(3.0*M_MgO + 3.0*M_MgSiO3 + 3.0*M_SiO2 - 3.0*M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_MgO*(-2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er))) + M_FeO*M_SiO2*(M_MgO*(-2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(-2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_SiO2*(M_MgO*(-2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(-2.0*dM_FeSiO3_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_MgO_er - 2.0*dM_SiO2_er)))) + dKMgO_KMgO*(M_O*(M_Fe*(M_MgO*M_m*(-2.0*M_FeSiO3 - 2.0*M_SiO2) + M_MgSiO3*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) + M_SiO2*(2.0*M_FeO - 2.0*M_m))) + M_MgO*(-2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeSiO3*(M_SiO2 - 3.0*M_m) - 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 + M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_O*(M_MgO*(-3.0*M_FeSiO3 - M_SiO2 - 2.0*M_m) + M_MgSiO3*(3.0*M_FeO + 2.0*M_SiO2 - 5.0*M_m))) + M_MgO*(-2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 - 2.0*M_m) + M_FeSiO3*(-M_SiO2 - 2.0*M_m)) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 - 5.0*M_m) + M_FeSiO3*(2.0*M_SiO2 - 5.0*M_m)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*(M_Fe*M_MgO*(2.0*M_FeO*M_SiO2 + 2.0*M_FeSiO3*M_m) + M_Mg*(M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_SiO2*(2.0*M_MgO - 2.0*M_m)) + M_SiO2*(M_Fe*(2.0*M_FeO + 2.0*M_MgO - 2.0*M_m) + M_FeO*(2.0*M_MgO - 2.0*M_m)))) + M_Si*(M_Mg*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_MgO*(M_SiO2 + M_m) + M_O*(3.0*M_FeO + 3.0*M_MgO + 2.0*M_SiO2 - 5.0*M_m) - 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_O*(M_FeO*(3.0*M_MgO + 2.0*M_SiO2 - 5.0*M_m) + M_FeSiO3*(3.0*M_MgO + 2.0*M_SiO2 - 5.0*M_m))) + M_MgO*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + 3.0*M_m) + M_O*(3.0*M_FeO + 3.0*M_FeSiO3 + 3.0*M_SiO2 - 3.0*M_m)) + M_O*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_FeSiO3*(3.0*M_SiO2 - 3.0*M_m))))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + dM_SiO2_er) + M_m*(3.0*dM_FeO_er - 3.0*dM_MgSiO3_er - 3.0*dM_SiO2_er)) + M_SiO2*M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 3.0*dM_MgO_er - 3.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er) + M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er)) + M_SiO2*M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er)) + M_O*(M_MgO*(M_FeO*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_FeSiO3*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 5.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_SiO2*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 5.0*dM_FeSiO3_er + 3.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er + dM_MgO_er - 2.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_FeSiO3*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_SiO2*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 3.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 5.0*dM_FeSiO3_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 3.0*dM_MgO_er - 3.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 3.0*dM_MgO_er - 3.0*dM_SiO2_er)) + M_O*(M_FeO*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_FeSiO3*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_MgO*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_MgSiO3*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_SiO2*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 5.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_SiO2*M_m*(2.0*dM_FeO_er + 2.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(-2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er)) + M_SiO2*M_m*(2.0*dM_MgO_er + 2.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(-3.0*dM_FeSiO3_er + 3.0*dM_MgO_er - 3.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 2.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 3.0*dM_MgO_er - 3.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_SiO2*(-3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(3.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_FeSiO3*(M_MgO*(dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_SiO2*(-3.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-3.0*dM_FeO_er + 2.0*dM_MgO_er + 5.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-5.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_FeSiO3*(-2.0*dM_FeO_er - 5.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*(M_SiO2*(-3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(3.0*dM_FeSiO3_er + 3.0*dM_MgSiO3_er + 3.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-3.0*dM_FeSiO3_er - 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-3.0*dM_FeO_er + 3.0*dM_MgSiO3_er + 3.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_SiO2*(-3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 3.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(3.0*dM_FeSiO3_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-3.0*dM_FeSiO3_er - 3.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 3.0*dM_MgO_er + 3.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(3.0*M_FeO - 5.0*M_m) + M_SiO2*(M_FeO - 3.0*M_m)) + M_MgSiO3*(M_FeO*(3.0*M_MgO + M_SiO2) + M_FeSiO3*(3.0*M_FeO + 3.0*M_MgO - 5.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(3.0*M_FeO + 3.0*M_MgO - 5.0*M_m) + M_MgSiO3*(3.0*M_FeO + 3.0*M_MgO - 5.0*M_m) + M_SiO2*(M_FeO + M_MgO - 3.0*M_m)) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - 3.0*M_m) + M_FeSiO3*(M_FeO*(3.0*M_MgO + 3.0*M_SiO2 - 3.0*M_m) + M_SiO2*(M_MgO - 3.0*M_m)) + M_MgSiO3*(M_FeO*(3.0*M_MgO - 5.0*M_m) + M_FeSiO3*(3.0*M_FeO + 3.0*M_MgO - 5.0*M_m)))) + M_O*(M_MgO*(-3.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(3.0*M_SiO2 - 3.0*M_m) + M_MgO*(3.0*M_SiO2 - 3.0*M_m) - 3.0*M_SiO2*M_m))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    def dKs_dT(self, T_cmb=None, Moles=None, dTdt=None, time=None):
+        pr = self.params.reactions
+        X, M_c, M_m = self.mole_fractions(Moles)
+        K, dK_dT = self.exchange_K(T_cmb, X.get('Si'), X.get('O'))
+        dlnK_dT = iter(dK_dT / K)
+        dKs_dT = []
+        for rx in self.reaction_table:
+            if rx['K'] == 'layer':
+                K_rx = self._K_of(rx, X)
+                K_b = getattr(pr, 'K_{}_b'.format(rx['name']))
+                dKs_dT.append(self.erode_term(K_rx, K_b, time=time, d=1) / (K_rx * dTdt))
+            else:
+                dKs_dT.append(next(dlnK_dT))
+        return dKs_dT
 
-    def dM_m_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_m given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_m*(M_Fe*(M_O*(M_MgO*(M_FeO*M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)))) + dKFeO_KFeO*(M_Mg*M_O*M_SiO2*(-4.0*M_FeO*M_MgSiO3 + 4.0*M_FeSiO3*M_MgO) + M_Si*(M_Mg*(M_O*(M_FeO*(-15.0*M_MgSiO3 - 3.0*M_SiO2) + M_FeSiO3*(-9.0*M_FeO + 6.0*M_MgO + 6.0*M_SiO2)) + M_SiO2*(-M_FeO*M_MgSiO3 + M_FeSiO3*M_MgO)) + M_O*(M_MgO*(-3.0*M_FeO*M_SiO2 + M_FeSiO3*(-9.0*M_FeO + 6.0*M_SiO2)) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 3.0*M_SiO2) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO + 6.0*M_SiO2)))) + M_c*(M_Mg*(M_FeO*(M_MgSiO3*M_SiO2 + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2)) - M_FeSiO3*M_MgO*M_SiO2) + M_O*(M_FeO*M_MgO*(M_FeSiO3 + M_SiO2) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO))) + M_Si*(M_Mg*(M_FeO*(6.0*M_MgSiO3 + 2.0*M_SiO2) + M_FeSiO3*(4.0*M_FeO - 2.0*M_MgO - 2.0*M_SiO2) + M_O*(M_FeO + M_FeSiO3)) + M_MgO*(2.0*M_FeO*M_SiO2 + M_FeSiO3*(4.0*M_FeO - 2.0*M_SiO2)) + M_MgSiO3*(M_FeO*(4.0*M_MgO + 2.0*M_SiO2) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO - 2.0*M_SiO2)) + M_O*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*M_SiO2*(M_Fe*M_FeO*(4.0*M_MgO + 4.0*M_MgSiO3) + M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO) + M_FeO*(4.0*M_MgO + 4.0*M_MgSiO3))) + M_Si*(M_Fe*(M_FeO*M_SiO2*(M_MgO + M_MgSiO3) + M_O*(M_MgO*(6.0*M_FeO + 6.0*M_SiO2) + M_MgSiO3*(6.0*M_FeO - 9.0*M_MgO + 6.0*M_SiO2))) + M_FeO*M_O*M_SiO2*(9.0*M_MgO + 9.0*M_MgSiO3) + M_Mg*(M_Fe*(M_O*(6.0*M_FeO + 6.0*M_MgO + 6.0*M_SiO2) + M_SiO2*(M_FeO + M_MgO)) + M_FeO*(M_O*(6.0*M_MgO + 15.0*M_MgSiO3 + 9.0*M_SiO2) + M_SiO2*(M_MgO + M_MgSiO3)))) + M_c*(M_Fe*(-M_FeO*M_MgO*M_SiO2 + M_MgSiO3*(-M_FeO*M_SiO2 + M_MgO*M_O)) + M_FeO*M_O*M_SiO2*(-M_MgO - M_MgSiO3) + M_Mg*(M_Fe*M_SiO2*(-M_FeO - M_MgO) + M_FeO*(M_O*(-M_MgSiO3 - M_SiO2) + M_SiO2*(-M_MgO - M_MgSiO3))) + M_Si*(M_Fe*(M_MgO*(-2.0*M_FeO - 2.0*M_SiO2) + M_MgSiO3*(-2.0*M_FeO + 4.0*M_MgO - 2.0*M_SiO2) + M_O*(M_MgO + M_MgSiO3)) + M_FeO*M_SiO2*(-4.0*M_MgO - 4.0*M_MgSiO3) + M_Mg*(M_Fe*(-2.0*M_FeO - 2.0*M_MgO + M_O - 2.0*M_SiO2) + M_FeO*(-2.0*M_MgO - 6.0*M_MgSiO3 - 4.0*M_SiO2))))) + M_Mg*(M_O*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgO*(M_FeO*M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)))) + dKMgO_KMgO*(M_Fe*M_O*M_SiO2*(4.0*M_FeO*M_MgSiO3 - 4.0*M_FeSiO3*M_MgO) + M_Si*(M_Fe*(M_O*(M_MgO*(-15.0*M_FeSiO3 - 3.0*M_SiO2) + M_MgSiO3*(6.0*M_FeO - 9.0*M_MgO + 6.0*M_SiO2)) + M_SiO2*(M_FeO*M_MgSiO3 - M_FeSiO3*M_MgO)) + M_O*(M_MgO*(-3.0*M_FeO*M_SiO2 + M_FeSiO3*(-9.0*M_FeO - 3.0*M_SiO2)) + M_MgSiO3*(M_FeO*(-9.0*M_MgO + 6.0*M_SiO2) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO + 6.0*M_SiO2)))) + M_c*(M_Fe*(-M_FeO*M_MgSiO3*M_SiO2 + M_MgO*(M_FeSiO3*M_SiO2 + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2))) + M_O*(M_MgO*(M_FeO*M_SiO2 + M_FeSiO3*(M_FeO + M_SiO2)) + M_MgSiO3*(M_FeO*M_MgO + M_FeSiO3*(M_FeO + M_MgO))) + M_Si*(M_Fe*(M_MgO*(6.0*M_FeSiO3 + 2.0*M_SiO2) + M_MgSiO3*(-2.0*M_FeO + 4.0*M_MgO - 2.0*M_SiO2) + M_O*(M_MgO + M_MgSiO3)) + M_MgO*(2.0*M_FeO*M_SiO2 + M_FeSiO3*(4.0*M_FeO + 2.0*M_SiO2)) + M_MgSiO3*(M_FeO*(4.0*M_MgO - 2.0*M_SiO2) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO - 2.0*M_SiO2)) + M_O*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*M_SiO2*(M_Fe*M_MgO*(4.0*M_FeO + 4.0*M_FeSiO3) + M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO) + M_MgO*(4.0*M_FeO + 4.0*M_FeSiO3))) + M_Si*(M_Mg*(M_Fe*(M_O*(6.0*M_FeO + 6.0*M_MgO + 6.0*M_SiO2) + M_SiO2*(M_FeO + M_MgO)) + M_MgO*M_SiO2*(M_FeO + M_FeSiO3) + M_O*(M_FeO*(6.0*M_MgO + 6.0*M_SiO2) + M_FeSiO3*(-9.0*M_FeO + 6.0*M_MgO + 6.0*M_SiO2))) + M_MgO*(M_Fe*(M_O*(6.0*M_FeO + 15.0*M_FeSiO3 + 9.0*M_SiO2) + M_SiO2*(M_FeO + M_FeSiO3)) + M_O*M_SiO2*(9.0*M_FeO + 9.0*M_FeSiO3))) + M_c*(M_Mg*(M_FeSiO3*(M_FeO*M_O - M_MgO*M_SiO2) + M_SiO2*(M_Fe*(-M_FeO - M_MgO) - M_FeO*M_MgO)) + M_MgO*(M_Fe*(M_O*(-M_FeSiO3 - M_SiO2) + M_SiO2*(-M_FeO - M_FeSiO3)) + M_O*M_SiO2*(-M_FeO - M_FeSiO3)) + M_Si*(M_Mg*(M_Fe*(-2.0*M_FeO - 2.0*M_MgO + M_O - 2.0*M_SiO2) + M_FeO*(-2.0*M_MgO - 2.0*M_SiO2) + M_FeSiO3*(4.0*M_FeO - 2.0*M_MgO - 2.0*M_SiO2) + M_O*(M_FeO + M_FeSiO3)) + M_MgO*(M_Fe*(-2.0*M_FeO - 6.0*M_FeSiO3 - 4.0*M_SiO2) + M_SiO2*(-4.0*M_FeO - 4.0*M_FeSiO3))))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-1.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_O*(M_MgO*(M_FeO*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_FeSiO3*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 25.0*dM_MgO_er - 40.0*dM_MgSiO3_er - 15.0*dM_SiO2_er) + M_SiO2*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 18.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er + 2.0*dM_MgO_er - 4.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_FeSiO3*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er) + M_MgO*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_O*(M_FeO*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_FeSiO3*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er) + M_MgO*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_MgSiO3*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er) + M_SiO2*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er))) + M_MgO*(M_FeO*M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_MgO*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_SiO2*(-9.0*dM_FeO_er - 18.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er) + M_MgO*(2.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_SiO2*(-9.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-25.0*dM_FeO_er - 40.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er) + M_FeSiO3*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*M_SiO2*(-9.0*dM_FeO_er - 18.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 18.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(-9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 18.0*dM_MgSiO3_er - 9.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(-9.0*dM_FeO_er - 18.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_MgO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er - 9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_SiO2*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(2.0*M_FeO*M_SiO2 + M_FeSiO3*(6.0*M_FeO - 4.0*M_SiO2)) + M_MgSiO3*(M_FeO*(6.0*M_MgO + 2.0*M_SiO2) + M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 4.0*M_SiO2))) + M_Mg*(M_Fe*(M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 4.0*M_SiO2) + M_MgSiO3*(6.0*M_FeO + 6.0*M_MgO - 4.0*M_SiO2) + M_SiO2*(2.0*M_FeO + 2.0*M_MgO)) + M_MgO*(2.0*M_FeO*M_SiO2 + M_FeSiO3*(6.0*M_FeO + 2.0*M_SiO2)) + M_MgSiO3*(M_FeO*(6.0*M_MgO - 4.0*M_SiO2) + M_FeSiO3*(6.0*M_FeO + 6.0*M_MgO - 4.0*M_SiO2)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2 + M_FeSiO3*(-2.0*M_FeO + M_SiO2)) + M_MgSiO3*(M_FeO*(-2.0*M_MgO - M_SiO2) + M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + M_SiO2)) + M_O*(M_MgO*(M_FeSiO3 + M_SiO2) + M_MgSiO3*(M_FeSiO3 + M_SiO2))) + M_Mg*(M_Fe*(M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + M_SiO2) + M_MgSiO3*(-2.0*M_FeO - 2.0*M_MgO + M_SiO2) + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2) + M_SiO2*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2 + M_FeSiO3*(-2.0*M_FeO - M_SiO2)) + M_MgSiO3*(M_FeO*(-2.0*M_MgO + M_SiO2) + M_FeSiO3*(-2.0*M_FeO - 2.0*M_MgO + M_SiO2)) + M_O*(M_MgSiO3*(M_FeO + M_FeSiO3) + M_SiO2*(M_FeO + M_FeSiO3))) + M_O*M_SiO2*(M_MgO*(M_FeO + M_FeSiO3) + M_MgSiO3*(M_FeO + M_FeSiO3))))) + M_c*(M_Fe*(M_MgO*(M_FeO*M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er))) + M_O*(M_MgO*(M_FeSiO3*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_O*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*(M_FeO*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_MgO*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er))) + M_MgO*(M_FeO*M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_MgO*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er))) + M_O*(M_FeO*M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_O*(M_MgO*(M_FeO*M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_MgO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_FeSiO3*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_SiO2*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + 3.0*dM_FeSiO3_er - 1.0*dM_MgO_er + 1.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_FeSiO3*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_MgO*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_O*(M_MgO*(dM_MgO_er + dM_MgSiO3_er) + M_MgSiO3*(dM_MgO_er + dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_FeSiO3*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_MgO*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_MgSiO3*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_SiO2*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_FeO*(M_MgO*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_MgO*(-1.0*dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(9.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_FeSiO3*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_O*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er))) + M_MgO*(M_FeO*M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er))) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_MgO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er))) + M_O*(M_MgO*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er + dM_MgO_er + dM_MgSiO3_er))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    def unwrap_dKs_dT(self, dKs_dT):
+        ''' helper function to unwrap dK values from dKs_dT, in the order of the reaction table'''
+        return list(dKs_dT)
 
-    def dM_MgO_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_MgO given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_MgO*(M_Fe*(M_O*(M_FeO*M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)))) + dKFeO_KFeO*(M_Mg*M_O*(M_FeO*(M_MgSiO3*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(M_FeO*(M_MgSiO3*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-9.0*M_MgSiO3 - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO + 2.0*M_SiO2 + 10.0*M_m))) + M_MgSiO3*M_O*(M_FeO*(-3.0*M_SiO2 - 6.0*M_m) + M_FeSiO3*(6.0*M_SiO2 - 15.0*M_m))) + M_c*(M_Mg*(M_FeO*(M_MgSiO3*(M_SiO2 - M_m) + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*M_O*(M_FeO*M_SiO2 + M_FeSiO3*M_m) + M_Si*(M_Mg*(M_FeO*(4.0*M_MgSiO3 + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO - M_SiO2 - 3.0*M_m) + M_O*(M_FeO + M_FeSiO3)) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 2.0*M_m) + M_FeSiO3*(-2.0*M_SiO2 + 6.0*M_m)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*(M_Fe*M_FeO*M_MgSiO3*(4.0*M_SiO2 - 4.0*M_m) + M_Mg*(4.0*M_Fe*M_SiO2*M_m + M_FeO*M_MgSiO3*(4.0*M_SiO2 - 4.0*M_m))) + M_Si*(M_Mg*(M_Fe*(M_O*(2.0*M_SiO2 + 10.0*M_m) + M_SiO2*M_m) + M_FeO*(M_MgSiO3*(M_SiO2 - M_m) + M_O*(9.0*M_MgSiO3 + 3.0*M_SiO2 + 6.0*M_m))) + M_MgSiO3*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_O*(9.0*M_FeO + 6.0*M_SiO2 - 15.0*M_m)) + M_FeO*M_O*(9.0*M_SiO2 - 9.0*M_m))) + M_c*(M_Mg*(-M_Fe*M_SiO2*M_m + M_FeO*(M_MgSiO3*(-M_SiO2 + M_m) + M_O*(-M_MgSiO3 - M_SiO2))) + M_MgSiO3*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_O*(-M_FeO + M_m)) + M_FeO*M_O*(-M_SiO2 + M_m)) + M_Si*(M_Mg*(M_Fe*(M_O - M_SiO2 - 3.0*M_m) + M_FeO*(-4.0*M_MgSiO3 - 2.0*M_SiO2 - 2.0*M_m)) + M_MgSiO3*(M_Fe*(-4.0*M_FeO - 2.0*M_SiO2 + 6.0*M_m) + M_FeO*(-4.0*M_SiO2 + 4.0*M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeO*M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)))) + dKMgO_KMgO*(M_Fe*M_O*(M_FeO*(M_MgSiO3*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(M_FeO*(M_MgSiO3*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO + 4.0*M_SiO2 - 25.0*M_m) + M_MgSiO3*(9.0*M_FeO + 6.0*M_SiO2 - 15.0*M_m) - 9.0*M_SiO2*M_m)) + M_O*(-9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(6.0*M_SiO2 - 15.0*M_m) + M_FeSiO3*(6.0*M_SiO2 - 15.0*M_m)))) + M_c*(M_Fe*(M_FeO*(M_MgSiO3*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(-M_FeO + M_m) + M_MgSiO3*(-M_FeO + M_m) + M_SiO2*(-M_FeO + M_m))) + M_O*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_m*(M_FeO*M_SiO2 + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_Si*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO - M_SiO2 + 9.0*M_m) + M_MgSiO3*(-4.0*M_FeO - 2.0*M_SiO2 + 6.0*M_m) + M_O*(-M_FeO - M_FeSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + 4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-2.0*M_SiO2 + 6.0*M_m) + M_FeSiO3*(-2.0*M_SiO2 + 6.0*M_m)) + M_O*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + M_m)))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_O*(M_Fe*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Mg*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_Fe + 4.0*M_FeO))) + M_Si*(M_Fe*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_O*(2.0*M_SiO2 + 10.0*M_m) + M_SiO2*M_m) + M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(2.0*M_SiO2 + 10.0*M_m) + M_FeSiO3*(-9.0*M_FeO + 2.0*M_SiO2 + 10.0*M_m))) + M_O*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_c*(M_Fe*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m))) + M_Mg*(M_FeSiO3*(M_FeO*(M_O + M_SiO2 - M_m) - M_SiO2*M_m) + M_SiO2*M_m*(-M_Fe - M_FeO)) + M_O*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_Si*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) - 4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_Mg*(M_Fe*(M_O - M_SiO2 - 3.0*M_m) + M_FeO*(-M_SiO2 - 3.0*M_m) + M_FeSiO3*(4.0*M_FeO - M_SiO2 - 3.0*M_m) + M_O*(M_FeO + M_FeSiO3)) + M_O*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))) + M_Si*(M_Fe*(M_FeO*M_SiO2*M_m*(-dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_SiO2*M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(1.0*dM_FeSiO3_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er))) + M_O*(M_FeO*(M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-25.0*dM_MgO_er - 25.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er + 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er - 9.0*dM_MgO_er + 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_O*(M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_MgSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_SiO2*(-2*dM_FeO_er - 5.0*dM_FeSiO3_er - 2*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_FeO*M_SiO2*M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(1.0*dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_SiO2*M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(1.0*dM_FeSiO3_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-1.0*dM_FeO_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er))) + M_O*(M_FeO*(M_SiO2*(-3.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(-6.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er) + M_SiO2*(-3.0*dM_FeSiO3_er - 2*dM_MgO_er - 5.0*dM_MgSiO3_er - 3.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er - 4.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 6.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-15.0*dM_FeO_er - 24.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_FeSiO3*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 15.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)))) + M_O*(M_FeO*M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-9.0*dM_FeO_er - 18.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(9.0*dM_FeSiO3_er - 9.0*dM_MgO_er + 9.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeO_er - 9.0*dM_MgO_er + 9.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_O*(M_Fe*M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m)) + M_Mg*(M_Fe*(M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m) + M_MgSiO3*(-4.0*M_SiO2 + 10.0*M_m) + 6.0*M_SiO2*M_m) + 6.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-6.0*M_SiO2 + 6.0*M_m) + 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 10.0*M_m) + M_FeSiO3*(-4.0*M_SiO2 + 10.0*M_m)))) + M_c*(M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2 - 3.0*M_m) + M_MgSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_FeSiO3 + M_MgSiO3 + M_SiO2) - 2.0*M_SiO2*M_m) - 2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) - 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - 3.0*M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m)) + M_O*(M_MgSiO3*(M_FeO + M_FeSiO3) + M_SiO2*(M_FeO + M_FeSiO3))) + M_MgSiO3*(M_Fe*(M_FeO*(-M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - 3.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_SiO2 - M_m)) + M_O*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)))))) + M_c*(M_Fe*(M_FeO*M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er))) + M_O*(M_FeSiO3*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er) + M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)))) + M_Mg*(M_Fe*(M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_MgSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_O*(M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_MgSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_FeO*M_SiO2*M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_SiO2*M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er + dM_MgO_er - 1.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - 1.0*dM_SiO2_er))) + M_O*(M_FeO*M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgSiO3*(M_FeO*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_FeSiO3*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_O*(M_FeO*M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er) + M_m*(dM_FeO_er + dM_MgO_er - dM_SiO2_er)))) + M_Si*(M_Fe*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_O*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_FeO*M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_FeSiO3*(M_FeO*(M_SiO2*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_Mg*(M_Fe*(M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_MgSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_SiO2*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(dM_FeO_er + 3.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeO*(M_SiO2*(2*dM_FeO_er + 4.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeO_er + dM_MgO_er + 3.0*dM_MgSiO3_er + 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(6.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_FeSiO3*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 2.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_O*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er))) + M_MgSiO3*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er)) + M_FeSiO3*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_MgO_er - 4.0*dM_SiO2_er))) + M_O*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+    def dMm_b(self, Moles=None, dTdt=None, time=None):
+        '''compute the erosion term of every layer species incorporated directly into the equations
 
-    def dM_MgSiO3_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_MgSiO3 given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_MgSiO3*(M_Fe*(M_O*(M_FeO*(M_MgO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er))) + dKFeO_KFeO*(M_Mg*M_O*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Mg*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(2.0*M_SiO2 + 10.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m))) + M_MgO*M_O*(M_FeO*(3.0*M_SiO2 + 6.0*M_m) + M_FeSiO3*(-6.0*M_SiO2 + 15.0*M_m))) + M_c*(M_Mg*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) - M_SiO2*M_m)) + M_MgO*M_O*(-M_FeO*M_SiO2 - M_FeSiO3*M_m) + M_Si*(M_Mg*(M_FeO*(-M_SiO2 - 3.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3)) + M_MgO*(M_FeO*(-2.0*M_SiO2 - 2.0*M_m) + M_FeSiO3*(2.0*M_SiO2 - 6.0*M_m)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_O*(M_Fe*M_FeO*M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + M_Mg*(M_Fe*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeO*M_MgO*(-4.0*M_SiO2 + 4.0*M_m))) + M_Si*(M_Mg*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_O*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_O*(-9.0*M_MgO - 6.0*M_SiO2 + 15.0*M_m))) + M_MgO*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_O*(-9.0*M_FeO - 6.0*M_SiO2 + 15.0*M_m)) + M_FeO*M_O*(-9.0*M_SiO2 + 9.0*M_m))) + M_c*(M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) + M_O*(M_FeO + M_MgO - M_m) - M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) + M_O*(M_MgO - M_m))) + M_MgO*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_O*(M_FeO - M_m)) + M_FeO*M_O*(M_SiO2 - M_m)) + M_Si*(M_Mg*(M_Fe*(4.0*M_FeO + 4.0*M_MgO + M_O + M_SiO2 - 9.0*M_m) + M_FeO*(4.0*M_MgO + 2.0*M_SiO2 - 6.0*M_m)) + M_MgO*(M_Fe*(4.0*M_FeO + 2.0*M_SiO2 - 6.0*M_m) + M_FeO*(4.0*M_SiO2 - 4.0*M_m))))) + M_Mg*(M_O*(M_Fe*(M_FeO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(4.0*dM_FeO_er + 8.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er))) + dKMgO_KMgO*(M_Fe*M_O*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) + M_MgO*(3.0*M_SiO2 + 6.0*M_m) - 9.0*M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(3.0*M_SiO2 + 6.0*M_m) - 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(9.0*M_SiO2 - 9.0*M_m) + M_MgO*(3.0*M_SiO2 + 6.0*M_m) - 9.0*M_SiO2*M_m))) + M_c*(M_Fe*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(-M_FeO - M_MgO + M_m) + M_SiO2*(-M_FeO - M_MgO + M_m))) + M_O*(M_FeO*M_SiO2*(-M_MgO + M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*(-M_MgO + M_m))) + M_Si*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_MgO*(-2.0*M_SiO2 - 2.0*M_m) + M_O*(-M_FeO - M_FeSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-2.0*M_SiO2 - 2.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-2.0*M_SiO2 - 2.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + M_m)))))) + M_Si*(M_Fe*(M_FeO*(M_MgO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_MgO*(M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(1.0*dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_O*(M_FeO*(M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 15.0*dM_MgO_er + 24.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-25.0*dM_MgO_er - 25.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 18.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_O*(M_FeO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(4.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(-10.0*dM_FeO_er - 25.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er - 1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(dM_FeO_er + 2*dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(-1.0*dM_FeSiO3_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(1.0*dM_MgO_er + 1.0*dM_MgSiO3_er) + M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(dM_FeSiO3_er + dM_MgO_er + 2*dM_MgSiO3_er + dM_SiO2_er) + M_m*(1.0*dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-1.0*dM_MgO_er - 1.0*dM_MgSiO3_er)) + M_O*(M_FeO*(M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(6.0*dM_FeO_er + 12.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(-15.0*dM_FeSiO3_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-9.0*dM_FeO_er - 9.0*dM_FeSiO3_er) + M_MgO*(-3.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 6.0*dM_MgO_er + 15.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(6.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 10.0*dM_MgSiO3_er + 6.0*dM_SiO2_er) + M_m*(15.0*dM_FeO_er - 10.0*dM_MgO_er - 25.0*dM_MgSiO3_er - 15.0*dM_SiO2_er)))) + M_O*(M_FeO*(M_MgO*(M_SiO2*(9.0*dM_FeO_er + 18.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 18.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(-9.0*dM_FeSiO3_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 18.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_m*(9.0*dM_FeO_er - 9.0*dM_MgSiO3_er - 9.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er))) + dKSiO2_KSiO2*(M_O*(M_Fe*M_MgO*(M_FeO*(-2.0*M_SiO2 - 4.0*M_m) + M_FeSiO3*(4.0*M_SiO2 - 10.0*M_m)) + M_Mg*(M_Fe*(M_FeO*(-2.0*M_SiO2 - 4.0*M_m) + M_MgO*(-2.0*M_SiO2 - 4.0*M_m) + 6.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-2.0*M_SiO2 - 4.0*M_m) + 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-6.0*M_SiO2 + 6.0*M_m) + M_MgO*(-2.0*M_SiO2 - 4.0*M_m) + 6.0*M_SiO2*M_m))) + M_c*(M_Mg*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_MgO*(M_SiO2 + M_m) + M_O*(-M_FeO - M_MgO + M_m) - 2.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(2.0*M_SiO2 - 2.0*M_m) + M_MgO*(M_SiO2 + M_m) - 2.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_MgO + M_m) + M_FeSiO3*(-M_MgO + M_m))) + M_MgO*(M_Fe*(M_FeO*(M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + 3.0*M_m) + M_O*(-M_FeO - M_FeSiO3 - M_SiO2 + M_m)) + M_O*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + M_m)))))) + M_c*(M_Fe*(M_FeO*(M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_O*(M_FeO*(M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_O*(M_FeO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_FeO_er + 1.0*dM_FeSiO3_er + dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-dM_FeO_er - 2.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - 1.0*dM_MgSiO3_er) + M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-1.0*dM_FeSiO3_er - dM_MgO_er - 2.0*dM_MgSiO3_er - 1.0*dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + 1.0*dM_MgSiO3_er)) + M_O*(M_FeO*(M_MgO*(-dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_FeSiO3*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_MgO*(dM_FeO_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)))) + M_O*(M_FeO*(M_MgO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_FeSiO3_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + dM_MgSiO3_er + dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er))) + M_Si*(M_Fe*(M_FeO*(M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_O*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_SiO2*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 8.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(-4.0*dM_FeO_er + 4.0*dM_MgSiO3_er + 4.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_Mg*(M_Fe*(M_FeO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(3.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_FeO*(M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(6.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er) + M_MgO*(2.0*dM_FeO_er - 2.0*dM_FeSiO3_er - 2.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-2.0*dM_FeSiO3_er - dM_MgO_er - 3.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-6.0*dM_FeO_er + 3.0*dM_MgO_er + 9.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_O*(M_FeO*(dM_FeO_er + dM_FeSiO3_er) + M_FeSiO3*(dM_FeO_er + dM_FeSiO3_er))) + M_O*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er))))) + dKMgSiO3_KMgSiO3*(M_O*(M_Fe*M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_SiO2*M_m*(-4.0*M_FeO - 4.0*M_MgO)) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)))) + M_Si*(M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m) + M_MgO*(M_SiO2 - 4.0*M_m) - 9.0*M_SiO2*M_m) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(M_SiO2 - 4.0*M_m) - 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(9.0*M_MgO + 9.0*M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - 4.0*M_m) - 9.0*M_SiO2*M_m))) + M_MgO*(M_Fe*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO + 4.0*M_SiO2 - 25.0*M_m) - 9.0*M_SiO2*M_m)) + M_O*(-9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(9.0*M_SiO2 - 9.0*M_m) - 9.0*M_SiO2*M_m)))) + M_c*(M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(-M_FeO - M_MgO + M_m) + M_SiO2*(-M_FeO - M_MgO + M_m)) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(-M_MgO + M_m) + M_FeSiO3*(M_FeO*(-M_MgO - M_SiO2 + M_m) + M_SiO2*(-M_MgO + M_m)))) + M_MgO*(M_Fe*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeSiO3*(-M_FeO + M_m) + M_SiO2*(-M_FeO + M_m))) + M_O*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m))) + M_Si*(M_Mg*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + M_m) + M_O*(-M_FeO - M_FeSiO3 - M_MgO - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(-M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_MgO - 4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_MgO - M_SiO2 + M_m) + M_FeSiO3*(-M_MgO - M_SiO2 + M_m))) + M_MgO*(M_Fe*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO - M_SiO2 + 9.0*M_m) + M_O*(-M_FeO - M_FeSiO3 - M_SiO2 + M_m) + 4.0*M_SiO2*M_m) + 4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-M_SiO2 + M_m)))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+        :param Moles:
+        :param dTdt:
+        :return:
+        '''
+        pr = self.params.reactions
+        _, M_mantle = self.unwrap_Moles(Moles, return_sum=False, split_coremantle=True)
+        Mm = np.array(np.broadcast_arrays(*M_mantle), dtype=float)
+        Mm_b = np.reshape(pr.Mm_b, (-1,) + (1,) * (Mm.ndim - 1))
+        M_m = np.sum(Mm, axis=0)
+        M_m_b = np.sum(pr.Mm_b)
+        tau = self.tau(time)
+        dM_dt_b = -self.erode_term(Mm, Mm_b, tau=tau)/dTdt
 
-    def dM_Mg_dTc(self, Moles, dKs, dMi_b):
-        '''compute dM_Mg given Moles, dKDs, and dMm_b/dT'''
-        dM_MgO_er, dM_SiO2_er, dM_FeO_er, dM_MgSiO3_er, dM_FeSiO3_er = dMi_b
-        M_Mg, M_Si, M_Fe, M_O, M_c, M_MgO, M_SiO2, M_FeO, M_MgSiO3, M_FeSiO3, M_m = self.unwrap_Moles(Moles)
-        dKMgO_KMgO, dKSiO2_KSiO2, dKFeO_KFeO, dKMgSiO3_KMgSiO3, dKFeSiO3_KFeSiO3 = dKs
-        return M_Mg*(M_Fe*(M_O*(M_FeSiO3*(M_FeO*(M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(4.0*dM_FeSiO3_er + 4.0*dM_MgO_er + 8.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er)) + M_SiO2*M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-4.0*dM_FeO_er - 8.0*dM_FeSiO3_er - 4.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_m*(4.0*dM_FeSiO3_er - 4.0*dM_MgO_er + 4.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er) + M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er)) + M_SiO2*M_m*(M_FeO*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(4.0*dM_FeO_er + 4.0*dM_FeSiO3_er))) + dKFeO_KFeO*(M_O*(M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m))) + M_Si*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - 4.0*M_m) + M_FeSiO3*(9.0*M_FeO - 2.0*M_SiO2 - 10.0*M_m)) + M_MgSiO3*(M_FeO*(9.0*M_MgO - 2.0*M_SiO2 - 10.0*M_m) + M_FeSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m)))) + M_c*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*M_MgO*(-M_FeSiO3 - M_SiO2) + M_MgSiO3*(-M_FeO*M_MgO + M_FeSiO3*(-M_FeO - M_MgO + M_m))) + M_Si*(M_MgO*(M_FeO*(-M_SiO2 + M_m) + M_FeSiO3*(-4.0*M_FeO + M_SiO2 + 3.0*M_m)) + M_MgSiO3*(M_FeO*(-4.0*M_MgO + M_SiO2 + 3.0*M_m) + M_FeSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m)) + M_O*(M_MgO*(-M_FeO - M_FeSiO3) + M_MgSiO3*(-M_FeO - M_FeSiO3)))))) + M_FeSiO3*dKFeSiO3_KFeSiO3*(M_Fe*M_O*(-4.0*M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(-M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_MgO*(-2.0*M_SiO2 - 10.0*M_m) + M_MgSiO3*(9.0*M_FeO + 9.0*M_MgO + 4.0*M_SiO2 - 25.0*M_m))) + M_FeO*M_O*(M_MgO*(-3.0*M_SiO2 - 6.0*M_m) + M_MgSiO3*(6.0*M_SiO2 - 15.0*M_m))) + M_c*(M_Fe*(M_MgO*M_SiO2*M_m + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_O*(-M_FeO - M_MgO + M_m) + M_SiO2*M_m)) + M_FeO*M_O*(M_MgO*M_SiO2 + M_MgSiO3*M_m) + M_Si*(M_Fe*(M_MgO*(M_SiO2 + 3.0*M_m) + M_MgSiO3*(-4.0*M_FeO - 4.0*M_MgO - M_SiO2 + 9.0*M_m) + M_O*(-M_MgO - M_MgSiO3)) + M_FeO*(M_MgO*(2.0*M_SiO2 + 2.0*M_m) + M_MgSiO3*(-2.0*M_SiO2 + 6.0*M_m))))) + M_MgSiO3*dKMgSiO3_KMgSiO3*(M_Fe*M_O*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_Si*(M_Fe*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-3.0*M_SiO2 - 6.0*M_m) + 9.0*M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-3.0*M_SiO2 - 6.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-3.0*M_SiO2 - 6.0*M_m) + 9.0*M_SiO2*M_m))) + M_c*(M_Fe*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m))) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m))) + M_Si*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(2.0*M_SiO2 + 2.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(2.0*M_SiO2 + 2.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(2.0*M_SiO2 + 2.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))) + M_Si*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_MgO*(M_SiO2*(1.0*dM_FeSiO3_er + dM_MgO_er + 2.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(1.0*dM_FeO_er - 1.0*dM_MgSiO3_er - 1.0*dM_SiO2_er)) + M_SiO2*M_m*(-dM_MgO_er - dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgSiO3_er - dM_SiO2_er) + M_m*(1.0*dM_FeSiO3_er - 1.0*dM_MgO_er + 1.0*dM_SiO2_er)) + M_MgO*(M_SiO2*(-1.0*dM_FeO_er - 1.0*dM_FeSiO3_er) + M_m*(1.0*dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(1.0*dM_FeO_er + 1.0*dM_FeSiO3_er)) + M_O*(M_FeO*(M_SiO2*(dM_MgO_er + dM_MgSiO3_er) + M_m*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_MgO*(6.0*dM_FeO_er + 15.0*dM_FeSiO3_er + 15.0*dM_MgO_er + 24.0*dM_MgSiO3_er + 9.0*dM_SiO2_er) + M_SiO2*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er) + M_m*(-25.0*dM_MgO_er - 25.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(2*dM_FeO_er + 5.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(4.0*dM_FeO_er + 10.0*dM_FeSiO3_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(-6.0*dM_FeO_er - 15.0*dM_FeSiO3_er + 3.0*dM_MgO_er - 6.0*dM_MgSiO3_er - 9.0*dM_SiO2_er) + M_MgO*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_FeO_er - 10.0*dM_FeSiO3_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(10.0*dM_FeO_er + 25.0*dM_FeSiO3_er - 15.0*dM_MgO_er + 15.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_SiO2*M_m*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_MgO*(1.0*dM_FeO_er + 1.0*dM_FeSiO3_er))) + M_O*(M_FeO*(M_MgO*(M_SiO2*(3.0*dM_FeO_er + 6.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(6.0*dM_FeSiO3_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(3.0*dM_FeSiO3_er + 3.0*dM_MgO_er + 6.0*dM_MgSiO3_er + 3.0*dM_SiO2_er) + M_m*(-6.0*dM_FeO_er + 6.0*dM_MgSiO3_er + 6.0*dM_SiO2_er)) + M_SiO2*M_m*(-9.0*dM_MgO_er - 9.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_FeO_er - 12.0*dM_FeSiO3_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(15.0*dM_FeSiO3_er - 15.0*dM_MgO_er + 15.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_MgO*(9.0*dM_FeO_er + 9.0*dM_FeSiO3_er + 9.0*dM_MgO_er + 9.0*dM_MgSiO3_er) + M_SiO2*(-6.0*dM_FeSiO3_er - 6.0*dM_MgSiO3_er - 6.0*dM_SiO2_er) + M_m*(-15.0*dM_FeO_er - 15.0*dM_MgO_er + 15.0*dM_SiO2_er)))) + dKSiO2_KSiO2*(M_O*(M_Fe*(M_MgO*(M_FeSiO3*(4.0*M_SiO2 - 10.0*M_m) - 6.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(2.0*M_SiO2 + 4.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgO*(-6.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(6.0*M_SiO2 - 6.0*M_m) + M_MgO*(6.0*M_SiO2 - 6.0*M_m) - 6.0*M_SiO2*M_m))) + M_c*(M_Fe*(M_MgO*(M_FeSiO3*(-M_SiO2 + 3.0*M_m) + 2.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 - M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_O*(M_MgO*(-M_FeSiO3 - M_SiO2) + M_MgSiO3*(M_FeO - M_m))) + M_MgO*(2.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-2.0*M_SiO2 + 2.0*M_m) + M_MgO*(-2.0*M_SiO2 + 2.0*M_m) + 2.0*M_SiO2*M_m)) + M_O*(M_MgO*M_SiO2*(-M_FeO - M_FeSiO3) + M_MgSiO3*M_m*(-M_FeO - M_FeSiO3))))) + M_c*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(-dM_FeO_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er)) + M_SiO2*M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_SiO2*(dM_FeO_er + 2.0*dM_FeSiO3_er + 1.0*dM_MgSiO3_er + 1.0*dM_SiO2_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_MgO*(M_SiO2*(dM_FeO_er + 1.0*dM_FeSiO3_er) + M_m*(-dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_SiO2*M_m*(-dM_FeO_er - 1.0*dM_FeSiO3_er)) + M_O*(M_FeSiO3*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(dM_FeSiO3_er - dM_MgO_er + dM_SiO2_er) + M_MgO*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_SiO2*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_MgO_er + dM_MgSiO3_er))) + M_SiO2*M_m*(M_FeO*(dM_MgO_er + dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - 1.0*dM_FeSiO3_er))) + M_O*(M_FeO*M_SiO2*(M_MgO*(-dM_FeO_er - 2*dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*(M_MgO*(-dM_FeSiO3_er - dM_MgO_er - 2*dM_MgSiO3_er - dM_SiO2_er) + M_m*(dM_MgO_er + dM_MgSiO3_er))) + M_MgSiO3*(M_FeO*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_m*(-dM_FeSiO3_er + dM_MgO_er - dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_FeO_er + dM_MgO_er - dM_SiO2_er)))) + M_Si*(M_Fe*(M_FeO*(M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-2.0*dM_FeO_er - 6.0*dM_FeSiO3_er - 6.0*dM_MgO_er - 10.0*dM_MgSiO3_er - 4.0*dM_SiO2_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(9.0*dM_MgO_er + 9.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-dM_FeO_er - 3.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_MgSiO3*(M_FeO*(2.0*dM_FeO_er + 6.0*dM_FeSiO3_er - 2.0*dM_MgO_er + 2.0*dM_MgSiO3_er + 4.0*dM_SiO2_er) + M_MgO*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(dM_FeO_er + 3.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(-3.0*dM_FeO_er - 9.0*dM_FeSiO3_er + 6.0*dM_MgO_er - 6.0*dM_SiO2_er)) + M_O*(M_FeO*(-dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_MgO_er - dM_MgSiO3_er) + M_MgO*(-dM_MgO_er - dM_MgSiO3_er) + M_MgSiO3*(-dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_FeO*(M_MgO*(M_SiO2*(-2*dM_FeO_er - 4.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(-2.0*dM_FeSiO3_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_FeSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(-4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_MgO*(M_SiO2*(-2.0*dM_FeSiO3_er - 2*dM_MgO_er - 4.0*dM_MgSiO3_er - 2.0*dM_SiO2_er) + M_m*(2.0*dM_FeO_er - 2.0*dM_MgSiO3_er - 2.0*dM_SiO2_er)) + M_SiO2*M_m*(4.0*dM_MgO_er + 4.0*dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(2*dM_FeO_er + 4.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(-6.0*dM_FeSiO3_er + 6.0*dM_MgO_er - 6.0*dM_SiO2_er)) + M_FeSiO3*(M_FeO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_MgO*(-4.0*dM_FeO_er - 4.0*dM_FeSiO3_er - 4.0*dM_MgO_er - 4.0*dM_MgSiO3_er) + M_SiO2*(2.0*dM_FeSiO3_er + 2.0*dM_MgSiO3_er + 2.0*dM_SiO2_er) + M_m*(6.0*dM_FeO_er + 6.0*dM_MgO_er - 6.0*dM_SiO2_er))) + M_O*(M_FeO*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_FeSiO3*(M_MgO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_SiO2*(-dM_MgO_er - dM_MgSiO3_er) + M_m*(dM_MgO_er + dM_MgSiO3_er)) + M_MgSiO3*(M_FeO*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er) + M_FeSiO3*(-dM_FeO_er - dM_FeSiO3_er - dM_MgO_er - dM_MgSiO3_er))))) + dKMgO_KMgO*(M_Fe*M_O*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)))))))/(M_O*(M_Fe*(M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_SiO2*M_m*(4.0*M_FeO + 4.0*M_MgO)) + M_MgO*(4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-4.0*M_SiO2 + 4.0*M_m) + M_MgO*(-4.0*M_SiO2 + 4.0*M_m) + 4.0*M_SiO2*M_m)))) + M_Si*(M_Fe*(M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_O*(M_FeO*(-M_SiO2 + 4.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + M_MgSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + 9.0*M_SiO2*M_m) + M_SiO2*M_m*(M_FeO + M_MgO)) + M_MgO*(M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-M_SiO2 + M_m) + M_MgO*(-M_SiO2 + M_m) + M_SiO2*M_m)) + M_O*(M_FeO*(M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_MgO - 9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-M_SiO2 + 4.0*M_m) + 9.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(-9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m) + M_FeSiO3*(-9.0*M_FeO - 9.0*M_MgO - 4.0*M_SiO2 + 25.0*M_m)))) + M_O*(M_MgO*(9.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(-9.0*M_SiO2 + 9.0*M_m) + M_MgO*(-9.0*M_SiO2 + 9.0*M_m) + 9.0*M_SiO2*M_m)))) + M_c*(M_Fe*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_MgO*(M_FeSiO3*(M_FeO - M_m) + M_SiO2*(M_FeO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO + M_SiO2) + M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Mg*(M_Fe*(M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_O*(M_FeSiO3*(M_FeO + M_MgO - M_m) + M_MgSiO3*(M_FeO + M_MgO - M_m) + M_SiO2*(M_FeO + M_MgO - M_m)) + M_SiO2*M_m*(-M_FeO - M_MgO)) + M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_O*(M_FeO*M_SiO2*(M_MgO - M_m) + M_FeSiO3*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_SiO2*(M_MgO - M_m)) + M_MgSiO3*(M_FeO*(M_MgO - M_m) + M_FeSiO3*(M_FeO + M_MgO - M_m)))) + M_O*(M_MgO*(-M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) - M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m) + M_FeSiO3*(M_FeO*(M_SiO2 - M_m) + M_MgO*(M_SiO2 - M_m) - M_SiO2*M_m))) + M_Si*(M_Fe*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + M_SiO2 - 9.0*M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_O*(M_MgO*(M_FeO + M_FeSiO3 + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3 + M_SiO2 - M_m))) + M_Mg*(M_Fe*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_MgO*(M_SiO2 - M_m) + M_MgSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_O*(M_FeO + M_FeSiO3 + M_MgO + M_MgSiO3 + M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeO*(M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_MgO + 4.0*M_SiO2 - 4.0*M_m) + M_MgO*(M_SiO2 - M_m) - 4.0*M_SiO2*M_m) + M_MgSiO3*(M_FeO*(4.0*M_MgO + M_SiO2 - 9.0*M_m) + M_FeSiO3*(4.0*M_FeO + 4.0*M_MgO + M_SiO2 - 9.0*M_m)) + M_O*(M_FeO*(M_MgO + M_SiO2 - M_m) + M_FeSiO3*(M_MgO + M_SiO2 - M_m) + M_MgSiO3*(M_FeO + M_FeSiO3))) + M_MgO*(-4.0*M_FeO*M_SiO2*M_m + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_MgSiO3*(M_FeO*(M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m) + M_FeSiO3*(M_FeO*(4.0*M_SiO2 - 4.0*M_m) + M_MgO*(4.0*M_SiO2 - 4.0*M_m) - 4.0*M_SiO2*M_m)) + M_O*(M_MgO*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m)) + M_MgSiO3*(M_FeO*(M_SiO2 - M_m) + M_FeSiO3*(M_SiO2 - M_m))))))
+        # mantle visibility correction
+        tau_m = self.tau(time)/100
+        dM_dt_b += -self.erode_term(M_m, M_m_b, tau=tau_m)/dTdt*Mm/M_m
+        return list(dM_dt_b)
+
+    def dMoles_dT(self, Moles=None, T_cmb=None, dKs_dT=None, dTdt=None, dMi_b=None, time=None):
+        '''calcluate the change in Moles vs temperature T for each species in the core and mantle layer
+
+        :param Moles:
+        :param T_cmb:
+        :param dKs_dT:
+        :return:
+        '''
+        if dKs_dT is None:
+            dKs_dT = self.dKs_dT(Moles=Moles, T_cmb=T_cmb, dTdt=dTdt, time=time)
+        if dMi_b is None:
+            dMi_b = self.dMm_b(Moles=Moles, dTdt=dTdt, time=time)
+        if np.any(np.asarray(dTdt) > 0.):
+            raise AssertionError("dTdt should not be >0., something is wrong.")
+
+        dM_dT = self.network.dMoles_dT(np.asarray(Moles, dtype=float),
+                                       np.stack(np.broadcast_arrays(*dKs_dT), axis=-1),
+                                       np.stack(np.broadcast_arrays(*dMi_b), axis=-1))
+        dM_dT = list(np.moveaxis(dM_dT, -1, 0))
+
+        # Don't let the gated species go into the core, or exsolve unless they are near their equilibrium values
+        M = self.unwrap_Moles(Moles, return_sum=False)
+        M_eq = self.compute_Moles_eq(Moles=Moles, T_cmb=T_cmb)
+        epsilon = 1e-1
+        near = 1-epsilon
+        A = 1e3
+        d = 0.5
+        for rx, M_s_eq in zip([rx for rx in self._exchange if 'gate' in rx], M_eq):
+            i = self.index[rx['gate']]
+            dM_s = self.logit(dM_dT[i])*dM_dT[i]
+            dM_dT[i] = self.logit((M[i]-M_s_eq*near)/np.abs(M_s_eq)*A)*np.abs((M[i]-M_s_eq)/np.abs(M_s_eq)+1)**d*dM_s
+        return dM_dT
+
+    def compute_Moles_eq(self, Moles=None, T_cmb=None):
+        '''moles of each gated core species in equilibrium with the current layer, in the order of the table
+
+        :param Moles:
+        :param T_cmb:
+        :return: list of M_eq
+        '''
+        X, M_c, M_m = self.mole_fractions(Moles)
+        K, _ = self.exchange_K(T_cmb, X.get('Si'), X.get('O'))
+        M_eq = []
+        for rx, K_rx in zip(self._exchange, K):
+            if 'gate' in rx:
+                s = rx['gate']
+                n_s = rx['stoich'][s]
+                rest = K_rx / self._K_of(rx, X) * X[s] ** n_s
+                M_eq.append(rest ** (1. / n_s) * M_c)
+        return M_eq
+
+    def compute_Moles_0(self, X_Mg, X_Si, X_O, T_cmb, X_extra=None):
+        '''computes all moles given inital core state and mantle layer in equilibrium. Fe makes up the rest of the
+        core, exchange species in the layer are in equilibrium with the core, and the rest of the layer is split
+        among the species formed in the layer in proportion to their first product, e.g. MgSiO3 : FeSiO3 = MgO : FeO
+
+        :param X_Mg:
+        :param X_Si:
+        :param X_O:
+        :param T_cmb:
+        :param X_extra: dict of core species -> mole fraction for the core species other than Mg, Si, Fe, O
+        :return: Moles
+        '''
+        pr = self.params.reactions
+        X = {'Mg': X_Mg, 'Si': X_Si, 'O': X_O}
+        if X_extra is not None:
+            X.update(X_extra)
+        X['Fe'] = 1 - sum(X.get(sp, 0.) for sp in self.core.species if sp != 'Fe')
+        X_c = np.array([X.get(sp, 0.) for sp in self.core.species])
+        # citations are set on params.reactions before the initial state is computed, so bind them here
+        self.bind_KD_model()
+        K, _ = self.exchange_K(T_cmb, X_Si, X_O)
+        for rx, K_rx in zip(self._exchange, K):
+            r = [sp for sp, n in rx['stoich'].items() if n < 0][0]
+            products = np.prod([X[sp] ** n for sp, n in rx['stoich'].items() if n > 0])
+            X[r] = (products / K_rx) ** (-1. / rx['stoich'][r])
+        layer = []
+        for rx in self.reaction_table:
+            if rx['K'] == 'layer':
+                r = [sp for sp, n in rx['stoich'].items() if n < 0][0]
+                p = [sp for sp, n in rx['stoich'].items() if n > 0][0]
+                layer.append((r, p))
+        missing = [sp for sp in self.mantle.species if sp not in X and sp not in dict(layer)]
+        if missing:
+            raise ValueError('layer species {} are not formed by any reaction'.format(missing))
+        X_rest = 1 - sum(X[sp] for sp in self.mantle.species if sp in X)
+        w_tot = sum(X[p] for r, p in layer)
+        for r, p in layer:
+            X[r] = X_rest * X[p] / w_tot
+        X_m = np.array([X[sp] for sp in self.mantle.species])
+        M_m = self.mantle.X2M(X_m, wt_tot=pr.mass_l_0)
+        M_c = self.core.X2M(X_c, wt_tot=pr.mass_c_0)
+        Moles = list(M_c) + list(M_m)
+        if np.min(Moles) < 0.:
+            raise ValueError("initial core composition invalid, no mantle equilibrium composition possible.")
+        return Moles
+
+    def dMoles_dt(self, Moles=None, T_cmb=None, dTc_dt=None, dKs_dT=None, dMoles_dT=None, time=None):
+        '''calculate the change in Moles vs time (t) for each species in the core and mantle layer
+
+        :param Moles:
+        :param T_cmb:
+        :param dTc_dt:
+        :return:
+        '''
+        if dMoles_dT is None:
+            dMoles_dT = self.dMoles_dT(Moles=Moles, T_cmb=T_cmb, dKs_dT=dKs_dT, dTdt=dTc_dt, time=time)
+        return [dM_dT*dTc_dt for dM_dT in dMoles_dT]
+
+    def _C_exsolved(self, species, oxide, dMoles, Moles):
+        '''wt % of oxide exsolved from the core per K given dM and M, 0 if species is not in the core'''
+        if species not in self.index:
+            return 0.
+        M_c = self.unwrap_Moles(Moles, return_sum=False, split_coremantle=True)[0]
+        return -self.core.get_molmass(oxide)*dMoles[self.index[species]]/np.sum(self.core.M2wt(np.array(M_c)))
+
+    def C_m(self, dMoles, Moles):
+        return self._C_exsolved('Mg', 'MgO', dMoles, Moles)
+
+    def C_s(self, dMoles, Moles):
+        return self._C_exsolved('Si', 'SiO2', dMoles, Moles)
+
+    def C_f(self, dMoles, Moles):
+        return min(0, self._C_exsolved('Fe', 'FeO', dMoles, Moles))
@@ -0,0 +1,339 @@
+'''
+Run records: a flat, versioned file of a run, in place of the dill pickled (planet, times, solution). A record is a
+numpy .npz of the output arrays 'times' and 'solution' and a json 'record' of
+
+    version       RECORD_VERSION
+    planet_class  name of the planet class in mg_si.planet
+    run_params    arguments of setup, if the planet was set up with it
+    params        snapshot of the Parameters tree of the planet, flattened to 'group.name' keys
+    arrays        keys of params that were numpy arrays
+    x0            initial state
+    solver        integration settings, e.g. scaled, tol, method
+    stats         solver statistics, SOLVER_STATS, e.g. nfe, nje, nst, switches, wall_time
+    storage       settings of the StoragePolicy the arrays were stored with, None for full float64 arrays
+
+Only plain values are kept, so records do not depend on the layout of the classes. Records of an older version are
+upgraded by RECORD_UPGRADES as they are read.
+'''
+import json
+import lzma
+import os
+import zlib
+import numpy as np
+import scipy.interpolate as interpolate
+from mg_si.base import Parameters
+
+RECORD_VERSION = 2
+
+# functions upgrading a record dict of each older version to the next version
+RECORD_UPGRADES = {1: lambda record: dict(record, version=2, storage=None)}
+
+def flatten_params(params, prefix=''):
+    '''flatten a Parameters tree to json values
+
+    :param params: Parameters
+    :param prefix: prefix of the keys
+    :return: dict of 'group.name' -> value, list of the keys of numpy arrays
+    '''
+    flat = {}
+    arrays = []
+    for name, value in vars(params).items():
+        key = prefix + name
+        if isinstance(value, Parameters):
+            sub, sub_arrays = flatten_params(value, key + '.')
+            flat.update(sub)
+            arrays += sub_arrays
+        elif isinstance(value, np.ndarray):
+            flat[key] = value.tolist()
+            arrays.append(key)
+        elif isinstance(value, (list, tuple)):
+            flat[key] = [v.item() if isinstance(v, np.generic) else v for v in value]
+        elif isinstance(value, np.generic):
+            flat[key] = value.item()
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            flat[key] = value
+    return flat, arrays
+
+def unflatten_params(flat, params, arrays=()):
+    '''set flattened values on a Parameters tree, adding any groups it lacks
+
+    :param flat: dict of 'group.name' -> value
+    :param params: Parameters
+    :param arrays: keys to set as numpy arrays
+    '''
+    for key, value in flat.items():
+        names = key.split('.')
+        group = params
+        for name in names[:-1]:
+            if not isinstance(getattr(group, name, None), Parameters):
+                setattr(group, name, Parameters(name))
+            group = getattr(group, name)
+        setattr(group, names[-1], np.array(value) if key in arrays else value)
+
+# solver statistics of a run: RHS evaluations, Jacobian evaluations, accepted steps, output intervals over which
+# LSODA switched between its non-stiff (Adams) and stiff (BDF) methods, fraction of output intervals ending on the
+# stiff method, last successful step size [s], rejected steps where the integrator reports them and wall time [s]
+SOLVER_STATS = ('nfe', 'nje', 'nst', 'switches', 'stiff_fraction', 'hu', 'nrejected', 'wall_time')
+
+# odeint info entries given at each output time
+ODEINT_HISTORIES = ('hu', 'tcur', 'tolsf', 'tsw', 'nst', 'nfe', 'nje', 'nqu', 'mused')
+
+def info_length(info):
+    '''number of output times an odeint info dict holds the solver history of: all of them for an integration that
+    succeeded, and those before the failing one for one that failed, after which odeint leaves the arrays unset
+
+    :param info: odeint info dict (full_output)
+    :return: number of output times, or None if info has no history
+    '''
+    if 'mused' not in info or 'nst' not in info:
+        return None
+    mused = np.asarray(info['mused']).ravel()
+    nst = np.asarray(info['nst']).ravel()
+    valid = np.isin(mused, (1, 2)) & (nst > 0) & (nst >= np.concatenate([[0], nst[:-1]]))
+    return len(valid) if np.all(valid) else int(np.argmin(valid))
+
+def solver_stats(info):
+    '''solver statistics of a run. odeint only reports the time of the last method switch at each output time, so
+    switches counts the output intervals in which LSODA switched, at least once, rather than every switch. odeint
+    does not report rejected steps, nor the work of the output interval an integration failed in.
+
+    :param info: odeint info dict (full_output), the info of a planet.Solution or of Custom._integrate_split
+    :return: dict of the SOLVER_STATS in info
+    '''
+    n = info_length(info)
+    if n is not None:
+        info = {key: value[:n] if key in ODEINT_HISTORIES else value for key, value in info.items()}
+    stats = {key: int(np.asarray(info[key]).ravel()[-1]) for key in ('nfe', 'nje', 'nst', 'nrejected')
+             if key in info and np.size(info[key])}
+    if 'nfe' not in info and 'nfe_thermal' in info:
+        stats['nfe'] = int(info['nfe_thermal'] + info['nfe_chemistry'])
+    if 'tsw' in info and 'mused' in info and len(np.ravel(info['mused'])):
+        tsw = np.asarray(info['tsw'], dtype=float).ravel()
+        stiff = np.asarray(info['mused']).ravel() == 2
+        # LSODA starts on the non-stiff method, so a first interval ending on the stiff one switched
+        stats['switches'] = int(stiff[0]) + int(np.count_nonzero(np.diff(tsw)))
+        stats['stiff_fraction'] = float(np.mean(stiff))
+    if 'hu' in info and len(np.ravel(info['hu'])):
+        stats['hu'] = float(np.asarray(info['hu']).ravel()[-1])
+    return stats
+
+def write_record(filename, record, times, solution, compress=False, policy=None):
+    '''write a record, replacing any previous file only once it is complete
+
+    :param filename: record file, .npz
+    :param record: dict of json values
+    :param times: output times
+    :param solution: solution array, or a planet.Solution if policy stores the solver steps
+    :param compress: compress the file, which saves little on full float64 solution arrays for a much slower write
+    :param policy: StoragePolicy to store the arrays with, full float64 arrays if None
+    '''
+    if policy is None:
+        record = dict(record, storage=None)
+        arrays = {'times': np.asarray(times), 'solution': np.asarray(solution)}
+    else:
+        record = dict(record, storage=policy.settings())
+        arrays = policy.encode(times, solution)
+    tmp = filename + '.tmp'
+    save = np.savez_compressed if compress else np.savez
+    with open(tmp, 'wb') as f:
+        save(f, record=json.dumps(record), **arrays)
+    os.replace(tmp, filename)
+
+def read_record(filename):
+    '''read a record, upgrading it to RECORD_VERSION
+
+    :param filename: record file
+    :return: record dict, times, solution. Solutions stored with a StoragePolicy are reconstructed at the times
+        they were stored at.
+    '''
+    with np.load(filename) as data:
+        record = json.loads(str(data['record']))
+        arrays = {name: data[name] for name in data.files if name != 'record'}
+    while record['version'] < RECORD_VERSION:
+        record = RECORD_UPGRADES[record['version']](record)
+    if record['version'] > RECORD_VERSION:
+        raise ValueError('{} is a record of version {}, newer than {}'.format(filename, record['version'],
+                                                                           RECORD_VERSION))
+    if record['storage'] is None:
+        return record, arrays['times'], arrays['solution']
+    times, solution = StoragePolicy(**record['storage']).decode(arrays)
+    return record, times, solution
+
+def round_mantissa(x, rtol):
+    '''round float64 values to the fewest mantissa bits keeping a relative precision, leaving the dropped bits zero
+    so that they compress away
+
+    :param x: array
+    :param rtol: relative precision kept
+    :return: rounded float64 array, within rtol/2 of x
+    '''
+    drop = 52 - int(np.ceil(-np.log2(rtol)))
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if drop <= 0:
+        return x
+    bits = x.view(np.uint64)
+    half = np.uint64(1) << np.uint64(drop - 1)
+    mask = ~((np.uint64(1) << np.uint64(drop)) - np.uint64(1))
+    return ((bits + half) & mask).view(np.float64)
+
+def _codec(name):
+    '''compress and decompress functions of a codec, zstd and blosc from their optional packages'''
+    if name == 'zlib':
+        return lambda b: zlib.compress(b, 6), zlib.decompress
+    elif name == 'lzma':
+        return lzma.compress, lzma.decompress
+    elif name == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("compression='zstd' needs the zstandard package")
+        return zstandard.ZstdCompressor(level=9).compress, zstandard.ZstdDecompressor().decompress
+    elif name == 'blosc':
+        try:
+            import blosc
+        except ImportError:
+            raise ImportError("compression='blosc' needs the blosc package")
+        return (lambda b: blosc.compress(b, typesize=8, cname='zstd', shuffle=blosc.NOSHUFFLE)), blosc.decompress
+    raise ValueError('unknown compression {}'.format(name))
+
+class StoragePolicy():
+    def __init__(self, N_times=None, steps=False, thermal_dtype='float64', mole_rtol=None, compression=None,
+                 chunk_rows=4096):
+        '''
+        how the solution of a run is stored: which times, at what precision and with what compression. The stored
+        solution is reconstructed at the stored times, and, by reconstruct, at any others with monotone cubic
+        interpolation.
+
+        :param N_times: keep N_times evenly spaced times, interpolated from the solution, rather than all times
+        :param steps: keep the accepted solver steps of a planet.Solution rather than all times
+        :param thermal_dtype: dtype of the temperatures, e.g. 'float32'
+        :param mole_rtol: relative precision of the moles, rounded with round_mantissa, all bits kept if None
+        :param compression: None, 'zlib', 'lzma', 'zstd' or 'blosc', applied to byte-shuffled chunks of rows
+        :param chunk_rows: rows of each compressed chunk
+        '''
+        if N_times is not None and steps:
+            raise ValueError('N_times and steps cannot both be used')
+        self.N_times = N_times
+        self.steps = steps
+        self.thermal_dtype = thermal_dtype
+        self.mole_rtol = mole_rtol
+        self.compression = compression
+        self.chunk_rows = chunk_rows
+
+    def settings(self):
+        '''json settings of the policy, as stored in records'''
+        return {'N_times': self.N_times, 'steps': self.steps, 'thermal_dtype': self.thermal_dtype,
+                'mole_rtol': self.mole_rtol, 'compression': self.compression, 'chunk_rows': self.chunk_rows}
+
+    def sample(self, times, solution):
+        '''the times and states kept
+
+        :param times: output times
+        :param solution: solution array at times, or a planet.Solution
+        :return: times, states
+        '''
+        if self.steps:
+            if not hasattr(solution, 't'):
+                raise ValueError('storing the solver steps needs a planet.Solution from integrate(dense=True)')
+            return solution.t, solution.x
+        if hasattr(solution, 'array'):
+            solution = solution.array(times)
+        times = np.asarray(times, dtype=float)
+        solution = np.asarray(solution, dtype=float)
+        if self.N_times is None or self.N_times >= len(times):
+            return times, solution
+        kept = np.linspace(times[0], times[-1], self.N_times)
+        return kept, interpolate.PchipInterpolator(times, solution, axis=0)(kept)
+
+    def _pack(self, x):
+        '''byte-shuffled, compressed chunks of an array: the bytes of a chunk of rows grouped by their position in
+        each value, so the exponent and leading mantissa bytes lie together'''
+        compress, _ = _codec(self.compression)
+        chunks = []
+        for i in range(0, len(x), self.chunk_rows):
+            chunk = np.ascontiguousarray(x[i:i+self.chunk_rows])
+            chunks.append(compress(chunk.view(np.uint8).reshape(-1, chunk.dtype.itemsize).T.tobytes()))
+        return np.frombuffer(b''.join(chunks), dtype=np.uint8), np.cumsum([0] + [len(c) for c in chunks])
+
+    def _unpack(self, data, offsets, dtype, shape):
+        _, decompress = _codec(self.compression)
+        dtype = np.dtype(dtype)
+        rows = []
+        for i in range(len(offsets) - 1):
+            raw = np.frombuffer(decompress(data[offsets[i]:offsets[i+1]].tobytes()), dtype=np.uint8)
+            rows.append(raw.reshape(dtype.itemsize, -1).T.copy().view(dtype).reshape((-1,) + tuple(shape[1:])))
+        return np.concatenate(rows) if rows else np.empty(shape, dtype=dtype)
+
+    def encode(self, times, solution):
+        '''arrays to store
+
+        :param times: output times
+        :param solution: solution array at times, or a planet.Solution
+        :return: dict of arrays
+        '''
+        times, solution = self.sample(times, solution)
+        parts = {'times': times, 'thermal': solution[:, :2].astype(self.thermal_dtype),
+                 'moles': solution[:, 2:] if self.mole_rtol is None else round_mantissa(solution[:, 2:],
+                                                                                        self.mole_rtol)}
+        if self.compression is None:
+            return parts
+        arrays = {}
+        for name, x in parts.items():
+            arrays[name], arrays[name + '_offsets'] = self._pack(x)
+            arrays[name + '_shape'] = np.array(x.shape)
+            arrays[name + '_dtype'] = np.array(x.dtype.str)
+        return arrays
+
+    def decode(self, arrays):
+        '''stored times and states from the stored arrays
+
+        :param arrays: dict of arrays from encode
+        :return: times, solution
+        '''
+        if self.compression is None:
+            parts = arrays
+        else:
+            parts = {name: self._unpack(arrays[name], arrays[name + '_offsets'], str(arrays[name + '_dtype']),
+                                        arrays[name + '_shape']) for name in ('times', 'thermal', 'moles')}
+        return parts['times'], np.hstack([parts['thermal'].astype(np.float64), parts['moles']])
+
+    @staticmethod
+    def reconstruct(stored_times, stored, times):
+        '''states at any times from stored ones, by monotone cubic interpolation
+
+        :param stored_times: stored times
+        :param stored: stored states
+        :param times: times
+        :return: states at times
+        '''
+        if len(stored_times) == len(times) and np.array_equal(stored_times, times):
+            return stored
+        return interpolate.PchipInterpolator(stored_times, stored, axis=0)(times)
+
+    def error(self, times, solution, planet=None):
+        '''reconstruction error of storing a solution with this policy
+
+        :param times: output times
+        :param solution: solution array at times, or a planet.Solution (compared at times)
+        :param planet: planet of the run, for the inner core radius error
+        :return: Parameters with bytes (stored) and bytes_full (float64 at times), ratio, and the largest error at
+            times of T [K], of the core and layer moles relative to their totals and of r_i [m]
+        '''
+        full = solution.array(times) if hasattr(solution, 'array') else np.asarray(solution, dtype=float)
+        arrays = self.encode(times, solution)
+        stored_times, stored = self.decode(arrays)
+        x = self.reconstruct(stored_times, stored, times)
+        report = Parameters('reconstruction error of ' + json.dumps(self.settings()))
+        report.bytes = int(sum(np.asarray(a).nbytes for a in arrays.values()))
+        report.bytes_full = int(full.nbytes + np.asarray(times, dtype=float).nbytes)
+        report.ratio = report.bytes_full / report.bytes
+        report.T = float(np.max(np.abs(x[:, :2] - full[:, :2])))
+        Nc = 4 if planet is None else len(planet.reactions.core.species)
+        core = full[:, 2:2+Nc]
+        layer = full[:, 2+Nc:]
+        report.core = float(np.max(np.abs(x[:, 2:2+Nc] - core) / np.sum(core, axis=1, keepdims=True)))
+        report.layer = float(np.max(np.abs(x[:, 2+Nc:] - layer) / np.sum(layer, axis=1, keepdims=True)))
+        if planet is not None:
+            r_i = planet.core_layer.r_i
+            report.r_i = abs(r_i(x[-1, 0], one_off=True) - r_i(full[-1, 0], one_off=True))
+        return report
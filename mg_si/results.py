@@ -0,0 +1,163 @@
+'''
+Results of runs written by many processes, or nodes sharing a filesystem, into one sweep folder without locks:
+
+    - each process appends its summary rows to its own shard, run_data.<host>.<pid>.csv, read back with the other
+      shards by mg_si.summary.read_summary(sweep + 'run_data*.csv')
+    - each run is written into a staging folder, <run>.partial, and committed by renaming it to the run folder, so
+      that a run folder is always complete. Its summary row is written into it before the rename, so that the rows of
+      runs committed by a process that died before appending them can be recovered with ResultWriter.repair.
+    - a staging folder is created with mkdir, which fails if it exists, and holds the <host>.<pid> of its writer, so
+      that a run is staged by one writer at a time. The staging folder of a writer that died on the same host is
+      taken over with its checkpoint; one of a writer on another host is left alone, as it cannot be told from a live
+      one.
+
+    writer = ResultWriter(basefolder)
+    run = 'Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}'.format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+    if not writer.done(run):
+        filepath = writer.stage(run)
+        if filepath is not None:
+            ... write the record, plots and checkpoint of the run into filepath
+            writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution))
+'''
+import os
+import shutil
+import socket
+import numpy as np
+from mg_si.summary import write_summary, iter_summary
+
+# summary row of a run, kept in its folder
+RUN_SUMMARY = 'summary.csv'
+
+# suffix of the staging folder of a run
+STAGING_SUFFIX = '.partial'
+
+# file of a staging folder holding the <host>.<pid> of its writer
+STAGING_OWNER = 'owner'
+
+def writer_id():
+    '''<host>.<pid> of this process'''
+    return '{}.{}'.format(socket.gethostname(), os.getpid())
+
+def alive(owner):
+    '''whether the process of a <host>.<pid> is running: True or False on this host, None on another'''
+    host, _, pid = owner.rpartition('.')
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class ResultWriter():
+    def __init__(self, basefolder, shard=None):
+        '''
+        writer of the runs of a sweep, creating the sweep folder if needed
+
+        :param basefolder: sweep folder
+        :param shard: summary file of this writer in the sweep folder, run_data.<host>.<pid>.csv by default
+        '''
+        self.basefolder = basefolder
+        os.makedirs(basefolder, exist_ok=True)
+        self.id = writer_id()
+        if shard is None:
+            shard = 'run_data.{}.csv'.format(self.id)
+        self.shard = os.path.join(basefolder, shard)
+
+    def folder(self, run):
+        '''run folder of a run name'''
+        return os.path.join(self.basefolder, run.rstrip('/')) + '/'
+
+    def staging(self, run):
+        '''staging folder of a run name'''
+        return os.path.join(self.basefolder, run.rstrip('/')) + STAGING_SUFFIX + '/'
+
+    def done(self, run):
+        '''whether a run has been committed, or written by the control scripts before there was a writer'''
+        folder = self.folder(run)
+        return any(os.path.exists(folder + name) for name in (RUN_SUMMARY, 'record.npz', 'data.m'))
+
+    def stage(self, run, take_over=False):
+        '''staging folder of a run, created, or taken over with its checkpoint from a writer that died on this host
+
+        :param run: run name
+        :param take_over: take the staging folder over from any writer, e.g. when runs are given out by a work queue
+            that requeued the run of a writer that stopped heartbeating (see mg_si.workqueue)
+        :return: staging folder, ending with /, or None if another writer is staging the run
+        '''
+        staging = self.staging(run)
+        try:
+            os.mkdir(staging)
+        except FileExistsError:
+            try:
+                with open(staging + STAGING_OWNER) as f:
+                    owner = f.read().strip()
+            except FileNotFoundError:
+                # being created, or committed since
+                return None
+            if owner != self.id and alive(owner) is not False and not take_over:
+                return None
+        with open(staging + STAGING_OWNER, 'w') as f:
+            f.write(self.id)
+        return staging
+
+    def commit(self, run, values, **columns):
+        '''commit a staged run: write its summary row into the staging folder, rename the staging folder to the run
+        folder and append the row to the shard
+
+        :param run: run name
+        :param values: summary values (see mg_si.summary.write_summary)
+        :param columns: further summary values
+        :return: True, or False if the run was committed by another writer first, in which case the staging folder
+            is removed
+        '''
+        staging = self.staging(run)
+        folder = self.folder(run)
+        try:
+            write_summary(staging + RUN_SUMMARY, values, folder=staging, **columns)
+            if os.path.exists(folder) and not self.done(run):
+                # left by a run of the control scripts that died before saving, kept aside rather than removed
+                os.rename(folder, '{}.stale.{}'.format(folder.rstrip('/'), os.getpid()))
+            os.rename(staging, folder)
+        except OSError:
+            if not self.done(run):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        write_summary(self.shard, values, folder=folder, **columns)
+        return True
+
+    def fail(self, run, values, **columns):
+        '''append the summary row of a run that failed, with r_i NaN, keeping its staging folder
+
+        :param run: run name
+        :param values: summary values (see mg_si.summary.write_summary)
+        :param columns: further summary values
+        '''
+        columns['r_i'] = np.nan
+        write_summary(self.shard, values, folder=self.folder(run), **columns)
+
+    def repair(self):
+        '''append to the shard the rows of committed runs that are in no shard of the sweep, i.e. of writers that
+        died between the rename and the append
+
+        :return: number of rows appended
+        '''
+        written = set()
+        for chunk in iter_summary(os.path.join(self.basefolder, 'run_data*.csv')):
+            written.update(os.path.normpath(f) for f in chunk['folder'][np.isfinite(chunk['r_i'])])
+        n = 0
+        for name in sorted(os.listdir(self.basefolder)):
+            folder = os.path.join(self.basefolder, name)
+            if os.path.normpath(folder) in written or not os.path.exists(os.path.join(folder, RUN_SUMMARY)):
+                continue
+            for chunk in iter_summary(os.path.join(folder, RUN_SUMMARY)):
+                for row in chunk:
+                    values = {key: row[key] for key in chunk.dtype.names}
+                    values['time'] = str(row['time']).replace('T', ' ')
+                    values['folder'] = folder
+                    write_summary(self.shard, values)
+                    n += 1
+        return n
@@ -0,0 +1,270 @@
+'''
+Typed run summaries of sweeps: one row per run, written by every sweep script with write_summary, and read back
+from any number of shard files (run_data{iT}.csv) as one typed table. Rows are read in chunks, filtered as they are
+read, so the memory used does not grow with the number of rows, e.g. the runs within 10% of the present inner core:
+
+    table = read_summary('computed_solutions_nature/run_data*.csv', where=r_i_window(0.1))
+
+Files written before the schema, without a header, are read by their column layout in LEGACY_LAYOUTS.
+'''
+import csv
+import glob
+import io
+import json
+import os
+import socket
+import numpy as np
+
+# columns of a run summary and their types: the wall clock time the run finished, the present inner core radius
+# (NaN for a run that failed), the setup of the run, the present core wt% of Mg, Si and O, the solver statistics of
+# the integration (see mg_si.record.SOLVER_STATS) and the run folder
+SUMMARY_SCHEMA = (('time', 'datetime64[us]'), ('r_i', 'f8'), ('T_cmb0', 'f8'), ('X_Mg_0', 'f8'), ('X_Si_0', 'f8'),
+                  ('X_O_0', 'f8'), ('MgNumFp', 'f8'), ('MgNumPv', 'f8'), ('X_MgFeO_b', 'f8'), ('X_SiO2_b', 'f8'),
+                  ('nu_present', 'f8'), ('deltaT0', 'f8'), ('layer_thickness', 'f8'), ('overturn', 'f8'),
+                  ('wt_Mg', 'f8'), ('wt_Si', 'f8'), ('wt_O', 'f8'), ('nfe', 'f8'), ('nje', 'f8'), ('nst', 'f8'),
+                  ('switches', 'f8'), ('wall_time', 'f8'), ('folder', 'U256'))
+SUMMARY_NAMES = tuple(name for name, _ in SUMMARY_SCHEMA)
+SUMMARY_DTYPE = np.dtype(list(SUMMARY_SCHEMA))
+
+# text columns, last in every layout and written without commas
+TEXT_NAMES = ('folder',)
+
+# column layouts of the headerless files written before the schema, by number of columns
+LEGACY_LAYOUTS = {
+    # control_scripts/run_for_*.py
+    14: SUMMARY_NAMES[:14],
+    # tests/run_code.py, a single Mg/(Mg+Fe) of the background mantle for both MgNumFp and MgNumPv
+    13: ('time', 'T_cmb0', 'deltaT0', 'r_i', 'X_Mg_0', 'X_Si_0', 'X_O_0', 'fraction_MgFe_b', 'X_MgFeO_b',
+         'X_SiO2_b', 'nu_present', 'layer_thickness', 'overturn'),
+    # older tests/run_code.py, with the initial core wt% and T_um0
+    16: ('time', 'T_cmb0', 'T_um0', 'r_i', 'wpms', 'wpss', 'wpos', 'fraction_MgFe_b', 'X_MgFeO_b', 'X_SiO2_b',
+         'nu_present', 'layer_thickness', 'overturn', 'X_Mg_0', 'X_Si_0', 'X_O_0'),
+}
+
+# layouts of rows not read by a header: the legacy layouts and rows of the schema in a file without a header
+LAYOUTS = dict(LEGACY_LAYOUTS)
+LAYOUTS[len(SUMMARY_NAMES)] = SUMMARY_NAMES
+# the schema before the solver statistics, e.g. rows of a process still running the earlier code in a file whose
+# header is of the current schema
+LAYOUTS[18] = SUMMARY_NAMES[:17] + ('folder',)
+
+def write_summary(filename, values, **columns):
+    '''append the summary of a run to a file, with a header if the file is new
+
+    :param filename: csv file
+    :param values: dict of SUMMARY_NAMES values, or a sequence of the first of them in that order. Missing or None
+        numbers are written as nan.
+    :param columns: further SUMMARY_NAMES values, e.g. folder=filepath, **present_core(planet, solution),
+        **planet.stats. The folder is written relative to the file and values not in SUMMARY_NAMES are left out.
+    '''
+    if not isinstance(values, dict):
+        values = dict(zip(SUMMARY_NAMES, values))
+    values = dict(values, **columns)
+    if values.get('folder'):
+        values['folder'] = os.path.relpath(values['folder'], os.path.dirname(os.path.abspath(filename)))
+    row = []
+    for name in SUMMARY_NAMES:
+        value = values.get(name)
+        if value is None:
+            value = '' if name == 'time' or name in TEXT_NAMES else 'nan'
+        row.append(value)
+    _write_rows(filename, [row])
+
+def present_core(planet, solution):
+    '''present core wt% of Mg, Si and O of a run, for write_summary
+
+    :param planet: planet of the run
+    :param solution: solution array of the run
+    :return: dict of wt_Mg, wt_Si, wt_O
+    '''
+    core = planet.reactions.core
+    i0 = 2
+    wtp = 100*core.M2wtp(np.asarray(solution[-1, i0:i0+len(core.species)], dtype=float))
+    return {'wt_' + sp: wtp[list(core.species).index(sp)] for sp in ('Mg', 'Si', 'O')}
+
+def _write_rows(filename, rows):
+    '''append rows to a file with a single write on a descriptor opened O_APPEND, so that rows of processes
+    appending to the same local file are not interleaved. A new file is created with its header by linking a
+    complete file into place, so that exactly one process writes the header and no row can come before it.'''
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    if not os.path.exists(filename):
+        tmp = '{}.{}.{}.tmp'.format(filename, socket.gethostname(), os.getpid())
+        with open(tmp, 'w', newline='') as f:
+            csv.writer(f).writerow(SUMMARY_NAMES)
+        try:
+            os.link(tmp, filename)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp)
+    fd = os.open(filename, os.O_WRONLY | os.O_APPEND)
+    try:
+        os.write(fd, text.getvalue().encode())
+    finally:
+        os.close(fd)
+
+def _typed_chunk(lines, names):
+    '''typed table of csv lines in the column layout names: the time columns lead every layout, the text columns end
+    it and no value is quoted. The number columns are read by np.loadtxt as a table of cells, so a malformed cell is
+    NaN in its own column only, read cell by cell if some do not parse.'''
+    n_time = sum(name in ('date', 'time') for name in names)
+    n_text = sum(name in TEXT_NAMES for name in names)
+    n_numbers = len(names) - n_time - n_text
+    usecols = range(n_time, n_time + n_numbers)
+    parts = [line.split(',') for line in lines]
+    try:
+        numbers = np.loadtxt(lines, dtype=float, delimiter=',', usecols=usecols, comments=None, ndmin=2)
+    except ValueError:
+        numbers = np.array([[_parse_float(p[i]) for i in usecols] for p in parts], dtype=float)
+    numbers = numbers.reshape(len(parts), n_numbers)
+    columns = {name: numbers[:, i] for i, name in enumerate(names[n_time:n_time+n_numbers])}
+    columns.update((name, [p[n_time+n_numbers+i] for p in parts]) for i, name in enumerate(names[n_time+n_numbers:]))
+    times = [' '.join(p[:n_time]) for p in parts]
+    try:
+        columns['time'] = np.array(times, dtype='datetime64[us]')
+    except ValueError:
+        columns['time'] = np.array([_parse_time(t) for t in times], dtype='datetime64[us]')
+    if 'fraction_MgFe_b' in columns:
+        columns.setdefault('MgNumFp', columns['fraction_MgFe_b'])
+        columns.setdefault('MgNumPv', columns['fraction_MgFe_b'])
+    chunk = np.empty(len(parts), dtype=SUMMARY_DTYPE)
+    for name in SUMMARY_NAMES:
+        chunk[name] = columns.get(name, '' if name in TEXT_NAMES else np.nan)
+    return chunk
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def _parse_time(value):
+    try:
+        return np.datetime64(value.strip(), 'us')
+    except ValueError:
+        return np.datetime64('NaT')
+
+# header names of older files that differ from SUMMARY_NAMES
+HEADER_ALIASES = {'Time-date': 'date'}
+HEADER_FIRST = SUMMARY_NAMES + tuple(HEADER_ALIASES)
+
+def iter_summary(paths, chunk_rows=100000, where=None, layout=None, offsets=None):
+    '''typed chunks of the rows of summary files, in the order of the files. Rows are read by the header of the file
+    where they match it, and otherwise by layout. Rows that match no layout, e.g. cut short, are skipped. Run folders
+    are returned joined to the folder of their file.
+
+    :param paths: file, glob pattern or list of them
+    :param chunk_rows: rows per chunk
+    :param where: function of a chunk returning the mask of rows to keep
+    :param layout: column names of headerless files, from LAYOUTS by their number of columns by default
+    :param offsets: dict of file -> byte offset to start reading at, updated to the end of the last complete line
+        of each file read
+    :return: generator of structured arrays of SUMMARY_DTYPE
+    '''
+    for path in _expand(paths):
+        start = 0 if offsets is None else offsets.get(path, 0)
+        base = os.path.dirname(path)
+        with open(path, 'rb') as f:
+            names = None
+            if start > 0:
+                header = f.readline().decode().rstrip('\r\n').split(',')
+                if header[0] in HEADER_FIRST:
+                    names = [HEADER_ALIASES.get(h, h) for h in header]
+                f.seek(start)
+            end = start
+            lines = []
+            lines_names = None
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                end += len(raw)
+                line = raw.decode().rstrip('\r\n')
+                if not line:
+                    continue
+                if line.split(',', 1)[0] in HEADER_FIRST:
+                    names = [HEADER_ALIASES.get(h, h) for h in line.split(',')]
+                    continue
+                n = line.count(',') + 1
+                row_names = names if names and n == len(names) else layout or LAYOUTS.get(n)
+                if row_names is None or n != len(row_names):
+                    continue
+                if lines and row_names is not lines_names:
+                    yield from _filtered(_typed_chunk(lines, lines_names), where, base)
+                    lines = []
+                lines_names = row_names
+                lines.append(line)
+                if len(lines) == chunk_rows:
+                    yield from _filtered(_typed_chunk(lines, lines_names), where, base)
+                    lines = []
+            if lines:
+                yield from _filtered(_typed_chunk(lines, lines_names), where, base)
+            if offsets is not None:
+                offsets[path] = end
+
+def _filtered(chunk, where, base=''):
+    if base:
+        named = chunk['folder'] != ''
+        chunk['folder'][named] = [os.path.join(base, f) for f in chunk['folder'][named]]
+    if where is not None:
+        chunk = chunk[where(chunk)]
+    if len(chunk):
+        yield chunk
+
+def _expand(paths):
+    if isinstance(paths, str):
+        paths = [paths]
+    expanded = []
+    for path in paths:
+        expanded += sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+    return expanded
+
+def read_summary(paths, where=None, layout=None):
+    '''one typed table of the rows of summary files
+
+    :param paths: file, glob pattern or list of them
+    :param where: function of a chunk returning the mask of rows to keep
+    :param layout: column names of headerless files (see iter_summary)
+    :return: structured array of SUMMARY_DTYPE
+    '''
+    chunks = list(iter_summary(paths, where=where, layout=layout))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=SUMMARY_DTYPE)
+
+def merge_summary(paths, filename, where=None, layout=None):
+    '''append the rows of shard files added since the last merge to one summary file. The byte offset reached in
+    each shard is kept in filename + '.offsets.json'.
+
+    :param paths: file, glob pattern or list of them
+    :param filename: merged csv file
+    :param where: function of a chunk returning the mask of rows to keep
+    :param layout: column names of headerless files (see iter_summary)
+    :return: number of rows appended
+    '''
+    offsets_file = filename + '.offsets.json'
+    offsets = {}
+    if os.path.exists(offsets_file):
+        with open(offsets_file) as f:
+            offsets = json.load(f)
+    n = 0
+    base = os.path.dirname(os.path.abspath(filename))
+    for chunk in iter_summary(paths, where=where, layout=layout, offsets=offsets):
+        named = chunk['folder'] != ''
+        chunk['folder'][named] = [os.path.relpath(f, base) for f in chunk['folder'][named]]
+        columns = [[_format_time(t) for t in chunk['time']]] + [chunk[name].tolist() for name in SUMMARY_NAMES[1:]]
+        _write_rows(filename, zip(*columns))
+        n += len(chunk)
+    with open(offsets_file, 'w') as f:
+        json.dump(offsets, f)
+    return n
+
+def _format_time(value):
+    return '' if np.isnat(value) else str(value).replace('T', ' ')
+
+def r_i_window(fraction=0.1, r_i=1220e3):
+    '''filter of the runs whose present inner core radius is within a fraction of r_i
+
+    :param fraction: allowed relative difference
+    :param r_i: present inner core radius [m]
+    :return: function of a chunk returning a mask
+    '''
+    return lambda chunk: np.abs(chunk['r_i']/r_i - 1.) <= fraction
@@ -0,0 +1,191 @@
+'''
+Monte Carlo propagation of the K_D fit uncertainties. Coefficient sets are drawn from the 1-sigma uncertainties in
+reactions.KD_FITS and bound through the 'from_params' citation, the runs are integrated on a process pool, each
+reduced to r_i(t), core wt% and entropy histories as it finishes, and the ensemble stops once the quantiles of
+these are stable.
+'''
+import multiprocessing
+import numpy as np
+import mg_si
+from mg_si.base import Parameters
+from mg_si.reactions import KD_FITS, KD_Model, KD_PARAM_NAMES, KD_DEFAULT_CITATIONS
+
+const_yr_to_sec = 365.25*24*3600
+
+# entropy terms of core.Custom.compute_all_parameters kept for each run
+ENTROPY_TERMS = ('Egm', 'Egs', 'Egf', 'Eg', 'Es', 'El', 'Ek', 'Er', 'Ephi', 'DE')
+
+def draw_KD_fits(citations=None, N=1, rng=None):
+    '''draw K_D fit coefficients, independent and normally distributed about each fit with its 1-sigma uncertainty
+
+    :param citations: dict of species -> citation, missing species use KD_DEFAULT_CITATIONS
+    :param N: number of draws
+    :param rng: numpy random Generator
+    :return: list of N dicts of params.reactions values binding the drawn fits through 'from_params'
+    '''
+    citations = dict(KD_DEFAULT_CITATIONS, **(citations or {}))
+    rng = rng or np.random.default_rng()
+    draws = [{} for _ in range(N)]
+    for sp in KD_Model.species:
+        fit = KD_FITS[sp][citations[sp]]
+        name = KD_PARAM_NAMES[sp]
+        for c in ('a', 'b', 'c'):
+            values = fit[c] + fit['d_' + c]*rng.standard_normal(N)
+            for draw, v in zip(draws, values):
+                draw['{}_{}'.format(name, c)] = v
+        for draw in draws:
+            draw['ParamCitation' + sp] = 'from_params'
+            draw[name + '_dK_dT'] = fit['dK_dT']
+    return draws
+
+class KD_Ensemble():
+    def __init__(self, setup_kwargs, citations=None, times=None, N_approx=100, quantiles=(.05, .25, .5, .75, .95),
+                 planet_class=None, planet_kwargs=None, tol=None):
+        '''
+        ensemble of runs of one setup with K_D fits drawn from their uncertainties
+
+        :param setup_kwargs: arguments of planet.Custom.setup for the runs
+        :param citations: dict of species -> citation of the fits to draw about
+        :param times: output times, 1001 times over 4568 Myr by default
+        :param N_approx: number of times the entropy terms are computed at (see core.Custom.compute_all_parameters)
+        :param quantiles: quantiles returned
+        :param planet_class: planet class, planet.Custom by default
+        :param planet_kwargs: arguments of planet_class
+        :param tol: tolerances of the scaled integration (see planet.Custom.scaled_tolerances)
+        '''
+        self.setup_kwargs = setup_kwargs
+        self.citations = citations or {}
+        if times is None:
+            times = np.linspace(0., 4568e6*const_yr_to_sec, 1001)
+        self.times = times
+        self.N_approx = N_approx
+        self.quantiles = np.array(quantiles)
+        self.planet_class = planet_class or mg_si.planet.Custom
+        self.planet_kwargs = planet_kwargs or {}
+        self.tol = tol
+
+    def run_member(self, draw):
+        '''integrate one member of the ensemble and reduce it to the aggregated histories
+
+        :param draw: params.reactions values from draw_KD_fits
+        :return: dict of r_i [times], wt% of each core species [species x times], the core species, t_E and each of
+            ENTROPY_TERMS
+        '''
+        planet = self.planet_class(**self.planet_kwargs)
+        for key, value in draw.items():
+            setattr(planet.params.reactions, key, value)
+        planet.reactions.bind_KD_model()
+        x0 = planet.setup(**self.setup_kwargs)
+        solution = planet.integrate(self.times, x0, scaled=True, tol=self.tol)
+        core = planet.reactions.core
+        wt = solution[:, 2:2+len(core.species)]*core.molmass
+        member = {'r_i': np.array([planet.core_layer.r_i(T, one_off=True) for T in solution[:, 0]]),
+                  'wt': 100*(wt / np.sum(wt, axis=1)[:, None]).T, 'species': core.species}
+        member['t_E'], allp = planet.core_layer.compute_all_parameters(self.times, solution, N_approx=self.N_approx)
+        for name in ENTROPY_TERMS:
+            member[name] = np.asarray(getattr(allp, name))
+        return member
+
+    def run(self, max_runs=1000, min_runs=32, batch=16, processes=None, rtol=0.02, patience=2, seed=None):
+        '''run the ensemble in batches until the quantiles are stable
+
+        The quantiles are compared after each batch: the change of each history, relative to its 5-95% spread
+        (or to its magnitude where it has none), must stay below rtol for patience consecutive batches.
+
+        The quantiles are exact, so the histories of every successful run are kept until the end: about
+        8*(len(times)*(1 + number of core species) + len(ENTROPY_TERMS)*N_approx) bytes a run, ~50 kB with the
+        defaults or ~50 MB for max_runs=1000, and each check recomputes the quantiles of all of them. For much
+        larger ensembles, keep fewer output times or a smaller N_approx.
+
+        :param max_runs: maximum number of runs
+        :param min_runs: minimum number of runs before checking convergence
+        :param batch: runs per batch
+        :param processes: number of processes, one per cpu by default
+        :param rtol: tolerance on the change of the quantiles between batches
+        :param patience: number of consecutive batches within rtol to stop
+        :param seed: random seed of the draws
+        :return: Parameters with times, t_E, quantile levels, quantiles of r_i, wt (dict by species) and E (dict by
+            entropy term), the draws of the successful runs, n_runs, the draws and errors of the runs that failed (e.g.
+            drawn fits with no equilibrium initial mantle), the convergence history and converged, which needs at least
+            min_runs successful runs. If every run failed, t_E and r_i are None and wt and E are empty.
+        '''
+        rng = np.random.default_rng(seed)
+        members = []
+        draws = []
+        failures = []
+        history = []
+        previous = None
+        stable = 0
+        with multiprocessing.Pool(processes) as pool:
+            while len(members) + len(failures) < max_runs:
+                batch_draws = draw_KD_fits(self.citations, min(batch, max_runs - len(members) - len(failures)), rng)
+                for draw, member, error in pool.imap_unordered(_run_member, [(self, d) for d in batch_draws]):
+                    if member is None:
+                        failures.append((draw, error))
+                    else:
+                        members.append(member)
+                        draws.append(draw)
+                if len(members) < max(min_runs, 2):
+                    continue
+                current = self.aggregate(members)
+                if previous is not None:
+                    change = self.quantile_change(previous, current)
+                    history.append((len(members), change))
+                    stable = stable + 1 if change < rtol else 0
+                    if stable >= patience:
+                        break
+                previous = current
+        if members:
+            result = self.aggregate(members)
+        else:
+            result = Parameters('K_D ensemble quantiles')
+            result.times = self.times
+            result.t_E = None
+            result.levels = self.quantiles
+            result.r_i = None
+            result.wt = {}
+            result.E = {}
+        result.draws = draws
+        result.n_runs = len(members)
+        result.failures = failures
+        result.convergence = history
+        result.converged = len(members) >= min_runs and stable >= patience
+        return result
+
+    def aggregate(self, members):
+        '''quantiles of the histories of the members
+
+        :param members: list of run_member results
+        :return: Parameters of times, t_E, quantile levels and quantiles [quantile x time] of r_i, wt and E
+        '''
+        q = Parameters('K_D ensemble quantiles')
+        q.times = self.times
+        q.t_E = members[0]['t_E']
+        q.levels = self.quantiles
+        q.r_i = np.nanquantile([m['r_i'] for m in members], self.quantiles, axis=0)
+        wt = np.nanquantile([m['wt'] for m in members], self.quantiles, axis=0)
+        q.wt = {sp: wt[:, i] for i, sp in enumerate(members[0]['species'])}
+        q.E = {name: np.nanquantile([m[name] for m in members], self.quantiles, axis=0) for name in ENTROPY_TERMS}
+        return q
+
+    @staticmethod
+    def quantile_change(previous, current):
+        '''largest change of any quantile between two aggregates, relative to the spread of each history'''
+        pairs = [(previous.r_i, current.r_i)]
+        pairs += [(previous.wt[sp], current.wt[sp]) for sp in current.wt]
+        pairs += [(previous.E[name], current.E[name]) for name in current.E]
+        change = 0.
+        for old, new in pairs:
+            scale = np.max(new[-1] - new[0])
+            if not scale > 0.:
+                scale = np.max(np.abs(new))
+            if scale > 0.:
+                change = max(change, np.nanmax(np.abs(new - old)) / scale)
+        return change
+
+def _run_member(args):
+    ensemble, draw = args
+    try:
+        return draw, ensemble.run_member(draw), None
+    except Exception as e:
+        return draw, None, repr(e)
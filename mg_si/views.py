@@ -0,0 +1,239 @@
+'''
+Named views of the runs of a sweep: persisted queries over its run summaries (see mg_si.summary), e.g. the runs
+within 10% of the present inner core radius or with a present core composition allowed by seismology. A view is
+kept in the views folder of the sweep as
+
+    <name>.json   the query, the summary files it reads and the byte offset reached in each
+    <name>.npy    the summary rows of the runs in the view, with their run folders
+
+and is brought up to date with only the rows appended since it was last read each time it is opened. Runs are
+resolved by reference to their folders rather than copied:
+
+    view = RunView.create('computed_solutions_nature', 'r_i_10', **STANDARD_VIEWS['r_i_10'])
+    for folder in view.folders():
+        planet, times, solution = mg_si.planet.Custom.from_record(os.path.join(folder, 'record.npz'))
+
+Rows written before the summaries had a folder column are matched to the run folder whose name holds their
+parameters, by the values the name was formatted from rather than by formatting the folder name again.
+'''
+import json
+import os
+import re
+import numpy as np
+import matplotlib.path as mplPath
+from mg_si.summary import iter_summary, SUMMARY_DTYPE, SUMMARY_NAMES
+from mg_si.calibration import BADRO_SEISMIC_O_SI
+from mg_si.results import STAGING_SUFFIX
+
+VIEWS_FOLDER = 'views'
+VIEWS_VERSION = 1
+
+# views used in the analyses of the sweeps
+STANDARD_VIEWS = {
+    'r_i_10': {'bounds': {'r_i': (1098e3, 1342e3)},
+               'description': 'present inner core radius within 10% of 1220 km'},
+    'seismic': {'region': ('wt_O', 'wt_Si', BADRO_SEISMIC_O_SI.tolist()),
+                'description': 'present core wt% O and Si allowed by seismology (Badro et al. 2015)'},
+    'r_i_10_seismic': {'bounds': {'r_i': (1098e3, 1342e3)}, 'region': ('wt_O', 'wt_Si', BADRO_SEISMIC_O_SI.tolist()),
+                       'description': 'both r_i_10 and seismic'},
+}
+
+# summary columns of the values in the run folder names of the control scripts, by their prefix
+FOLDER_KEYS = {'Tc': 'T_cmb0', 'dT': 'deltaT0', 'XM': 'X_Mg_0', 'XS': 'X_Si_0', 'XO': 'X_O_0', 'fFp': 'MgNumFp',
+               'fPv': 'MgNumPv', 'fMb': 'MgNumFp', 'XMgFe': 'X_MgFeO_b', 'Xmb': 'X_MgFeO_b', 'XSb': 'X_SiO2_b',
+               'nu': 'nu_present', 'lthck': 'layer_thickness', 'ovt': 'overturn'}
+
+def folder_values(name):
+    '''values a run folder name was formatted from, with the half width of the interval its digits allow
+
+    :param name: folder name, e.g. Tc5200.0_XM0.010_XS0.025_XO0.050
+    :return: dict of summary column -> (value, half width)
+    '''
+    values = {}
+    for token in name.split('_'):
+        match = re.match(r'([A-Za-z]+)(-?\d+(?:\.(\d*))?(?:e([+-]?\d+))?)$', token)
+        if match is None or match.group(1) not in FOLDER_KEYS:
+            continue
+        decimals = len(match.group(3) or '')
+        exponent = int(match.group(4) or 0)
+        values[FOLDER_KEYS[match.group(1)]] = (float(match.group(2)), .5*10.**(exponent - decimals))
+    return values
+
+def match_folders(rows, sweep):
+    '''run folders of the sweep whose names hold the parameters of summary rows without a folder
+
+    :param rows: structured array of SUMMARY_DTYPE
+    :param sweep: sweep folder holding the run folders
+    :return: folder of each row relative to the sweep, '' where none or several match
+    '''
+    folders = [name for name in sorted(os.listdir(sweep))
+               if name != VIEWS_FOLDER and os.path.isdir(os.path.join(sweep, name))
+               and not name.endswith(STAGING_SUFFIX) and '.stale.' not in name]
+    matches = np.zeros((len(rows), len(folders)), dtype=bool)
+    for j, name in enumerate(folders):
+        values = folder_values(name)
+        if not values:
+            continue
+        ok = np.ones(len(rows), dtype=bool)
+        for column, (value, width) in values.items():
+            ok &= np.abs(rows[column] - value) <= width*(1. + 1e-9)
+        matches[:, j] = ok
+    unique = np.sum(matches, axis=1) == 1
+    result = np.full(len(rows), '', dtype=SUMMARY_DTYPE['folder'])
+    result[unique] = np.array(folders)[np.argmax(matches[unique], axis=1)] if len(folders) else []
+    return result
+
+class RunView():
+    def __init__(self, sweep, name, refresh=True):
+        '''
+        open a view of a sweep
+
+        :param sweep: sweep folder
+        :param name: view name
+        :param refresh: read the summary rows appended since the view was last read
+        '''
+        self.sweep = sweep
+        self.name = name
+        with open(self._path('.json')) as f:
+            meta = json.load(f)
+        if meta['version'] != VIEWS_VERSION:
+            raise ValueError('view version {} is not {}'.format(meta['version'], VIEWS_VERSION))
+        self.index = meta['index']
+        self.bounds = {column: tuple(b) for column, b in meta['bounds'].items()}
+        self.region = tuple(meta['region']) if meta['region'] else None
+        self.description = meta['description']
+        self.offsets = meta['offsets']
+        self.rows = np.load(self._path('.npy'))
+        if self.rows.dtype != SUMMARY_DTYPE:
+            # of an earlier summary schema, read again from the start
+            self.offsets = {}
+            self.rows = np.empty(0, dtype=SUMMARY_DTYPE)
+            refresh = True
+        if refresh:
+            self.refresh()
+
+    @classmethod
+    def create(cls, sweep, name, bounds=None, region=None, index='run_data*.csv', description=''):
+        '''create a view of a sweep, or open it if it exists with the same query
+
+        :param sweep: sweep folder
+        :param name: view name
+        :param bounds: dict of summary column -> (lower, upper), inclusive, None for no bound. Rows with NaN in a
+            bounded column are left out.
+        :param region: (x column, y column, polygon vertices [N x 2]) the runs must lie in, e.g. present core wt% O
+            and Si in BADRO_SEISMIC_O_SI
+        :param index: summary files of the sweep, a glob pattern relative to the sweep
+        :param description: text kept with the view
+        :return: view, up to date
+        '''
+        query = {'version': VIEWS_VERSION, 'index': index,
+                 'bounds': {column: list(b) for column, b in (bounds or {}).items()},
+                 'region': [region[0], region[1], np.asarray(region[2], dtype=float).tolist()] if region else None}
+        for column in list(query['bounds']) + (query['region'][:2] if region else []):
+            if column not in SUMMARY_NAMES:
+                raise ValueError('{} is not a summary column'.format(column))
+        path = _view_path(sweep, name, '.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                meta = json.load(f)
+            if {key: meta.get(key) for key in query} == query:
+                return cls(sweep, name)
+        if not os.path.exists(os.path.join(sweep, VIEWS_FOLDER)):
+            os.makedirs(os.path.join(sweep, VIEWS_FOLDER))
+        np.save(_view_path(sweep, name, '.npy'), np.empty(0, dtype=SUMMARY_DTYPE))
+        with open(path, 'w') as f:
+            json.dump(dict(query, description=description, offsets={}), f)
+        return cls(sweep, name)
+
+    def _path(self, ext):
+        return _view_path(self.sweep, self.name, ext)
+
+    def where(self, chunk):
+        '''mask of the summary rows in the view
+
+        :param chunk: structured array of SUMMARY_DTYPE
+        :return: boolean mask
+        '''
+        mask = np.ones(len(chunk), dtype=bool)
+        for column, (lower, upper) in self.bounds.items():
+            mask &= np.isfinite(chunk[column])
+            if lower is not None:
+                mask &= chunk[column] >= lower
+            if upper is not None:
+                mask &= chunk[column] <= upper
+        if self.region is not None:
+            x, y, polygon = self.region
+            points = np.column_stack([chunk[x], chunk[y]])
+            mask &= np.all(np.isfinite(points), axis=1) & mplPath.Path(np.asarray(polygon)).contains_points(points)
+        return mask
+
+    def refresh(self):
+        '''add the rows appended to the summary files since the view was last read, reading them again from the start
+        if a file is shorter than the offset reached in it
+
+        :return: number of rows added
+        '''
+        offsets = {os.path.join(self.sweep, path): offset for path, offset in self.offsets.items()}
+        if any(not os.path.exists(path) or os.path.getsize(path) < offset for path, offset in offsets.items()):
+            offsets = {}
+            self.rows = np.empty(0, dtype=SUMMARY_DTYPE)
+        chunks = list(iter_summary(os.path.join(self.sweep, self.index), where=self.where, offsets=offsets))
+        offsets = {os.path.relpath(path, self.sweep): offset for path, offset in offsets.items()}
+        if not chunks and offsets == self.offsets:
+            return 0
+        new = np.concatenate(chunks) if chunks else np.empty(0, dtype=SUMMARY_DTYPE)
+        named = new['folder'] != ''
+        new['folder'][named] = [os.path.relpath(f, self.sweep) for f in new['folder'][named]]
+        if not np.all(named):
+            new['folder'][~named] = match_folders(new[~named], self.sweep)
+        self.rows = np.concatenate([self.rows, new])
+        self.offsets = offsets
+        self._save()
+        return len(new)
+
+    def _save(self):
+        np.save(self._path('.tmp.npy'), self.rows)
+        os.replace(self._path('.tmp.npy'), self._path('.npy'))
+        with open(self._path('.json')) as f:
+            meta = json.load(f)
+        meta['offsets'] = self.offsets
+        with open(self._path('.json.tmp'), 'w') as f:
+            json.dump(meta, f)
+        os.replace(self._path('.json.tmp'), self._path('.json'))
+
+    def folders(self):
+        '''run folders of the runs in the view, relative to the working directory, for the rows matched to a folder
+
+        :return: list of folders
+        '''
+        return [os.path.join(self.sweep, f) for f in self.rows['folder'] if f]
+
+    def link(self, target):
+        '''make a folder of symbolic links to the run folders of the view, removing the links to runs no longer in it
+
+        :param target: folder of links, created if needed
+        :return: number of links
+        '''
+        if not os.path.exists(target):
+            os.makedirs(target)
+        names = {}
+        for folder in self.folders():
+            names[os.path.basename(os.path.normpath(folder))] = os.path.relpath(folder, target)
+        for name in os.listdir(target):
+            path = os.path.join(target, name)
+            if os.path.islink(path) and os.readlink(path) != names.get(name):
+                os.remove(path)
+        for name, source in names.items():
+            if not os.path.lexists(os.path.join(target, name)):
+                os.symlink(source, os.path.join(target, name))
+        return len(names)
+
+def _view_path(sweep, name, ext):
+    return os.path.join(sweep, VIEWS_FOLDER, name + ext)
+
+def list_views(sweep):
+    '''names of the views of a sweep'''
+    folder = os.path.join(sweep, VIEWS_FOLDER)
+    if not os.path.exists(folder):
+        return []
+    return sorted(name[:-5] for name in os.listdir(folder) if name.endswith('.json'))
@@ -0,0 +1,445 @@
+'''
+Work queue of sweep tasks on a shared filesystem, for any number of worker processes on any number of nodes, with no
+service to run. A queue is a folder holding a JSON file per task in one of
+
+    pending/   tasks to run, claimed in the order of order.json, or of their names
+    claimed/   tasks being run, each touched by its worker every heartbeat seconds
+    done/      tasks run, with the statistics the task function returned and, if it returned any, the wall time
+    failed/    tasks that raised on every one of their attempts, with the errors
+
+A task is claimed by renaming it from pending/ to claimed/, which exactly one worker can do, also over NFS, where the
+locks of SQLite are not reliable. A claimed task whose file has not been touched for timeout seconds is moved back to
+pending/ by the next worker to look, so the tasks of dead workers are run again; heartbeat times are compared with
+the clock of the file server, not of the node. A worker that was only slow finds its task gone, or claimed again
+with another worker or attempt in the task file, when it finishes and leaves it to the worker now holding it; results written with mg_si.results.ResultWriter keep the first commit.
+
+    queue = WorkQueue.create('queue_nature', [{'T_cmb0': T, 'X_Mg_0': Mg, ...} for ...])
+    WorkQueue('queue_nature').work(run)    # on every node, run(**task) for each task claimed
+
+Run times of a sweep can differ by over 100x, and a sweep ends when its slowest tasks do, so the workers reorder the
+pending tasks longest first (see reorder): a CostModel of log wall time over the task arguments is fitted to the done
+tasks, and until enough are done the tasks are claimed in a random order, so that the first ones sample the whole
+grid. Workers that run out of tasks take the next pending one whichever worker's slice of the grid it came from, so
+no worker holds on to a queue of stragglers, but a single run is not split: the sweep cannot end before its longest
+run does.
+'''
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import traceback
+import numpy as np
+from mg_si.results import writer_id
+
+QUEUE_STATES = ('pending', 'claimed', 'done', 'failed')
+
+class Task():
+    def __init__(self, queue, name, args, attempts):
+        '''
+        task claimed from a queue, heartbeating while used as a context manager
+
+        :param queue: WorkQueue
+        :param name: task name
+        :param args: dict of the task arguments
+        :param attempts: number of times the task has been claimed, this time included
+        '''
+        self.queue = queue
+        self.name = name
+        self.args = args
+        self.attempts = attempts
+        self.stats = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, kind, value, tb):
+        self._stop.set()
+        self._thread.join()
+        if kind is None:
+            self.done()
+        else:
+            self.fail(''.join(traceback.format_exception(kind, value, tb)))
+        return False
+
+    def _beat(self):
+        while not self._stop.wait(self.queue.heartbeat):
+            if not self.beat():
+                return
+
+    def _claimed(self):
+        '''the claimed task file, if this worker still holds the claim: not requeued as stale and claimed again, by
+        another worker or by this one
+
+        :return: task dict, or None
+        '''
+        try:
+            with open(self.queue._path('claimed', self.name)) as f:
+                task = json.load(f)
+        except FileNotFoundError:
+            return None
+        if task.get('worker') != self.queue.id or task.get('attempts') != self.attempts:
+            return None
+        return task
+
+    def beat(self):
+        '''touch the claimed task
+
+        :return: whether the task is still claimed by this worker
+        '''
+        if self._claimed() is None:
+            return False
+        try:
+            os.utime(self.queue._path('claimed', self.name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def done(self):
+        '''move the task to done/, with the stats the task function returned and then only its wall time, so that the
+        tasks it skipped, e.g. runs already computed, are left out of the CostModel
+
+        :return: whether it was still claimed by this worker, and not requeued as stale, in which case the task is
+            left to the worker now holding it
+        '''
+        task = self._claimed()
+        if task is None:
+            return False
+        if self.stats is not None:
+            task['stats'] = self.stats
+            if self._start is not None:
+                task['wall_time'] = time.time() - self._start
+        self.queue._write(self.queue._path('claimed', self.name), task)
+        return self.queue._move(self.name, 'claimed', 'done')
+
+    def fail(self, error):
+        '''requeue the task, or move it to failed/ with the error if it has used its attempts
+
+        :param error: text of the error
+        :return: whether it was still claimed by this worker, otherwise the task is left to the worker now holding it
+        '''
+        task = self._claimed()
+        if task is None:
+            return False
+        task['errors'] = task.get('errors', []) + [{'worker': self.queue.id, 'error': error}]
+        self.queue._write(self.queue._path('claimed', self.name), task)
+        return self.queue._move(self.name, 'claimed',
+                                'failed' if self.attempts >= self.queue.max_attempts else 'pending')
+
+class WorkQueue():
+    def __init__(self, path, heartbeat=30., timeout=300., max_attempts=3):
+        '''
+        open a queue
+
+        :param path: queue folder
+        :param heartbeat: seconds between the heartbeats of a claimed task
+        :param timeout: seconds without a heartbeat after which a claimed task is requeued
+        :param max_attempts: claims of a task, that raised or whose worker died, before it is moved to failed/
+        '''
+        if not all(os.path.isdir(os.path.join(path, state)) for state in QUEUE_STATES):
+            raise ValueError('{} is not a work queue'.format(path))
+        self.path = path
+        self.heartbeat = heartbeat
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.id = writer_id()
+        self._reaped = -float('inf')
+        self._order = (None, {})
+
+    @classmethod
+    def create(cls, path, tasks, **kwargs):
+        '''create a queue of tasks, or add to a queue the tasks not in it yet by name
+
+        :param path: queue folder
+        :param tasks: list of dicts of task arguments, claimed in their order, or dict of name -> arguments
+        :param kwargs: arguments of WorkQueue
+        :return: queue
+        '''
+        for state in QUEUE_STATES:
+            os.makedirs(os.path.join(path, state), exist_ok=True)
+        queue = cls(path, **kwargs)
+        if not isinstance(tasks, dict):
+            tasks = {'{:08d}'.format(i): args for i, args in enumerate(tasks)}
+        existing = set(n for state in QUEUE_STATES for n in queue.names(state))
+        for name, args in tasks.items():
+            if name not in existing:
+                queue._write(queue._path('pending', name), {'args': args, 'attempts': 0})
+        return queue
+
+    def _path(self, state, name):
+        return os.path.join(self.path, state, name + '.json')
+
+    def _write(self, path, task):
+        tmp = '{}.{}.tmp'.format(path, self.id)
+        with open(tmp, 'w') as f:
+            json.dump(task, f)
+        os.replace(tmp, path)
+
+    def _move(self, name, source, target):
+        try:
+            os.rename(self._path(source, name), self._path(target, name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def names(self, state):
+        '''names of the tasks in a state, sorted'''
+        return sorted(n[:-5] for n in os.listdir(os.path.join(self.path, state)) if n.endswith('.json'))
+
+    def read(self, state, names=None):
+        '''tasks in a state
+
+        :param state: one of QUEUE_STATES
+        :param names: task names, all in the state by default
+        :return: dict of name -> task dict of args, attempts and, for done tasks, wall_time and stats
+        '''
+        tasks = {}
+        for name in self.names(state) if names is None else names:
+            try:
+                with open(self._path(state, name)) as f:
+                    tasks[name] = json.load(f)
+            except FileNotFoundError:
+                continue
+        return tasks
+
+    def order(self):
+        '''pending tasks in the order they are claimed: by their rank in order.json, then by name'''
+        path = os.path.join(self.path, 'order.json')
+        try:
+            mtime = os.stat(path).st_mtime
+            if mtime != self._order[0]:
+                with open(path) as f:
+                    self._order = (mtime, {name: i for i, name in enumerate(json.load(f))})
+        except FileNotFoundError:
+            self._order = (None, {})
+        rank = self._order[1]
+        return sorted(self.names('pending'), key=lambda name: (rank.get(name, len(rank)), name))
+
+    def set_order(self, names):
+        '''set the order pending tasks are claimed in, those not in names coming after them by name'''
+        self._write(os.path.join(self.path, 'order.json'), list(names))
+
+    def reorder(self, model=None, min_done=20, seed=None):
+        '''order the pending tasks longest predicted first, or randomly while fewer than min_done tasks are done
+
+        :param model: CostModel, fitted to the done tasks by default
+        :param min_done: number of done tasks with stats and a wall time needed to fit the model
+        :param seed: random seed of the random order
+        :return: dict of name -> predicted wall time of the pending tasks, or None if ordered randomly
+        '''
+        pending = self.read('pending')
+        names = sorted(pending)
+        if model is None:
+            done = [task for task in self.read('done').values() if 'wall_time' in task and 'stats' in task]
+            if len(done) < min_done:
+                random.Random(seed).shuffle(names)
+                self.set_order(names)
+                return None
+            model = CostModel().fit([task['args'] for task in done], [task['wall_time'] for task in done])
+        predicted = dict(zip(names, model.predict([pending[name]['args'] for name in names])))
+        self.set_order(sorted(names, key=lambda name: -predicted[name]))
+        return predicted
+
+    def now(self):
+        '''time of the clock of the file server, from a file touched in the queue'''
+        clock = os.path.join(self.path, 'clock.{}'.format(self.id))
+        with open(clock, 'a'):
+            os.utime(clock)
+        return os.stat(clock).st_mtime
+
+    def requeue_stale(self):
+        '''move back to pending/ the claimed tasks without a heartbeat for timeout seconds
+
+        :return: names of the tasks requeued
+        '''
+        now = self.now()
+        requeued = []
+        for name in self.names('claimed'):
+            try:
+                stale = now - os.stat(self._path('claimed', name)).st_mtime > self.timeout
+            except FileNotFoundError:
+                continue
+            if stale and self._move(name, 'claimed', 'pending'):
+                requeued.append(name)
+        return requeued
+
+    def claim(self):
+        '''claim the first pending task, after requeueing stale tasks at most every heartbeat seconds
+
+        :return: Task, or None if no task is pending
+        '''
+        if time.time() - self._reaped > self.heartbeat:
+            self.requeue_stale()
+            self._reaped = time.time()
+        for name in self.order():
+            pending = self._path('pending', name)
+            try:
+                # touched before the rename, so that a task is never claimed with the time of an old heartbeat
+                os.utime(pending)
+                os.rename(pending, self._path('claimed', name))
+            except FileNotFoundError:
+                continue
+            path = self._path('claimed', name)
+            try:
+                with open(path) as f:
+                    task = json.load(f)
+                if task.get('attempts', 0) >= self.max_attempts:
+                    # claimed that many times without finishing, e.g. killing its workers
+                    task['errors'] = task.get('errors', []) + [{'worker': self.id, 'error': 'claimed {} times without '
+                                                               'finishing'.format(task['attempts'])}]
+                    self._write(path, task)
+                    self._move(name, 'claimed', 'failed')
+                    continue
+                task['attempts'] = task.get('attempts', 0) + 1
+                task['worker'] = self.id
+                self._write(path, task)
+            except FileNotFoundError:
+                continue
+            return Task(self, name, task['args'], task['attempts'])
+        return None
+
+    def work(self, function, max_tasks=None, wait=False, reorder_every=None):
+        '''claim and run tasks until none is pending
+
+        :param function: called with the arguments of each task as keyword arguments. A dict it returns, e.g. the
+            solver statistics of the run, is kept with the done task together with the wall time; return None for a
+            task that was skipped rather than run.
+        :param max_tasks: maximum number of tasks to run
+        :param wait: when none is pending, wait while tasks are claimed by other workers, as they may be requeued
+        :param reorder_every: reorder the pending tasks (see reorder) before the first task and after every
+            reorder_every tasks run by this worker, None not to
+        :return: number of tasks run
+        '''
+        n = 0
+        while max_tasks is None or n < max_tasks:
+            if reorder_every and n % reorder_every == 0:
+                self.reorder()
+            task = self.claim()
+            if task is None:
+                if wait and self.names('claimed'):
+                    time.sleep(self.heartbeat)
+                    continue
+                break
+            try:
+                with task:
+                    stats = function(**task.args)
+                    if isinstance(stats, dict):
+                        task.stats = stats
+            except Exception:
+                traceback.print_exc()
+            n += 1
+        return n
+
+    def status(self):
+        '''number of tasks in each state'''
+        return {state: len(self.names(state)) for state in QUEUE_STATES}
+
+    def retry_failed(self):
+        '''move the failed tasks back to pending/ with their attempts reset
+
+        :return: number of tasks moved
+        '''
+        n = 0
+        for name in self.names('failed'):
+            path = self._path('failed', name)
+            with open(path) as f:
+                task = json.load(f)
+            task['attempts'] = 0
+            self._write(path, task)
+            n += self._move(name, 'failed', 'pending')
+        return n
+
+class CostModel():
+    def __init__(self, names=None, ridge=1e-3):
+        '''
+        predictor of the wall time of tasks: a least squares fit of log wall time to a quadratic of the standardized
+        task arguments, with a ridge penalty so that it stays cheap and stable on a few tens of runs
+
+        :param names: numeric task arguments to use, all those of the first task fitted by default
+        :param ridge: ridge penalty relative to the number of runs
+        '''
+        self.names = names
+        self.ridge = ridge
+
+    def features(self, args):
+        '''quadratic features [len(args) x n] of the standardized task arguments'''
+        x = (np.array([[float(a[name]) for name in self.names] for a in args]).reshape(len(args), -1) - self.mean) \
+            / self.scale
+        columns = [np.ones(len(x))] + [x[:, i] for i in range(x.shape[1])]
+        columns += [x[:, i]*x[:, j] for i in range(x.shape[1]) for j in range(i, x.shape[1])]
+        return np.column_stack(columns)
+
+    def fit(self, args, wall_times):
+        '''fit to runs
+
+        :param args: list of dicts of task arguments
+        :param wall_times: wall times of the runs [s]
+        :return: self
+        '''
+        if self.names is None:
+            self.names = sorted(name for name, value in args[0].items() if isinstance(value, (int, float)))
+        x = np.array([[float(a[name]) for name in self.names] for a in args]).reshape(len(args), -1)
+        self.mean = x.mean(axis=0)
+        self.scale = np.where(x.std(axis=0) > 0., x.std(axis=0), 1.)
+        A = self.features(args)
+        y = np.log(np.maximum(np.asarray(wall_times, dtype=float), 1e-3))
+        penalty = self.ridge*len(y)*np.eye(A.shape[1])
+        penalty[0, 0] = 0.
+        self.coefficients = np.linalg.solve(A.T.dot(A) + penalty, A.T.dot(y))
+        return self
+
+    def predict(self, args):
+        '''predicted wall times [s] of tasks
+
+        :param args: list of dicts of task arguments
+        :return: array of wall times
+        '''
+        if not len(args):
+            return np.empty(0)
+        return np.exp(self.features(args).dot(self.coefficients))
+
+def makespan(costs, workers, order=None):
+    '''time for workers that each take the next task when free to run tasks of known costs
+
+    :param costs: run time of each task
+    :param workers: number of workers
+    :param order: order the tasks are taken in, as given by default
+    :return: time the last task finishes
+    '''
+    costs = np.asarray(costs, dtype=float)
+    free = np.zeros(workers)
+    for i in (range(len(costs)) if order is None else order):
+        free[np.argmin(free)] += costs[i]
+    return free.max()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='status of a work queue of sweep tasks')
+    parser.add_argument('queue', help='queue folder')
+    parser.add_argument('--requeue-stale', action='store_true', help='requeue claimed tasks without a heartbeat')
+    parser.add_argument('--retry-failed', action='store_true', help='requeue failed tasks')
+    parser.add_argument('--reorder', action='store_true', help='order the pending tasks longest predicted first')
+    parser.add_argument('--timeout', type=float, default=300., help='seconds without a heartbeat of a stale task')
+    args = parser.parse_args(argv)
+    queue = WorkQueue(args.queue, timeout=args.timeout)
+    if args.requeue_stale:
+        print('requeued {} stale tasks'.format(len(queue.requeue_stale())))
+    if args.retry_failed:
+        print('requeued {} failed tasks'.format(queue.retry_failed()))
+    if args.reorder:
+        predicted = queue.reorder()
+        if predicted is None:
+            print('too few done tasks to predict, pending tasks shuffled')
+        elif predicted:
+            print('pending tasks reordered, predicted {:.0f} s of runs in total'.format(sum(predicted.values())))
+    print(', '.join('{} {}'.format(n, state) for state, n in queue.status().items()))
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
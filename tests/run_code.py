@@ -7,7 +7,6 @@ import scipy.special as sp
 import dill
 sys.path.append('../')
 import mg_si
-import csv
 import datetime
 
 from mg_si import plot as mplt
@@ -41,12 +40,14 @@ X_Mgs = [1e-5, 0.01, 0.025, 0.05]
 X_Sis = [1e-5, 0.01, 0.025, 0.05]
 #nus = np.array([10**19, 10**20, 10**21])/pl.params.mantle.rho
 nus = np.array([10**19, 10**20, 10**21])/pl.params.mantle.rho
+writer = mg_si.results.ResultWriter('../computed_solutions_new/')
 for nu_present in nus:  #[m^2/s]
     for X_Mg_0 in X_Mgs:
         for X_Si_0 in X_Sis:
             for T_cmb0 in T_cmbs:
                 print(T_cmb0,X_Si_0,X_Mg_0)
                 pl = mg_si.planet.Custom()
+                stats = pl.stats
                 pl.reactions._set_layer_thickness(layer_thickness)
                 pl.reactions._set_overturn_time(overturn)
                 T_um0 = T_cmb0-deltaT0
@@ -63,14 +64,14 @@ for nu_present in nus:  #[m^2/s]
                 T_old = T_um0
                 A,nu0 = pl.mantle_layer.find_arrenhius_params(nu_present, T_present, nu_old, T_old, set_values=True)
 
+                run = 'Tc{:d}_dT{:d}_XM{:.2f}_XS{:.2f}_XO{:.2f}_fMb{:.2f}_Xmb{:.2f}_XSb{:.2f}_nu{:.0e}_lthck{:.0e}_ovt{:.0e}'.format(T_cmb0, deltaT0,
+                        X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn)
                 try :
+                    filepath = writer.stage(run)
+                    if filepath is None:
+                        print('being computed by another process')
+                        continue
                     solution = pl.integrate(times, x0)
-                    filepath = '../computed_solutions_new/Tc{:d}_dT{:d}_XM{:.2f}_XS{:.2f}_XO{:.2f}_fMb{:.2f}_Xmb{:.2f}_XSb{:.2f}_nu{:.0e}_lthck{:.0e}_ovt{:.0e}/'.format(T_cmb0, deltaT0,
-                            X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn)
-                    if not os.path.exists('../computed_solutions_new/'):
-                        os.mkdir('../computed_solutions_new/')
-                    if not os.path.exists(filepath):
-                        os.mkdir(filepath)
                     dill.dump((pl,times,solution), open(filepath+'data.m','wb'))
                     mplt.temperature(pl, times, solution, filepath=filepath)
                     mplt.coremoles(pl, times, solution, filepath=filepath)
@@ -78,20 +79,14 @@ for nu_present in nus:  #[m^2/s]
                     plt.close('all')
                     time = str(datetime.datetime.now())
                     r_i = pl.core_layer.r_i(solution[-1,0], one_off=True)
-                    del pl
-                    csvdata = [time, T_cmb0, deltaT0, r_i, X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn]
-                    with open(r'../computed_solutions_new/run_data.csv', 'a') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(csvdata)
-                    f.close()
+                    csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
                     copyfile('./dynamo_power.py',filepath+'dynamo_power.py')
+                    writer.commit(run, csvdata, **mg_si.summary.present_core(pl, solution), **pl.stats)
+                    del pl
                 except :
                     del pl
                     time = str(datetime.datetime.now())
                     r_i = np.nan
-                    csvdata = [time, T_cmb0, deltaT0, r_i, X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present,layer_thickness,overturn]
-                    with open(r'../computed_solutions_new/run_data.csv', 'a') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(csvdata)
-                    f.close()
-                del csvdata,writer,f
+                    csvdata = [time, r_i, T_cmb0, X_Mg_0, X_Si_0, X_O_0, fraction_MgFe_b, fraction_MgFe_b, X_MgFeO_b, X_SiO2_b, nu_present, deltaT0, layer_thickness, overturn]
+                    writer.fail(run, csvdata, **stats)
+                del csvdata
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import mg_si
+from mg_si.archive import ARCHIVE_PARAMS, TrajectoryArchive, const_yr_to_sec
+
+TIMES = np.linspace(0., 4568e6*const_yr_to_sec, 11)
+# a run at its own uneven output times: T_cmb and T_um falling, the core losing Mg and O
+RUN_TIMES = np.linspace(0., 1., 37)**2*TIMES[-1]
+_s = RUN_TIMES / TIMES[-1]
+SOLUTION = np.column_stack([5700. - 1500.*_s, 2300. - 600.*_s, 4.1e20*(1. - 0.5*_s), 4.9e21 + 0.*_s,
+                            3.2e22 + 0.*_s, 3.3e21*(1. - 0.2*_s)] + [m*(1. + _s) for m in
+                                                                     (8.0e16, 7.6e15, 1.8e16, 6.0e17, 1.4e17)])
+
+
+def _linear(times):
+    '''a run given as a function of time, as a planet.Solution is'''
+    return SOLUTION[0] + (SOLUTION[-1] - SOLUTION[0])*(np.asarray(times)/TIMES[-1])[:, None]
+
+
+def _archive(tmp_path, **kwargs):
+    path = str(tmp_path / 'archive')
+    archive = TrajectoryArchive.create(path, mg_si.planet.Custom(), TIMES, 3, **kwargs)
+    archive.write(0, SOLUTION, {'T_cmb0': 5700., 'r_i': 1.2e6, 'source': 'run_0'}, times=RUN_TIMES)
+    archive.write(2, _linear, {'T_cmb0': 5500.})
+    archive.flush()
+    return path
+
+
+def test_round_trip(tmp_path):
+    archive = TrajectoryArchive(_archive(tmp_path, text_names=('source',)))
+    assert archive.state_names == ['T_cmb', 'T_um', 'Mg', 'Si', 'Fe', 'O', 'MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3']
+    assert archive.core_species == ['Mg', 'Si', 'Fe', 'O']
+    np.testing.assert_array_equal(archive.times, TIMES)
+    np.testing.assert_array_equal(archive.params['written'], [True, False, True])
+    assert archive.params['source'][0] == 'run_0' and archive.params['source'][2] == ''
+    np.testing.assert_array_equal(archive.params['T_cmb0'], [5700., np.nan, 5500.])
+    assert np.isnan(archive.params['r_i'][2])
+    assert archive.param_names == list(ARCHIVE_PARAMS)
+    np.testing.assert_allclose(archive.data[0], np.array([np.interp(TIMES, RUN_TIMES, x) for x in SOLUTION.T]).T)
+    assert np.all(np.isnan(archive.data[1]))
+    np.testing.assert_allclose(archive.data[2], _linear(TIMES))
+    with pytest.raises(ValueError):
+        archive.data[0, 0, 0] = 0.
+
+
+def test_at_and_core_wtp(tmp_path):
+    archive = TrajectoryArchive(_archive(tmp_path))
+    t = 0.5*(TIMES[3] + TIMES[4])
+    np.testing.assert_allclose(archive.at(t, [2])[0], _linear([t])[0])
+    np.testing.assert_allclose(archive.at(TIMES[-1]), archive.data[:, -1])
+    core = mg_si.planet.Custom().reactions.core
+    wt = _linear([t])[0, 2:6]*core.molmass
+    wtp = archive.core_wtp(t)
+    np.testing.assert_allclose(wtp[2], 100*wt/np.sum(wt))
+    np.testing.assert_allclose(np.sum(wtp[archive.params['written']], axis=1), 100.)
+    assert np.all(np.isnan(wtp[1]))
+
+
+def test_float32(tmp_path):
+    archive = TrajectoryArchive(_archive(tmp_path, dtype=np.float32))
+    assert archive.data.dtype == np.float32
+    np.testing.assert_allclose(archive.data[2], _linear(TIMES), rtol=1e-6)
+
+
+def test_version(tmp_path):
+    path = _archive(tmp_path)
+    with open(path + '/archive.json') as f:
+        meta = f.read()
+    with open(path + '/archive.json', 'w') as f:
+        f.write(meta.replace('"version": 1', '"version": 2'))
+    with pytest.raises(ValueError):
+        TrajectoryArchive(path)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import mg_si
+
+
+def _planet(T_cmb0=5700., X_Mg_0=0.01, X_Si_0=0.12, X_O_0=0.08):
+    planet = mg_si.planet.Custom()
+    return planet, np.array(planet.setup(T_cmb0, X_Mg_0, X_Si_0, X_O_0))
+
+
+@pytest.mark.parametrize('t', [0., 1e16])
+def test_dMoles_dT_cached(t):
+    planet, x0 = _planet()
+    core = planet.core_layer
+    calls = []
+    dMoles_dT = planet.reactions.dMoles_dT
+
+    def count(*args, **kwargs):
+        calls.append(1)
+        return dMoles_dT(*args, **kwargs)
+    planet.reactions.dMoles_dT = count
+    dx_dt = planet.ODE(x0, t)
+    # one solve in the core energy balance, shared by C_m, C_s and C_f, and one for the chemistry
+    assert len(calls) == 2
+    cached = {name: getattr(core.current_values, name) for name in ('C_m', 'C_s', 'C_f')}
+    for name, value in cached.items():
+        uncached = getattr(core, name)(x0[0], x0[2:], recompute=True, store_computed=False, time=t)
+        np.testing.assert_array_equal(uncached, value)
+    np.testing.assert_array_equal(planet.ODE(x0, t), dx_dt)
+
+
+@pytest.mark.parametrize('T_cmb', [4200., 4000., 3800.])
+def test_C_r(T_cmb):
+    planet, _ = _planet()
+    core = planet.core_layer
+    assert core.r_i(T_cmb, recompute=True, store_computed=False) > 0.
+    dT = 1e-2
+    r_i = [core.r_i(T, recompute=True, store_computed=False) for T in (T_cmb + dT, T_cmb - dT)]
+    np.testing.assert_allclose(core.C_r(T_cmb, recompute=True), (r_i[0] - r_i[1]) / (2*dT), rtol=1e-6)
+
+
+def test_C_r_before_nucleation():
+    planet, _ = _planet()
+    assert planet.core_layer.r_i(5000., recompute=True, store_computed=False) == 0.
+    assert planet.core_layer.C_r(5000., recompute=True) == 0.
+
+
+def test_sensitivity_central_difference():
+    planet, x0 = _planet()
+    times = np.linspace(0., 300e6*365.25*24*3600, 3)
+    solution, sensitivities = planet.integrate(times, x0, sensitivity=['T_cmb0'])
+    tight = {'rtol': 1e-8, 'T': 1e-10, 'core': 1e-10, 'layer': 1e-10}
+    dT = 1.
+    runs = []
+    for T_cmb0 in (5700. + dT, 5700. - dT):
+        perturbed, x0_p = _planet(T_cmb0=T_cmb0)
+        runs.append(perturbed.integrate(times, x0_p, scaled=True, tol=tight))
+    # the response of the scaled state to a relative change of T_cmb0
+    difference = (runs[0][-1] - runs[1][-1]) / (2*dT) * 5700. / planet.state_scales(x0)
+    assert np.all(np.abs(sensitivities[-1, :, 0] * 5700. / planet.state_scales(x0) - difference) < 2e-3)
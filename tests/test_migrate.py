@@ -0,0 +1,47 @@
+import os
+import numpy as np
+import mg_si
+from mg_si.migrate import find_runs, migrate
+from mg_si.summary import write_summary
+
+TIMES = np.linspace(0., 100e6*365.25*24*3600, 5)
+
+
+def _run(tree, name, planet, x0):
+    '''a run folder with the record of a short run, and its row in the run_data.csv of the tree'''
+    folder = os.path.join(tree, name)
+    os.makedirs(folder)
+    solution = planet.integrate(TIMES, x0, scaled=True)
+    planet.write_record(os.path.join(folder, 'record.npz'), TIMES, solution)
+    write_summary(os.path.join(tree, 'run_data.csv'), dict(planet.run_params, r_i=0.), folder=folder)
+    return solution
+
+
+def test_migrate(tmp_path):
+    tree = str(tmp_path / 'runs')
+    solutions = []
+    for i, T_cmb0 in enumerate((5700., 5500.)):
+        planet = mg_si.planet.Custom()
+        solutions.append(_run(tree, 'run_{}'.format(i), planet, planet.setup(T_cmb0, 0.01, 0.12, 0.08)))
+    # a run with S and C in the core, whose state does not fit the MgSi layout of the archive
+    R = mg_si.reactions
+    light = mg_si.planet.Custom_LightElements(core_species=['Mg', 'Si', 'Fe', 'O', 'S', 'C'],
+                                              mantle_species=['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3', 'FeS'],
+                                              reactions=R.MGSI_REACTION_TABLE + [R.FES_REACTION])
+    pr = light.params.reactions
+    pr.fit_KD_FeS_a, pr.fit_KD_FeS_b, pr.fit_KD_FeS_c = 1.0, -2000., 10.
+    _run(tree, 'run_light', light, light.setup(5700., 0.01, 0.05, 0.08, X_extra={'S': 0.04, 'C': 0.01, 'FeS': 1e-3}))
+    paths = find_runs([tree])
+    assert [os.path.basename(os.path.dirname(path)) for path in paths] == ['run_0', 'run_1', 'run_light']
+
+    archive, report = migrate(str(tmp_path / 'archive'), [tree], times=TIMES, processes=1)
+    assert report.n_found == 3
+    assert report.n_written == 2
+    assert [path for path, error in report.failures] == [paths[2]]
+    assert 'does not match' in report.failures[0][1]
+    assert report.trees[tree] == {'runs': 3, 'csv_rows': 3, 'csv_failed': 0, 'match': True}
+    np.testing.assert_array_equal(archive.params['written'], [True, True, False])
+    np.testing.assert_allclose(archive.params['T_cmb0'][:2], [5700., 5500.])
+    assert archive.params['source'][1] == paths[1]
+    for i, solution in enumerate(solutions):
+        np.testing.assert_allclose(archive.data[i], solution)
@@ -0,0 +1,210 @@
+import numpy as np
+import pytest
+import scipy.integrate as integrate
+import mg_si
+
+# the age of the Earth, in 200 output times
+TIMES = np.linspace(0., 4568e6*365.25*24*3600, 200)
+
+
+def _planet(cls=mg_si.planet.Custom, T_cmb0=5700., X_Mg_0=0.01, X_Si_0=0.12, X_O_0=0.08, **kwargs):
+    planet = cls(**kwargs)
+    return planet, planet.setup(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+
+
+def test_scaled_matches_unscaled():
+    planet, x0 = _planet()
+    unscaled = planet.integrate(TIMES, x0)
+    scaled = planet.integrate(TIMES, x0, scaled=True)
+    # the unscaled run takes atol=1e-4 of moles of order 1e20, so it is good to its rtol=1e-4 per step only
+    np.testing.assert_allclose(scaled[-1], unscaled[-1], rtol=1e-2)
+    np.testing.assert_allclose(scaled[0], x0)
+
+
+def test_tol_needs_scaled():
+    planet, x0 = _planet()
+    with pytest.raises(ValueError):
+        planet.integrate(TIMES, x0, tol={'rtol': 1e-6})
+
+
+def _light_elements():
+    '''a planet with S and C in the core and FeS in the layer; C is in no layer species, so its total is conserved'''
+    R = mg_si.reactions
+    planet = mg_si.planet.Custom_LightElements(core_species=['Mg', 'Si', 'Fe', 'O', 'S', 'C'],
+                                               mantle_species=['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3', 'FeS'],
+                                               reactions=R.MGSI_REACTION_TABLE + [R.FES_REACTION])
+    pr = planet.params.reactions
+    pr.fit_KD_FeS_a, pr.fit_KD_FeS_b, pr.fit_KD_FeS_c = 1.0, -2000., 10.
+    return planet, planet.setup(5700., 0.01, 0.05, 0.08, X_extra={'S': 0.04, 'C': 0.01, 'FeS': 1e-3})
+
+
+@pytest.mark.parametrize('reduced', [False, True])
+def test_element_drift_conserved(reduced):
+    planet, x0 = _light_elements()
+    solution = planet.integrate(TIMES, x0, **({'reduced': True} if reduced else {'scaled': True}))
+    drift = planet.element_drift(solution)
+    assert drift['elements'] == ['Mg', 'Si', 'Fe', 'O', 'S', 'C']
+    np.testing.assert_array_equal(drift['conserved'], [False] * 5 + [True])
+    np.testing.assert_allclose(drift['totals'][0], planet.reactions.network.element_totals(x0[2:]))
+    assert np.all(np.abs(drift['drift'][:, drift['conserved']]) <= planet.scaled_tolerances['rtol'])
+    # the exchanged elements do change, by exchange with the background mantle
+    assert np.all(np.abs(drift['drift'][-1, ~drift['conserved']]) > 1e-3)
+
+
+def test_element_drift_mgsi():
+    planet, x0 = _planet()
+    drift = planet.element_drift(planet.integrate(TIMES, x0, scaled=True))
+    assert drift['elements'] == ['Mg', 'Si', 'Fe', 'O']
+    assert not np.any(drift['conserved'])
+    np.testing.assert_array_equal(drift['drift'][0], 0.)
+
+
+def test_equilibrium_diagnostic():
+    planet, x0 = _planet()
+    out = planet.equilibrium_diagnostic(TIMES, x0)
+    assert out['fallback'] is None
+    assert np.all(out['max_rel_diff'] < 1e-2)
+    np.testing.assert_allclose(out['equilibrium_r_i'], out['kinetic_r_i'], rtol=2e-2)
+    assert out['equilibrium_nfe'] < out['kinetic_nfe']
+    np.testing.assert_allclose(out['equilibrium'][0, :2], x0[:2])
+
+
+def test_equilibrium_history_trimmed():
+    planet, x0 = _planet()
+    trimmed = []
+    trim = planet._trim_equilibrium_history
+
+    def spy():
+        trim()
+        trimmed.append(len(planet._equilibrium_history))
+    planet._trim_equilibrium_history = spy
+    solution = planet.integrate(TIMES, x0, method='equilibrium')
+    assert trimmed and max(trimmed) <= len(TIMES) + 1
+    assert planet._equilibrium_history == []
+    # the compositions dropped are never the nearest to an output time, so the solution is the untrimmed one
+    planet._trim_equilibrium_history = lambda: None
+    np.testing.assert_array_equal(planet.integrate(TIMES, x0, method='equilibrium'), solution)
+
+
+def test_equilibrium_fallback():
+    planet = mg_si.planet.Custom()
+    planet.reactions.set_KD_citation(SiO2='Fischer2015', FeO='Fischer2015')
+    x0 = planet.setup(5700., 0.01, 0.12, 0.08)
+    with pytest.warns(RuntimeWarning, match='kinetic ODE'):
+        solution, info = planet.integrate(TIMES, x0, full_output=True, method='equilibrium')
+    assert 'did not converge' in info['fallback']
+    np.testing.assert_array_equal(solution, planet.integrate(TIMES, x0, scaled=True))
+
+
+def test_split():
+    planet, x0 = _planet()
+    times = np.linspace(0., 200e6*365.25*24*3600, 3)
+    solution, info = planet.integrate(times, x0, full_output=True, method='split')
+    assert planet.stats['nfe'] == info['nfe_thermal'] + info['nfe_chemistry']
+    assert planet.stats['nst'] == info['nst']
+    assert info['err_estimate'][0] == 0.
+    assert np.all(info['err_estimate'] <= 1.)
+    np.testing.assert_array_equal(solution[0], x0)
+    kinetic = planet.integrate(times, x0, scaled=True)
+    assert np.all(np.abs(solution - kinetic) <= 1e-2*planet.state_scales(x0))
+
+
+def test_backward_round_trip():
+    # about the present state of a forward Hirose run from 5500 K
+    planet = mg_si.planet.Custom_backward()
+    x_present = np.array(planet.setup_present(0.0033, 0.111, 0.0115, r_i=1220e3, T_um=1430., T_cmb0=5500.))
+    tight = {'rtol': 1e-9, 'T': 1e-12, 'core': 1e-12}
+    back, info = planet.integrate(TIMES, x_present, full_output=True, tol=tight)
+    assert planet.stats['nfe'] == info['nfe'][-1]
+    assert planet.stats['wall_time'] > 0.
+    np.testing.assert_allclose(back[0], x_present, rtol=1e-12)
+    assert back[-1, 0] > 6000.
+    # the same model, with the layer in equilibrium with the core, run forward from the state it gives at t=0
+    Nc = len(planet.reactions.core.species)
+    scales = planet.state_scales(back[-1])[:2+Nc]
+
+    def forward(y, t):
+        return mg_si.planet.Custom.ODE(planet, planet.full_state(y*scales), t)[:2+Nc]/scales
+    z = integrate.odeint(forward, back[-1, :2+Nc]/scales, TIMES, h0=1e7, rtol=1e-9, atol=1e-12, mxstep=5000000)
+    z = z*scales
+    assert np.all(np.abs(z[-1] - x_present[:2+Nc]) < 1e-4*scales)
+    assert abs(planet.core_layer.r_i(z[-1, 0], one_off=True) - 1220e3) < 1e3
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_checkpoint_resume(tmp_path):
+    planet, x0 = _planet()
+    checkpoint = str(tmp_path / 'run.npz')
+    write = planet.write_checkpoint
+
+    def write_once(*args):
+        write(*args)
+        raise Interrupted()
+    planet.write_checkpoint = write_once
+    with pytest.raises(Interrupted):
+        planet.integrate(TIMES, x0, scaled=True, checkpoint=checkpoint, checkpoint_every=60)
+    settings, saved, info = planet.read_checkpoint(checkpoint)
+    assert len(saved) == 61
+    # a new process resumes the run from the checkpoint
+    planet, x0 = _planet()
+    resumed, resumed_info = planet.integrate(TIMES, x0, full_output=True, scaled=True, checkpoint=checkpoint,
+                                             checkpoint_every=60)
+    np.testing.assert_array_equal(resumed[:61], saved)
+    planet, x0 = _planet()
+    solution, solution_info = planet.integrate(TIMES, x0, full_output=True, scaled=True,
+                                               checkpoint=str(tmp_path / 'uninterrupted.npz'), checkpoint_every=60)
+    np.testing.assert_array_equal(resumed, solution)
+    np.testing.assert_array_equal(resumed_info['nfe'], solution_info['nfe'])
+    np.testing.assert_allclose(solution[-1], planet.integrate(TIMES, x0, scaled=True)[-1], rtol=1e-2)
+    # a finished checkpoint is returned as is
+    np.testing.assert_array_equal(planet.integrate(TIMES, x0, scaled=True, checkpoint=checkpoint,
+                                                   checkpoint_every=60), solution)
+
+
+@pytest.mark.parametrize('change', [{'checkpoint_every': 50}, {'tol': {'rtol': 1e-6}}, {'x0': 'perturbed'}])
+def test_checkpoint_mismatch(tmp_path, change):
+    planet, x0 = _planet()
+    checkpoint = str(tmp_path / 'run.npz')
+    times = TIMES[:21]
+    planet.integrate(times, x0, scaled=True, checkpoint=checkpoint, checkpoint_every=10)
+    kwargs = dict({'scaled': True, 'checkpoint': checkpoint, 'checkpoint_every': 10}, **change)
+    kwargs['x0'] = np.array(x0) * (1. + 1e-9) if change.get('x0') else x0
+    with open(checkpoint, 'rb') as f:
+        before = f.read()
+    with pytest.raises(ValueError):
+        planet.integrate(times, **kwargs)
+    with open(checkpoint, 'rb') as f:
+        assert f.read() == before
+
+
+def test_dense_array_matches_odeint():
+    planet, x0 = _planet()
+    run = planet.integrate(TIMES, x0, dense=True)
+    assert isinstance(run, mg_si.planet.Solution)
+    assert run._times is None
+    np.testing.assert_array_equal(run.times, TIMES)
+    assert planet.stats['nfe'] == run.info['nfe']
+    assert run.info['nst'] == len(run.t) - 1
+    solution = planet.integrate(TIMES, x0, scaled=True)
+    array = run.array()
+    assert array.shape == solution.shape
+    np.testing.assert_allclose(array[0], x0, rtol=1e-12)
+    # both are good to the scaled tolerances, rtol=1e-4 per step
+    assert np.all(np.abs(array - solution) <= 1e-2*planet.state_scales(x0))
+    np.testing.assert_allclose(run.x[-1], array[-1], rtol=1e-12)
+    np.testing.assert_allclose(run(TIMES[100]), array[100], rtol=1e-12)
+
+
+def test_dense_sample():
+    planet, x0 = _planet()
+    times = TIMES[:51]**1.5/TIMES[50]**0.5
+    run = planet.integrate(times, x0, dense=True)
+    # uneven times are kept as they are
+    np.testing.assert_array_equal(run.times, times)
+    sample_times, states = run.sample(11)
+    np.testing.assert_allclose(sample_times, np.linspace(0., times[-1], 11))
+    np.testing.assert_allclose(states, run.array(sample_times))
+    np.testing.assert_allclose(states[[0, -1]], run.x[[0, -1]], rtol=1e-12)
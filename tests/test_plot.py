@@ -0,0 +1,28 @@
+import os
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import mg_si
+from mg_si import plot as mplt
+from mg_si.summary import present_core
+
+
+def test_plots_keep_species(tmp_path):
+    planet = mg_si.planet.Custom()
+    x0 = np.array(planet.setup(5700., 0.01, 0.12, 0.08))
+    times = np.linspace(0., 4568e6*365.25*24*3600, 21)
+    solution = x0*np.linspace(1., 0.8, len(times))[:, None]
+    core = list(planet.params.reactions.core.species)
+    mantle = list(planet.params.reactions.mantle.species)
+    present = present_core(planet, solution)
+    # plotted twice, as the control scripts do for a rerun
+    for _ in range(2):
+        for plot, savename in ((mplt.temperature, 'temperatures.png'), (mplt.coremoles, 'coremoles.png'),
+                               (mplt.composition, 'composition.png')):
+            plot(planet, times, solution, filepath=str(tmp_path) + '/', N_approx=10)
+            assert os.path.exists(str(tmp_path / savename))
+        plt.close('all')
+    assert list(planet.params.reactions.core.species) == core
+    assert list(planet.params.reactions.mantle.species) == mantle
+    assert present_core(planet, solution) == present
@@ -0,0 +1,221 @@
+import numpy as np
+import pytest
+import mg_si
+
+# a Hirose-like state: moles of Mg, Si, Fe, O in the core and MgO, SiO2, FeO, MgSiO3, FeSiO3 in the layer, with
+# dln(K)/dT of the five reactions and the erosion terms of the layer species
+MOLES = np.array([4.0807e+20, 4.8969e+21, 3.2238e+22, 3.2646e+21, 7.9768e+16, 7.6115e+15, 1.8138e+16, 6.0381e+17,
+                  1.3729e+17])
+DLNK_DT = np.array([1.2e-4, 2.5e-4, 8.0e-5, -3.0e-5, 4.0e-5])
+DM_ERODE = np.array([1.0e12, -2.0e11, 5.0e11, -3.0e12, 7.0e11])
+
+# dM_i/dT of the sympy closed forms (MgSi.dM_*_dTc) the network replaced, at the state above
+CLOSED_FORMS = np.array([7.1954565383902296e+16, 7.8847569103598880e+16, 1.6389677451731588e+16,
+                         2.4603938104283171e+17, -8.3903933090866100e+15, -8.0232776328721800e+14,
+                         -1.9103081862356122e+15, -6.3562172074815712e+16, -1.4480569265495974e+16])
+
+
+def test_dMoles_dT_matches_closed_forms():
+    network = mg_si.reactions.MgSi().network
+    dM_dT = network.dMoles_dT(MOLES, DLNK_DT, DM_ERODE)
+    np.testing.assert_allclose(dM_dT, CLOSED_FORMS, rtol=1e-12)
+
+
+def test_dMoles_dT_balances_elements():
+    network = mg_si.reactions.MgSi().network
+    dM_dT = network.dMoles_dT(MOLES, DLNK_DT, DM_ERODE)
+    # the core and layer together only exchange elements with the background mantle
+    np.testing.assert_allclose(network.E @ dM_dT, -network.E_m @ DM_ERODE, rtol=1e-9, atol=1e-9*np.max(np.abs(dM_dT)))
+
+
+def test_dMoles_dT_stack():
+    network = mg_si.reactions.MgSi().network
+    scale = np.array([1., 0.5, 2.])[:, None]
+    Moles = MOLES * np.array([1., 1.1, 0.9])[:, None]
+    dM_dT = network.dMoles_dT(Moles, DLNK_DT * scale, DM_ERODE * scale)
+    for i in range(3):
+        np.testing.assert_allclose(dM_dT[i], network.dMoles_dT(Moles[i], DLNK_DT * scale[i], DM_ERODE * scale[i]),
+                                   rtol=1e-12)
+
+
+# K_D and dK_D/dT of the func_KD_*_val if/elif chains the bound fits replaced, at T_KD with X_Si = X_O = 0.1, for
+# every citation they accepted for each species (SiO2 Badro2015 and MgO other than Badro2015 raised there)
+T_KD = np.array([3500., 4200., 5700.])
+KD_LEGACY = {
+    ('MgO', 'Badro2015'): ([7.14496326075512e-05, 0.0005623413251903486, 0.008490775702033077],
+                           [2.5270096733498675e-07, 1.3811613360616682e-06, 1.1322456222060658e-05]),
+    ('SiO2', 'Hirose2017'): ([2.630744562212244e-05, 0.0003552525743650568, 0.010913968536044642],
+                             [1.1739030200822618e-07, 1.1008503382816717e-06, 1.836211120809377e-05]),
+    ('SiO2', 'Fischer2015'): ([0.0027724079967417757, 0.012181879120101154, 0.0854238119302013], [0., 0., 0.]),
+    ('FeO', 'Hirose2017'): ([0.06888041759779251, 0.12075259599597139, 0.25274750503021837],
+                            [6.628719210210444e-05, 8.0698940992843e-05, 9.170797543929002e-05]),
+    ('FeO', 'Badro2015'): ([0.2962881523396265, 1.0385527772220855, 5.409509586110197], [0., 0., 0.]),
+    ('FeO', 'Fischer2015'): ([2.443430552693972, 2.6505337179010797, 2.950017290173116],
+                             [-0.0014044849217672807, -0.0010580054925587148, -0.0006393343221851248]),
+}
+# the same for FeO Fischer2015 at 120 GPa
+KD_LEGACY_120 = ([1.8559720367285215, 2.107703534473479, 2.4916740436271345],
+                 [-0.000920990086386295, -0.0007263242738533939, -0.0004661880450896871])
+
+
+def _func_KD(rx, species, *args, **kwargs):
+    if species == 'SiO2':
+        return rx.func_KD_SiO2_val(0.1, 0.1, *args, **kwargs)
+    return getattr(rx, 'func_KD_{}_val'.format(species))(*args, **kwargs)
+
+
+@pytest.mark.parametrize('species, citation', sorted(KD_LEGACY))
+def test_bound_KD_matches_legacy(species, citation):
+    K, dK_dT = KD_LEGACY[species, citation]
+    rx = mg_si.reactions.MgSi()
+    # per call, as the comparison runs did
+    np.testing.assert_allclose(_func_KD(rx, species, T_KD, ParamCitation=citation), (K, dK_dT), rtol=1e-13)
+    # bound once, scalar temperatures through the K_D cache
+    rx.set_KD_citation(**{species: citation})
+    for i, T in enumerate(T_KD):
+        np.testing.assert_allclose(_func_KD(rx, species, T), (K[i], dK_dT[i]), rtol=1e-13)
+
+
+def test_bound_KD_pressure():
+    rx = mg_si.reactions.MgSi()
+    np.testing.assert_allclose(rx.func_KD_FeO_val(T_KD, P_inp_base=120e6, ParamCitation='Fischer2015'),
+                               KD_LEGACY_120, rtol=1e-13)
+
+
+def test_KD_models_bound_once():
+    rx = mg_si.reactions.MgSi()
+    rx.func_KD_FeO_val(4000., ParamCitation='Fischer2015')
+    models = dict(rx._KD_models)
+    rx.func_KD_FeO_val(4500., ParamCitation='Fischer2015')
+    rx.func_KD_SiO2_val(0.1, 0.1, 4500., ParamCitation='Fischer2015')
+    rx.func_KD_FeO_val(4500., P_inp_base=120e6)
+    assert len(rx._KD_models) == 3
+    assert all(rx._KD_models[key] is model for key, model in models.items())
+    rx.bind_KD_model()
+    assert rx._KD_models == {}
+
+
+def test_KD_cache_eviction():
+    cache = mg_si.reactions.KD_Cache(maxsize=3)
+    model = mg_si.reactions.KD_Model()
+    for T in (4000., 4100., 4200.):
+        cache(model, T)
+    # 4000 K becomes the most recently used, so 4100 K is evicted by 4300 K
+    cache(model, 4000.)
+    cache(model, 4300.)
+    assert cache.info()['size'] == 3
+    cache(model, 4000.)
+    cache(model, 4100.)
+    info = cache.info()
+    assert (info['hits'], info['misses'], info['size'], info['maxsize']) == (2, 5, 3, 3)
+    np.testing.assert_allclose(cache(model, 4100.), model(4100.), rtol=0.)
+
+
+def test_KD_cache_hit_rate():
+    cache = mg_si.reactions.KD_Cache()
+    assert cache.info()['hit_rate'] == 0.
+    model = mg_si.reactions.KD_Model()
+    for T in (4000., 4000., 4000., 4100.):
+        cache(model, T)
+    assert cache.info()['hit_rate'] == 0.5
+    cache.clear()
+    assert cache.info() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 256, 'hit_rate': 0.}
+
+
+def test_KD_cache_rebound_citation():
+    rx = mg_si.reactions.MgSi()
+    rx.KD_cache = mg_si.reactions.KD_Cache()
+    K, _ = rx.KD_vals(4200.)
+    np.testing.assert_allclose(K[1], KD_LEGACY['SiO2', 'Hirose2017'][0][1], rtol=1e-13)
+    rx.set_KD_citation(SiO2='Fischer2015')
+    K, _ = rx.KD_vals(4200.)
+    np.testing.assert_allclose(K[1], KD_LEGACY['SiO2', 'Fischer2015'][0][1], rtol=1e-13)
+    assert rx.KD_cache_info()['misses'] == 2
+    # new coefficients of a 'from_params' citation are a new key once bound
+    pr = rx.params.reactions
+    pr.fit_KD_FeO_a, pr.fit_KD_FeO_b, pr.fit_KD_FeO_c = 0.60, -3800., 22.
+    rx.set_KD_citation(FeO='from_params')
+    np.testing.assert_allclose(rx.KD_vals(4200.)[0][2], KD_LEGACY['FeO', 'Fischer2015'][0][1], rtol=1e-13)
+    pr.fit_KD_FeO_a = 0.70
+    rx.bind_KD_model()
+    np.testing.assert_allclose(rx.KD_vals(4200.)[0][2], KD_LEGACY['FeO', 'Fischer2015'][0][1]*10**0.1, rtol=1e-13)
+    rx.set_KD_citation(SiO2='Hirose2017', FeO='Hirose2017')
+    rx.KD_vals(4200.)
+    assert rx.KD_cache_info()['hits'] == 1
+
+
+def _light_elements(**kwargs):
+    '''a planet with S and C in the core and FeS in the layer, set up at 5700 K'''
+    R = mg_si.reactions
+    planet = mg_si.planet.Custom_LightElements(core_species=['Mg', 'Si', 'Fe', 'O', 'S', 'C'],
+                                               mantle_species=['MgO', 'SiO2', 'FeO', 'MgSiO3', 'FeSiO3', 'FeS'],
+                                               reactions=R.MGSI_REACTION_TABLE + [R.FES_REACTION])
+    pr = planet.params.reactions
+    pr.fit_KD_FeS_a, pr.fit_KD_FeS_b, pr.fit_KD_FeS_c = 1.0, -2000., 10.
+    for name, value in kwargs.items():
+        setattr(pr, name, value)
+    x0 = planet.setup(5700., 0.01, 0.05, 0.08, X_extra={'S': 0.04, 'C': 0.01, 'FeS': 1e-3})
+    return planet, np.array(x0)
+
+
+@pytest.mark.parametrize('T_cmb0, X_Mg_0, X_Si_0, X_O_0', [(5700., 0.01, 0.12, 0.08), (5500., 0.02, 0.03, 0.1)])
+def test_light_elements_default_species(T_cmb0, X_Mg_0, X_Si_0, X_O_0):
+    mgsi = mg_si.planet.Custom()
+    light = mg_si.planet.Custom_LightElements()
+    x0 = np.array(mgsi.setup(T_cmb0, X_Mg_0, X_Si_0, X_O_0))
+    np.testing.assert_allclose(light.setup(T_cmb0, X_Mg_0, X_Si_0, X_O_0), x0, rtol=1e-12)
+    times = np.linspace(0., 2e9*365.25*24*3600, 5)
+    # at the initial state and halfway through a run, once the layer has grown and the core has lost Mg and O
+    for x, t in zip((x0, mgsi.integrate(times, x0)[2]), (1e15, times[2])):
+        dTc_dt = mgsi.ODE(x, t)[0]
+        expected = mgsi.reactions.dMoles_dT(Moles=x[2:], T_cmb=x[0], dTdt=dTc_dt, time=t)
+        dM_dT = light.reactions.dMoles_dT(Moles=x[2:], T_cmb=x[0], dTdt=dTc_dt, time=t)
+        np.testing.assert_allclose(dM_dT, expected, rtol=1e-10)
+        np.testing.assert_allclose(light.ODE(x, t), mgsi.ODE(x, t), rtol=1e-10)
+
+
+def test_light_elements_element_balance():
+    planet, x0 = _light_elements()
+    rx = planet.reactions
+    network = rx.network
+    assert network.elements == ['Mg', 'Si', 'Fe', 'O', 'S', 'C']
+    np.testing.assert_array_equal(network.inert, [False] * 5 + [True] + [False] * 6)
+    t = 1e15
+    for x in (x0, x0 * np.array([1., 1., 0.99, 1., 1., 1., 1., 1., 1.3, 1.2, 1., 1.1, 1., 2.])):
+        dTc_dt = planet.ODE(x, t)[0]
+        dM_dT = np.array(rx.dMoles_dT(Moles=x[2:], T_cmb=x[0], dTdt=dTc_dt, time=t))
+        dM_erode = np.array(rx.dMm_b(Moles=x[2:], dTdt=dTc_dt, time=t))
+        # Fe, S and C are not gated, so the core and layer exchange them only with the background mantle; C is in no
+        # layer species, so its total is conserved
+        balance = network.E @ dM_dT + network.E_m @ dM_erode
+        scale = network.E @ np.abs(dM_dT) + network.E_m @ np.abs(dM_erode)
+        for element in ('Fe', 'S'):
+            i = network.elements.index(element)
+            assert abs(balance[i]) <= 1e-10 * scale[i]
+        assert dM_dT[network.species.index('C')] == 0.
+
+
+def test_light_elements_fit_derivative():
+    # the same coefficients give the same K and dK/dT as a 'fit' reaction and as a 'from_params' K_D fit
+    fit = {'fit_KD_FeO_a': 0.60, 'fit_KD_FeO_b': -3800., 'fit_KD_FeO_c': 22.}
+    R = mg_si.reactions
+    table = [dict(rx, K='fit') if rx['name'] == 'FeO' else rx for rx in R.MGSI_REACTION_TABLE]
+    light = R.LightElements(reactions=table)
+    kd = R.MgSi()
+    for rx in (light, kd):
+        for name, value in fit.items():
+            setattr(rx.params.reactions, name, value)
+    light.bind_KD_model()
+    kd.set_KD_citation(FeO='from_params')
+    K, dK_dT = light.exchange_K(T_KD)
+    np.testing.assert_allclose(K[2], KD_LEGACY['FeO', 'Fischer2015'][0], rtol=1e-13)
+    np.testing.assert_allclose(dK_dT[2], KD_LEGACY['FeO', 'Fischer2015'][1], rtol=1e-13)
+    np.testing.assert_allclose(dK_dT[2], kd.KD_model(T_KD)[1][2], rtol=1e-13)
+    # a reaction with no from_params convention takes both b and c, unless told otherwise
+    planet, _ = _light_elements()
+    T = 4200.
+    K, dK_dT = planet.reactions.exchange_K(T)
+    np.testing.assert_allclose(dK_dT[3], K[3] * np.log(10.) * (2000. - 10. * 139.) / T**2, rtol=1e-13)
+    planet, _ = _light_elements(fit_KD_FeS_dK_dT=('c',))
+    K, dK_dT = planet.reactions.exchange_K(T)
+    np.testing.assert_allclose(dK_dT[3], K[3] * np.log(10.) * -10. * 139. / T**2, rtol=1e-13)
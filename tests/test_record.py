@@ -0,0 +1,101 @@
+import types
+import numpy as np
+import pytest
+from mg_si.record import RECORD_VERSION, StoragePolicy, read_record, round_mantissa, write_record
+
+# a smooth run: T_cmb and T_um falling, moles of the core and layer species drifting, at uneven output times
+TIMES = np.sort(np.random.RandomState(0).uniform(0., 4.568e9*365.25*24*3600, 300))
+TIMES[0] = 0.
+_s = TIMES / TIMES[-1]
+SOLUTION = np.column_stack([5700. - 1500.*_s, 2300. - 600.*_s] +
+                           [m*(1. + 0.3*np.sin(3.*_s + i)) for i, m in
+                            enumerate([4.1e20, 4.9e21, 3.2e22, 3.3e21, 8.0e16, 7.6e15, 1.8e16, 6.0e17, 1.4e17])])
+RECORD = {'version': RECORD_VERSION, 'planet_class': 'Custom_MgSi'}
+
+
+def _round_trip(tmp_path, policy, solution=SOLUTION, compress=False):
+    filename = str(tmp_path / 'run.npz')
+    write_record(filename, RECORD, TIMES, solution, compress=compress, policy=policy)
+    return read_record(filename)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_full_round_trip(tmp_path, compress):
+    record, times, solution = _round_trip(tmp_path, None, compress=compress)
+    assert record['storage'] is None
+    assert record['planet_class'] == 'Custom_MgSi'
+    np.testing.assert_array_equal(times, TIMES)
+    np.testing.assert_array_equal(solution, SOLUTION)
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma', 'zstd', 'blosc'])
+def test_lossless_policy_round_trip(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    elif compression == 'blosc':
+        pytest.importorskip('blosc')
+    policy = StoragePolicy(compression=compression, chunk_rows=64)
+    record, times, solution = _round_trip(tmp_path, policy)
+    assert record['storage'] == policy.settings()
+    np.testing.assert_array_equal(times, TIMES)
+    np.testing.assert_array_equal(solution, SOLUTION)
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_reduced_precision_round_trip(tmp_path, compression):
+    policy = StoragePolicy(thermal_dtype='float32', mole_rtol=1e-6, compression=compression, chunk_rows=64)
+    record, times, solution = _round_trip(tmp_path, policy)
+    assert solution.dtype == np.float64
+    np.testing.assert_array_equal(times, TIMES)
+    np.testing.assert_allclose(solution[:, :2], SOLUTION[:, :2], rtol=np.finfo(np.float32).eps)
+    assert np.all(np.abs(solution[:, 2:] - SOLUTION[:, 2:]) <= 0.5e-6*np.abs(SOLUTION[:, 2:]))
+
+
+def test_N_times_round_trip(tmp_path):
+    policy = StoragePolicy(N_times=50, compression='zlib')
+    record, times, solution = _round_trip(tmp_path, policy)
+    assert record['storage']['N_times'] == 50
+    np.testing.assert_allclose(times, np.linspace(TIMES[0], TIMES[-1], 50))
+    np.testing.assert_allclose(solution[[0, -1]], SOLUTION[[0, -1]], rtol=1e-14)
+    x = StoragePolicy.reconstruct(times, solution, TIMES)
+    np.testing.assert_allclose(x, SOLUTION, rtol=1e-3)
+
+
+def test_steps_round_trip(tmp_path):
+    steps = TIMES[::7]
+    run = types.SimpleNamespace(t=steps, x=SOLUTION[::7], array=lambda times: SOLUTION)
+    policy = StoragePolicy(steps=True)
+    record, times, solution = _round_trip(tmp_path, policy, solution=run)
+    np.testing.assert_array_equal(times, steps)
+    np.testing.assert_array_equal(solution, SOLUTION[::7])
+
+
+def test_steps_need_a_solution(tmp_path):
+    with pytest.raises(ValueError):
+        _round_trip(tmp_path, StoragePolicy(steps=True))
+
+
+def test_N_times_and_steps():
+    with pytest.raises(ValueError):
+        StoragePolicy(N_times=50, steps=True)
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        _round_trip(tmp_path, StoragePolicy(compression='gzip'))
+
+
+def test_newer_version(tmp_path):
+    filename = str(tmp_path / 'run.npz')
+    write_record(filename, dict(RECORD, version=RECORD_VERSION + 1), TIMES, SOLUTION)
+    with pytest.raises(ValueError):
+        read_record(filename)
+
+
+@pytest.mark.parametrize('rtol', [1e-3, 1e-6, 1e-9])
+def test_round_mantissa(rtol):
+    x = SOLUTION[:, 2:].ravel()
+    rounded = round_mantissa(x, rtol)
+    assert np.all(np.abs(rounded - x) <= 0.5*rtol*np.abs(x))
+    drop = 52 - int(np.ceil(-np.log2(rtol)))
+    assert np.all(rounded.view(np.uint64) & np.uint64((1 << drop) - 1) == 0)
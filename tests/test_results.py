@@ -0,0 +1,99 @@
+import os
+import socket
+import subprocess
+import sys
+import numpy as np
+from mg_si.results import RUN_SUMMARY, STAGING_OWNER, ResultWriter
+from mg_si.summary import read_summary, write_summary
+
+RUN = 'Tc5700.0_XM0.010_XS0.120_XO0.080'
+VALUES = {'r_i': 1.2e6, 'T_cmb0': 5700., 'X_Mg_0': 0.01, 'X_Si_0': 0.12, 'X_O_0': 0.08}
+
+
+def _writers(tmp_path):
+    '''two writers of one sweep, A with the id of this process and B with that of its (live) parent'''
+    a = ResultWriter(str(tmp_path), shard='run_data.a.csv')
+    b = ResultWriter(str(tmp_path), shard='run_data.b.csv')
+    b.id = '{}.{}'.format(socket.gethostname(), os.getppid())
+    return a, b
+
+
+def _dead_id():
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    proc.wait()
+    return '{}.{}'.format(socket.gethostname(), proc.pid)
+
+
+def test_stage_refused_while_owner_alive(tmp_path):
+    a, b = _writers(tmp_path)
+    staging = a.stage(RUN)
+    assert staging == a.staging(RUN)
+    assert b.stage(RUN) is None
+    assert a.stage(RUN) == staging
+    with open(staging + STAGING_OWNER) as f:
+        assert f.read() == a.id
+
+
+def test_stage_refused_for_other_host(tmp_path):
+    a, b = _writers(tmp_path)
+    a.id = 'elsewhere.{}'.format(os.getpid())
+    a.stage(RUN)
+    assert b.stage(RUN) is None
+    assert b.stage(RUN, take_over=True) == b.staging(RUN)
+
+
+def test_stage_taken_over_from_dead_owner(tmp_path):
+    a, b = _writers(tmp_path)
+    a.id = _dead_id()
+    staging = a.stage(RUN)
+    with open(staging + 'checkpoint.npz', 'w') as f:
+        f.write('checkpoint')
+    assert b.stage(RUN) == staging
+    assert os.path.exists(staging + 'checkpoint.npz')
+    with open(staging + STAGING_OWNER) as f:
+        assert f.read() == b.id
+
+
+def test_commit_loser(tmp_path):
+    a, b = _writers(tmp_path)
+    a.stage(RUN)
+    b.stage(RUN, take_over=True)
+    assert b.commit(RUN, VALUES)
+    assert b.done(RUN)
+    # A was still running the requeued run and finishes second
+    a_staging = a.stage(RUN, take_over=True)
+    assert not a.commit(RUN, dict(VALUES, r_i=1.1e6))
+    assert not os.path.exists(a_staging)
+    table = read_summary(os.path.join(str(tmp_path), 'run_data*.csv'))
+    assert len(table) == 1
+    assert table['r_i'][0] == 1.2e6
+    assert table['folder'][0] == os.path.join(str(tmp_path), RUN)
+
+
+def test_fail(tmp_path):
+    a, _ = _writers(tmp_path)
+    staging = a.stage(RUN)
+    a.fail(RUN, VALUES)
+    assert os.path.exists(staging)
+    assert not a.done(RUN)
+    table = read_summary(a.shard)
+    assert len(table) == 1
+    assert np.isnan(table['r_i'][0])
+
+
+def test_repair(tmp_path):
+    a, b = _writers(tmp_path)
+    a.stage('failed')
+    a.fail('failed', VALUES)
+    b.stage(RUN + '_2')
+    b.commit(RUN + '_2', VALUES)
+    # A dies between renaming the staging folder of RUN and appending its row to its shard
+    staging = a.stage(RUN)
+    write_summary(staging + RUN_SUMMARY, VALUES, folder=staging)
+    os.rename(staging, a.folder(RUN))
+    assert b.repair() == 1
+    assert b.repair() == 0
+    table = read_summary(os.path.join(str(tmp_path), 'run_data*.csv'))
+    committed = table[np.isfinite(table['r_i'])]
+    assert sorted(os.path.normpath(f) for f in committed['folder']) == [
+        os.path.join(str(tmp_path), RUN), os.path.join(str(tmp_path), RUN + '_2')]
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from mg_si.summary import LAYOUTS, LEGACY_LAYOUTS, SUMMARY_NAMES, read_summary, write_summary
+
+TIME = '2019-03-01 12:30:15.250000'
+
+# a value of every legacy column, by name
+VALUES = {'T_cmb0': 5700., 'T_um0': 2300., 'deltaT0': 2800., 'r_i': 1.2e6, 'X_Mg_0': 0.01, 'X_Si_0': 0.12,
+          'X_O_0': 0.08, 'wpms': 0.5, 'wpss': 6.5, 'wpos': 2.5, 'fraction_MgFe_b': 0.8, 'MgNumFp': 0.8,
+          'MgNumPv': 0.9, 'X_MgFeO_b': 0.16, 'X_SiO2_b': 0.01, 'nu_present': 1e21, 'layer_thickness': 100.,
+          'overturn': 600., 'wt_Mg': 0.4, 'wt_Si': 6.1, 'wt_O': 2.2}
+
+
+def _row(names, folder='run_0'):
+    return ','.join(TIME if name == 'time' else folder if name == 'folder' else repr(VALUES[name]) for name in names)
+
+
+def _write(tmp_path, lines, name='run_data0.csv'):
+    path = tmp_path / name
+    path.write_text(''.join(line + '\n' for line in lines))
+    return str(path)
+
+
+@pytest.mark.parametrize('n', sorted(LEGACY_LAYOUTS) + [18])
+def test_read_layout(tmp_path, n):
+    names = LAYOUTS[n]
+    table = read_summary(_write(tmp_path, [_row(names)] * 3))
+    assert len(table) == 3
+    assert np.all(table['time'] == np.datetime64(TIME, 'us'))
+    for name in SUMMARY_NAMES[1:-1]:
+        if name in names:
+            np.testing.assert_array_equal(table[name], VALUES[name])
+        elif name in ('MgNumFp', 'MgNumPv') and 'fraction_MgFe_b' in names:
+            np.testing.assert_array_equal(table[name], VALUES['fraction_MgFe_b'])
+        else:
+            assert np.all(np.isnan(table[name]))
+    if 'folder' in names:
+        assert np.all(table['folder'] == str(tmp_path / 'run_0'))
+    else:
+        assert np.all(table['folder'] == '')
+
+
+def test_malformed_cell(tmp_path):
+    names = LEGACY_LAYOUTS[14]
+    bad = _row(names).split(',')
+    bad[names.index('X_Si_0')] = '0.1.2'
+    table = read_summary(_write(tmp_path, [_row(names), ','.join(bad), _row(names)]))
+    assert len(table) == 3
+    assert np.isnan(table['X_Si_0'][1])
+    np.testing.assert_array_equal(table['X_Si_0'][[0, 2]], VALUES['X_Si_0'])
+    for name in names[1:]:
+        if name != 'X_Si_0':
+            np.testing.assert_array_equal(table[name], VALUES[name])
+
+
+def test_malformed_time(tmp_path):
+    names = LEGACY_LAYOUTS[13]
+    bad = _row(names).split(',')
+    bad[0] = 'yesterday'
+    table = read_summary(_write(tmp_path, [_row(names), ','.join(bad)]))
+    assert table['time'][0] == np.datetime64(TIME, 'us')
+    assert np.isnat(table['time'][1])
+    np.testing.assert_array_equal(table['r_i'], VALUES['r_i'])
+
+
+def test_skip_partial_rows(tmp_path):
+    names = LEGACY_LAYOUTS[14]
+    path = _write(tmp_path, [_row(names), _row(names)[:40]])
+    with open(path, 'a') as f:
+        f.write(_row(names))
+    assert len(read_summary(path)) == 1
+
+
+def test_mixed_shards(tmp_path):
+    _write(tmp_path, [_row(LEGACY_LAYOUTS[14])] * 2, 'run_data0.csv')
+    _write(tmp_path, [_row(LEGACY_LAYOUTS[16])] * 3, 'run_data1.csv')
+    values = dict(VALUES, r_i=1.3e6, time=TIME, nfe=996)
+    write_summary(str(tmp_path / 'run_data2.csv'), values, folder=str(tmp_path / 'run_2'))
+    table = read_summary(str(tmp_path / 'run_data*.csv'))
+    assert len(table) == 6
+    np.testing.assert_array_equal(table['r_i'], [1.2e6]*5 + [1.3e6])
+    assert table['nfe'][-1] == 996
+    assert table['folder'][-1] == str(tmp_path / 'run_2')
+    assert len(read_summary(str(tmp_path / 'run_data*.csv'), where=lambda chunk: chunk['r_i'] > 1.25e6)) == 1
@@ -0,0 +1,62 @@
+import numpy as np
+from mg_si.reactions import KD_PARAM_NAMES
+from mg_si.uncertainty import ENTROPY_TERMS, KD_Ensemble, draw_KD_fits
+
+TIMES = np.linspace(0., 4568e6*365.25*24*3600, 11)
+
+
+class StubEnsemble(KD_Ensemble):
+    '''an ensemble whose members are histories set by the drawn FeO fit, 'same' for all draws or 'failed' to raise'''
+    def __init__(self, members='drawn'):
+        super(StubEnsemble, self).__init__({}, times=TIMES, N_approx=5)
+        self.members = members
+
+    def run_member(self, draw):
+        if self.members == 'failed':
+            raise ValueError('no equilibrium initial mantle')
+        a = 1. if self.members == 'same' else draw[KD_PARAM_NAMES['FeO'] + '_a']
+        member = {'r_i': a*np.linspace(0., 1.2e6, len(self.times)), 'wt': a*np.ones((4, len(self.times))),
+                  'species': ['Mg', 'Si', 'Fe', 'O'], 't_E': np.linspace(0., self.times[-1], self.N_approx)}
+        for name in ENTROPY_TERMS:
+            member[name] = a*np.ones(self.N_approx)
+        return member
+
+
+def test_draw_KD_fits():
+    draws = draw_KD_fits({'FeO': 'Fischer2015'}, N=3, rng=np.random.default_rng(0))
+    assert len(draws) == 3
+    assert all(draw['ParamCitationFeO'] == 'from_params' for draw in draws)
+    assert len({draw['fit_KD_FeO_a'] for draw in draws}) == 3
+
+
+def test_run_converges():
+    result = StubEnsemble('same').run(max_runs=100, min_runs=4, batch=4, processes=1, patience=2, seed=0)
+    # the quantiles are set after the first batch and unchanged after the next two
+    assert result.converged
+    assert result.n_runs == 12
+    assert [n for n, change in result.convergence] == [8, 12]
+    assert all(change == 0. for n, change in result.convergence)
+    np.testing.assert_allclose(result.r_i[:, -1], 1.2e6)
+    assert set(result.E) == set(ENTROPY_TERMS)
+    assert len(result.draws) == 12
+    assert result.failures == []
+
+
+def test_run_max_runs():
+    result = StubEnsemble().run(max_runs=10, min_runs=4, batch=4, processes=1, rtol=0., seed=0)
+    assert not result.converged
+    assert result.n_runs == 10
+    a = [draw['fit_KD_FeO_a'] for draw in result.draws]
+    np.testing.assert_allclose(result.r_i[:, -1], 1.2e6*np.quantile(a, result.levels))
+    np.testing.assert_allclose(result.wt['Fe'][:, 0], np.quantile(a, result.levels))
+
+
+def test_run_empty():
+    result = StubEnsemble('failed').run(max_runs=6, batch=4, processes=1, seed=0)
+    assert result.n_runs == 0
+    assert not result.converged
+    assert result.r_i is None and result.t_E is None
+    assert result.wt == {} and result.E == {}
+    assert len(result.failures) == 6
+    assert all('no equilibrium initial mantle' in error for draw, error in result.failures)
+    np.testing.assert_array_equal(result.times, TIMES)
@@ -0,0 +1,131 @@
+import os
+import numpy as np
+import pytest
+from mg_si.calibration import BADRO_SEISMIC_O_SI
+from mg_si.results import STAGING_SUFFIX
+from mg_si.summary import LEGACY_LAYOUTS, write_summary
+from mg_si.views import STANDARD_VIEWS, RunView, folder_values, list_views, match_folders
+
+TIME = '2019-03-01 12:30:15.250000'
+VALUES = {'T_cmb0': 5700., 'X_Mg_0': 0.01, 'X_Si_0': 0.12, 'X_O_0': 0.08, 'MgNumFp': 0.8, 'MgNumPv': 0.9,
+          'X_MgFeO_b': 0.16, 'X_SiO2_b': 0.01, 'nu_present': 1e21, 'deltaT0': 2800., 'layer_thickness': 100.,
+          'overturn': 600.}
+R_I = {'r_i': (1098e3, 1342e3)}
+
+
+def _name(T_cmb0, X_Mg_0=0.01, X_Si_0=0.12, X_O_0=0.08):
+    return 'Tc{:.1f}_XM{:.3f}_XS{:.3f}_XO{:.3f}'.format(T_cmb0, X_Mg_0, X_Si_0, X_O_0)
+
+
+def _run(sweep, r_i, T_cmb0, shard='run_data0.csv', **values):
+    '''a run folder and its summary row'''
+    folder = os.path.join(sweep, _name(T_cmb0))
+    os.makedirs(folder)
+    values = dict(VALUES, r_i=r_i, T_cmb0=T_cmb0, time=TIME, **values)
+    write_summary(os.path.join(sweep, shard), values, folder=folder)
+    return os.path.basename(folder)
+
+
+def _legacy(sweep, rows, shard='run_data1.csv'):
+    '''headerless rows of the control scripts, without a folder column, of (r_i, T_cmb0)'''
+    names = LEGACY_LAYOUTS[14]
+    with open(os.path.join(sweep, shard), 'a') as f:
+        for r_i, T_cmb0 in rows:
+            values = dict(VALUES, r_i=r_i, T_cmb0=T_cmb0)
+            f.write(','.join(TIME if name == 'time' else repr(values[name]) for name in names) + '\n')
+
+
+def test_create_refresh(tmp_path):
+    sweep = str(tmp_path)
+    inside = _run(sweep, 1.2e6, 5700.)
+    _run(sweep, 0.9e6, 5600.)
+    _run(sweep, np.nan, 5500.)
+    view = RunView.create(sweep, 'r_i_10', bounds=R_I, description='r_i within 10%')
+    assert list_views(sweep) == ['r_i_10']
+    assert list(view.rows['folder']) == [inside]
+    assert view.folders() == [os.path.join(sweep, inside)]
+    offset = view.offsets['run_data0.csv']
+    assert offset == os.path.getsize(os.path.join(sweep, 'run_data0.csv'))
+    # only the rows appended since are read
+    second = _run(sweep, 1.3e6, 5800.)
+    _run(sweep, 1.5e6, 5900.)
+    assert view.refresh() == 1
+    assert view.offsets['run_data0.csv'] > offset
+    assert view.refresh() == 0
+    reopened = RunView(sweep, 'r_i_10')
+    assert list(reopened.rows['folder']) == [inside, second]
+    assert reopened.description == 'r_i within 10%'
+    assert RunView.create(sweep, 'r_i_10', bounds=R_I).offsets == reopened.offsets
+    # a view of another query under the same name starts again
+    view = RunView.create(sweep, 'r_i_10', bounds={'r_i': (1250e3, None)})
+    assert list(view.rows['folder']) == [second, _name(5900.)]
+
+
+def test_truncated_shard(tmp_path):
+    sweep = str(tmp_path)
+    first = _run(sweep, 1.2e6, 5700.)
+    path = os.path.join(sweep, 'run_data0.csv')
+    with open(path) as f:
+        header_and_first = f.read()
+    _run(sweep, 1.3e6, 5800.)
+    view = RunView.create(sweep, 'r_i_10', bounds=R_I)
+    assert len(view.rows) == 2
+    # the shard is rewritten shorter, e.g. restored from a backup, so it is read again from the start
+    with open(path, 'w') as f:
+        f.write(header_and_first)
+    assert view.refresh() == 1
+    assert list(view.rows['folder']) == [first]
+    assert view.offsets['run_data0.csv'] == os.path.getsize(path)
+
+
+def test_region(tmp_path):
+    sweep = str(tmp_path)
+    centre = np.mean(BADRO_SEISMIC_O_SI, axis=0)
+    inside = _run(sweep, 1.2e6, 5700., wt_O=centre[0], wt_Si=centre[1])
+    _run(sweep, 1.2e6, 5800., wt_O=centre[0] + 100., wt_Si=centre[1])
+    _run(sweep, 1.2e6, 5900.)
+    view = RunView.create(sweep, 'seismic', **STANDARD_VIEWS['seismic'])
+    assert list(view.rows['folder']) == [inside]
+    with pytest.raises(ValueError):
+        RunView.create(sweep, 'bad', bounds={'wt_S': (0., 1.)})
+
+
+def test_folder_values():
+    values = folder_values('Tc5200.0_XM0.010_XS0.025_XO0.050_nu1e+21_other')
+    assert values['T_cmb0'] == (5200., .05)
+    assert values['X_Mg_0'] == (0.01, .0005)
+    assert values['nu_present'] == (1e21, .5e21)
+    assert len(values) == 5
+
+
+def test_match_folders_legacy(tmp_path):
+    sweep = str(tmp_path)
+    for T_cmb0 in (5700., 5800.):
+        os.makedirs(os.path.join(sweep, _name(T_cmb0)))
+    # 5900 K was run twice, as two folders whose names hold the same values
+    os.makedirs(os.path.join(sweep, _name(5900.)))
+    os.makedirs(os.path.join(sweep, _name(5900.) + '_XO0.08'))
+    # staging folders of runs in progress are not runs
+    os.makedirs(os.path.join(sweep, _name(6000.) + STAGING_SUFFIX))
+    _legacy(sweep, [(1.2e6, 5700.04), (1.2e6, 5800.), (1.2e6, 5900.), (1.2e6, 6000.), (1.2e6, 5750.)])
+    view = RunView.create(sweep, 'all', index='run_data*.csv')
+    assert list(view.rows['folder']) == [_name(5700.), _name(5800.), '', '', '']
+    assert list(match_folders(view.rows[:2], sweep)) == [_name(5700.), _name(5800.)]
+
+
+def test_link(tmp_path):
+    sweep = str(tmp_path / 'sweep')
+    os.makedirs(sweep)
+    inside = _run(sweep, 1.2e6, 5700.)
+    later = _run(sweep, 1.3e6, 5800.)
+    target = str(tmp_path / 'links')
+    view = RunView.create(sweep, 'r_i_10', bounds=R_I)
+    assert view.link(target) == 2
+    assert sorted(os.listdir(target)) == sorted([inside, later])
+    assert os.path.samefile(os.path.join(target, inside), os.path.join(sweep, inside))
+    assert view.link(target) == 2
+    # the view narrows, so the link to the run that left it is removed and other files are kept
+    open(os.path.join(target, 'notes.txt'), 'w').close()
+    view = RunView.create(sweep, 'r_i_10', bounds={'r_i': (1250e3, None)})
+    assert view.link(target) == 1
+    assert sorted(os.listdir(target)) == sorted([later, 'notes.txt'])
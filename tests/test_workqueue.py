@@ -0,0 +1,121 @@
+import json
+import os
+import numpy as np
+from mg_si.workqueue import CostModel, WorkQueue, makespan
+
+
+def _queues(tmp_path, **kwargs):
+    '''two workers A and B of a queue of one task, requeueing claimed tasks as stale at every claim'''
+    path = str(tmp_path / 'queue')
+    kwargs = dict(dict(heartbeat=0., timeout=-1.), **kwargs)
+    a = WorkQueue.create(path, [{'T_cmb0': 5700.}], **kwargs)
+    b = WorkQueue(path, **kwargs)
+    b.id = 'elsewhere.1'
+    return a, b
+
+
+def _task(queue, state, name='00000000'):
+    with open(os.path.join(queue.path, state, name + '.json')) as f:
+        return json.load(f)
+
+
+def test_stale_requeue_ownership(tmp_path):
+    a, b = _queues(tmp_path)
+    task_a = a.claim()
+    assert task_a.attempts == 1
+    # A stops heartbeating, so B requeues and claims its task
+    task_b = b.claim()
+    assert task_b.name == task_a.name
+    assert task_b.attempts == 2
+    assert _task(b, 'claimed')['worker'] == b.id
+    assert not task_a.beat()
+    assert not task_a.fail('slow')
+    assert not task_a.done()
+    assert a.status() == {'pending': 0, 'claimed': 1, 'done': 0, 'failed': 0}
+    assert task_b.beat()
+    assert task_b.done()
+    assert a.status() == {'pending': 0, 'claimed': 0, 'done': 1, 'failed': 0}
+    done = _task(b, 'done')
+    assert done['worker'] == b.id
+    assert 'errors' not in done
+
+
+def test_stale_requeue_same_worker(tmp_path):
+    a, _ = _queues(tmp_path)
+    first = a.claim()
+    second = a.claim()
+    assert second.attempts == 2
+    assert not first.beat()
+    assert not first.done()
+    assert second.done()
+
+
+def test_fail_attempts(tmp_path):
+    a, _ = _queues(tmp_path, timeout=300., max_attempts=2)
+    assert a.claim().fail('first')
+    assert a.status()['pending'] == 1
+    assert a.claim().fail('second')
+    assert a.status() == {'pending': 0, 'claimed': 0, 'done': 0, 'failed': 1}
+    assert [e['error'] for e in _task(a, 'failed')['errors']] == ['first', 'second']
+    assert a.claim() is None
+    assert a.retry_failed() == 1
+    assert a.claim().attempts == 1
+
+
+def test_work(tmp_path):
+    path = str(tmp_path / 'queue')
+    queue = WorkQueue.create(path, [{'x': i} for i in range(4)], heartbeat=0.01)
+    seen = []
+    assert queue.work(lambda x: seen.append(x) or {'nfe': x}) == 4
+    assert sorted(seen) == [0, 1, 2, 3]
+    done = queue.read('done')
+    assert sorted(task['stats']['nfe'] for task in done.values()) == [0, 1, 2, 3]
+    assert all('wall_time' in task for task in done.values())
+
+
+def test_work_skipped(tmp_path):
+    path = str(tmp_path / 'queue')
+    queue = WorkQueue.create(path, [{'x': i} for i in range(4)], heartbeat=0.01)
+    # odd tasks were already computed, so they return no stats and their wall time is not a run time
+    assert queue.work(lambda x: None if x % 2 else {'nfe': x}) == 4
+    done = {task['args']['x']: task for task in queue.read('done').values()}
+    assert sorted(x for x, task in done.items() if 'wall_time' in task and 'stats' in task) == [0, 2]
+    assert all('wall_time' not in done[x] and 'stats' not in done[x] for x in (1, 3))
+    WorkQueue.create(path, {'pending': {'x': 4}})
+    assert queue.reorder(min_done=3, seed=0) is None
+    assert queue.reorder(min_done=2) is not None
+
+
+# a grid of tasks whose run times span about 50x, as those of a sweep do, with 20% noise
+GRID = [{'T_cmb0': T, 'X_O_0': X} for T in np.linspace(5000., 6000., 12) for X in np.linspace(0., 0.15, 12)]
+COSTS = np.array([np.exp(3.*(a['T_cmb0'] - 5000.)/1000. + 40.*a['X_O_0']**2) for a in GRID]) \
+    * np.exp(0.2*np.random.RandomState(0).standard_normal(len(GRID)))
+
+
+def test_makespan():
+    assert makespan([1., 1., 1., 1., 4.], 2) == 6.
+    assert makespan([1., 1., 1., 1., 4.], 2, order=[4, 0, 1, 2, 3]) == 4.
+    assert makespan([2., 3.], 4) == 3.
+
+
+def test_cost_model_longest_first():
+    rng = np.random.RandomState(1)
+    sample = rng.choice(len(GRID), 30, replace=False)
+    model = CostModel().fit([GRID[i] for i in sample], COSTS[sample])
+    assert model.names == ['T_cmb0', 'X_O_0']
+    predicted = model.predict(GRID)
+    assert np.corrcoef(np.log(predicted), np.log(COSTS))[0, 1] > 0.9
+    longest_first = makespan(COSTS, 16, order=np.argsort(-predicted))
+    random_order = np.mean([makespan(COSTS, 16, order=rng.permutation(len(GRID))) for _ in range(20)])
+    assert longest_first < 0.9*random_order
+    assert longest_first < 1.1*np.sum(COSTS)/16
+
+
+def test_reorder_with_model(tmp_path):
+    path = str(tmp_path / 'queue')
+    queue = WorkQueue.create(path, GRID[:20])
+    model = CostModel().fit(GRID, COSTS)
+    predicted = queue.reorder(model=model)
+    assert sorted(predicted) == queue.names('pending')
+    claimed = [queue.claim().name for _ in range(20)]
+    assert claimed == sorted(predicted, key=lambda name: -predicted[name])